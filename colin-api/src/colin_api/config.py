@@ -70,6 +70,15 @@ class _Config:  # pylint: disable=too-few-public-methods
     ORACLE_DB_NAME = os.getenv('ORACLE_DB_NAME', '')
     ORACLE_HOST = os.getenv('ORACLE_HOST', '')
     ORACLE_PORT = int(os.getenv('ORACLE_PORT', '1521'))
+    ORACLE_POOL_MIN = int(os.getenv('ORACLE_POOL_MIN', '1'))
+    ORACLE_POOL_MAX = int(os.getenv('ORACLE_POOL_MAX', '10'))
+    ORACLE_POOL_INCREMENT = int(os.getenv('ORACLE_POOL_INCREMENT', '1'))
+    # milliseconds to wait for a connection when all of the pool's connections are busy
+    ORACLE_POOL_WAIT_TIMEOUT = int(os.getenv('ORACLE_POOL_WAIT_TIMEOUT', '1500'))
+    ORACLE_STMT_CACHE_SIZE = int(os.getenv('ORACLE_STMT_CACHE_SIZE', '50'))
+
+    # largest block of corp nums that can be reserved in one request
+    MAX_CORP_NUM_RESERVATION = int(os.getenv('MAX_CORP_NUM_RESERVATION', '100'))
 
     TESTING = False
     DEBUG = False
@@ -15,6 +15,8 @@
 
 Currently this only provides API versioning information
 """
+from typing import Dict, List
+
 import pycountry
 from flask import current_app
 
@@ -114,59 +116,112 @@ class Address:  # pylint: disable=too-many-instance-attributes; need all these f
             current_app.logger.error(err.with_traceback(None))
             raise AddressNotFoundException(address_id=address_id)
 
+    @classmethod
+    def get_by_address_ids(cls, cursor, address_ids: list) -> Dict:
+        """Return the addresses with the given addr_ids, by addr_id, fetched in as few queries as possible."""
+        address_ids = list(dict.fromkeys(address_id for address_id in address_ids if address_id))
+        addresses = {}
+        try:
+            if not cursor:
+                cursor = DB.connection.cursor()
+            # oracle allows at most 1000 expressions in an IN list
+            for index in range(0, len(address_ids), 1000):
+                chunk = address_ids[index:index + 1000]
+                binds = {f'address_id_{i}': address_id for i, address_id in enumerate(chunk)}
+                cursor.execute(f"""
+                    select ADDR_ID, ADDR_LINE_1, ADDR_LINE_2, ADDR_LINE_3, CITY, PROVINCE, COUNTRY_TYPE.FULL_DESC,
+                    POSTAL_CD, DELIVERY_INSTRUCTIONS
+                    from ADDRESS
+                    join COUNTRY_TYPE on ADDRESS.COUNTRY_TYP_CD = COUNTRY_TYPE.COUNTRY_TYP_CD
+                    where ADDR_ID in ({', '.join(f':{name}' for name in binds)})
+                    """,
+                               **binds
+                               )
+                description = [x[0].lower() for x in cursor.description]
+                for row in cursor.fetchall():
+                    address = dict(zip(description, row))
+                    addresses[address['addr_id']] = cls._build_address_obj(address)
+
+        except Exception as err:
+            current_app.logger.error(err.with_traceback(None))
+            raise AddressNotFoundException(address_id=address_ids)
+
+        if missing := [address_id for address_id in address_ids if address_id not in addresses]:
+            current_app.logger.error(f'Addresses not found: {missing}')
+            raise AddressNotFoundException(address_id=missing)
+
+        return addresses
+
     @classmethod
     def create_new_address(cls, cursor, address_info: dict = None, corp_num: str = None):
         """Get new address id and insert address into address table."""
+        return cls.create_new_addresses(cursor, [address_info], corp_num)[0]
+
+    @classmethod
+    def _get_new_address_ids(cls, cursor, corp_num: str, count: int) -> List[int]:
+        """Allocate the ids for count new addresses in one query."""
+        if corp_num[:2] == 'CP':
+            cursor.execute("""select noncorp_address_seq.NEXTVAL from dual connect by level <= :count""",
+                           count=count)
+            return [int(row[0]) for row in cursor.fetchall()]
+
+        cursor.execute("""
+            SELECT id_num
+            FROM system_id
+            WHERE id_typ_cd = 'ADD'
+            FOR UPDATE
+        """)
+
+        addr_id = int(cursor.fetchone()[0])
+
+        if addr_id:
+            cursor.execute("""
+                UPDATE system_id
+                SET id_num = :new_num
+                WHERE id_typ_cd = 'ADD'
+            """, new_num=addr_id+count)
+        return list(range(addr_id, addr_id + count))
+
+    @classmethod
+    def create_new_addresses(cls, cursor, address_infos: List[dict], corp_num: str = None) -> List[int]:
+        """Get new address ids and insert the addresses into the address table in one batch.
+
+        The address ids are returned in the order of the addresses.
+        """
+        if not address_infos:
+            return []
         try:
-            if corp_num[:2] == 'CP':
-                cursor.execute("""select noncorp_address_seq.NEXTVAL from dual""")
-                row = cursor.fetchone()
-                addr_id = int(row[0])
-            else:
-                cursor.execute("""
-                    SELECT id_num
-                    FROM system_id
-                    WHERE id_typ_cd = 'ADD'
-                    FOR UPDATE
-                """)
-
-                addr_id = int(cursor.fetchone()[0])
-
-                if addr_id:
-                    cursor.execute("""
-                        UPDATE system_id
-                        SET id_num = :new_num
-                        WHERE id_typ_cd = 'ADD'
-                    """, new_num=addr_id+1)
-
-            country_typ_cd = pycountry.countries.search_fuzzy(address_info.get('addressCountry'))[0].alpha_2
+            addr_ids = cls._get_new_address_ids(cursor, corp_num, len(address_infos))
+            country_typ_cds = [pycountry.countries.search_fuzzy(address_info.get('addressCountry'))[0].alpha_2
+                               for address_info in address_infos]
         except Exception as err:
             current_app.logger.error(err.with_traceback(None))
             raise err
 
         try:
-            cursor.execute("""
+            rows = [{
+                'addr_id': addr_id,
+                'province': address_info['addressRegion'].upper(),
+                'country_typ_cd': country_typ_cd,
+                'postal_cd': address_info['postalCode'].upper(),
+                'addr_line_1': address_info['streetAddress'].upper(),
+                'addr_line_2': address_info['streetAddressAdditional'].upper()
+                if 'streetAddressAdditional' in address_info.keys() else '',
+                'city': address_info['addressCity'].upper(),
+                'delivery_instructions': address_info['deliveryInstructions'].upper()
+                if 'deliveryInstructions' in address_info.keys() else ''
+            } for addr_id, country_typ_cd, address_info in zip(addr_ids, country_typ_cds, address_infos)]
+            cursor.executemany("""
                             INSERT INTO address (addr_id, province, country_typ_cd, postal_cd, addr_line_1, addr_line_2,
                              city, delivery_instructions)
                             VALUES (:addr_id, :province, :country_typ_cd, :postal_cd, :addr_line_1, :addr_line_2, :city,
                                 :delivery_instructions)
-                            """,
-                           addr_id=addr_id,
-                           province=address_info['addressRegion'].upper(),
-                           country_typ_cd=country_typ_cd,
-                           postal_cd=address_info['postalCode'].upper(),
-                           addr_line_1=address_info['streetAddress'].upper(),
-                           addr_line_2=address_info['streetAddressAdditional'].upper()
-                           if 'streetAddressAdditional' in address_info.keys() else '',
-                           city=address_info['addressCity'].upper(),
-                           delivery_instructions=address_info['deliveryInstructions'].upper()
-                           if 'deliveryInstructions' in address_info.keys() else ''
-                           )
+                            """, rows)
         except Exception as err:
-            current_app.logger.error(f'Error in address: failed to insert new address: {address_info}')
+            current_app.logger.error(f'Error in address: failed to insert new addresses: {address_infos}')
             raise err
 
-        return addr_id
+        return addr_ids
 
     @classmethod
     def get_addresses_by_event(cls, cursor, event_ids: list, table: str):
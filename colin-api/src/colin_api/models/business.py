@@ -584,6 +584,39 @@ class Business:  # pylint: disable=too-many-instance-attributes
             current_app.logger.error('Error looking up corp_num')
             raise err
 
+    @classmethod
+    def reserve_corp_nums(cls, con, corp_type: str, count: int) -> List[str]:
+        """Retrieve a block of sequential corporation numbers and advance past them in one update."""
+        try:
+            cursor = con.cursor()
+            cursor.execute(
+                """
+                SELECT id_num
+                FROM system_id
+                WHERE id_typ_cd = :corp_type
+                FOR UPDATE
+                """,
+                corp_type=corp_type
+            )
+            corp_num = cursor.fetchone()
+            if not corp_num:
+                return []
+
+            cursor.execute(
+                """
+                UPDATE system_id
+                SET id_num = :new_num
+                WHERE id_typ_cd = :corp_type
+                """,
+                new_num=corp_num[0] + count,
+                corp_type=corp_type
+            )
+
+            return ['%07d' % num for num in range(corp_num[0], corp_num[0] + count)]
+        except Exception as err:
+            current_app.logger.error('Error reserving corp_nums')
+            raise err
+
     @classmethod
     def get_resolutions(cls, cursor, corp_num: str) -> List:
         """Get all resolution dates for a company."""
@@ -92,21 +92,27 @@ class Party:  # pylint: disable=too-many-instance-attributes; need all these fie
 
         completing_parties = {}
         party_list = []
-        description = cursor.description
+        description = [x[0].lower() for x in cursor.description]
+        parties = [dict(zip(description, row)) for row in parties]
+        addresses = Address.get_by_address_ids(
+            cursor, [row[key] for row in parties if row['delivery_addr_id']
+                     for key in ('delivery_addr_id', 'mailing_addr_id')])
+        founding_date = None
         for row in parties:
             party = Party()
             party.title = ''
-            row = dict(zip([x[0].lower() for x in description], row))
             if not row['appointment_dt']:
-                row['appointment_dt'] = Business.get_founding_date(cursor=cursor, corp_num=corp_num)
+                if not founding_date:
+                    founding_date = Business.get_founding_date(cursor=cursor, corp_num=corp_num)
+                row['appointment_dt'] = founding_date
             party.officer = cls._get_officer(row)
             if not row['delivery_addr_id']:
                 current_app.logger.error(
                     f"Bad director data for {party.officer.get('firstName')} {party.officer.get('lastName')} {corp_num}"
                 )
             else:
-                party.delivery_address = Address.get_by_address_id(cursor, row['delivery_addr_id']).as_dict()
-                party.mailing_address = Address.get_by_address_id(cursor, row['mailing_addr_id']).as_dict() \
+                party.delivery_address = addresses[row['delivery_addr_id']].as_dict()
+                party.mailing_address = addresses[row['mailing_addr_id']].as_dict() \
                     if row['mailing_addr_id'] else party.delivery_address
                 party.appointment_date =\
                     convert_to_json_date(row.get('appointment_dt', None))
@@ -317,20 +323,49 @@ class Party:  # pylint: disable=too-many-instance-attributes; need all these fie
             current_app.logger.error(f'Error in director: Failed to end director: {director}')
             raise err
 
+    CORP_PARTY_INSERT = \
+        """
+        insert into corp_party (corp_party_id, mailing_addr_id, delivery_addr_id, corp_num, party_typ_cd,
+          start_event_id, end_event_id, appointment_dt, cessation_dt, last_nme, middle_nme, first_nme,
+          bus_company_num, business_nme, prev_party_id)
+        values (:corp_party_id, :mailing_addr_id, :delivery_addr_id, :corp_num, :party_typ_cd, :start_event_id,
+          :end_event_id, TO_DATE(:appointment_dt, 'YYYY-mm-dd'), TO_DATE(:cessation_dt, 'YYYY-mm-dd'),
+          :last_nme, :middle_nme, :first_nme, :bus_company_num, :business_name, :prev_party_id)
+        """
+
     @classmethod
-    # pylint: disable=too-many-locals; one extra
-    def create_new_corp_party(cls, cursor, event_id: int, party: Dict, business: Dict):
-        """Insert new party into the corp_party table."""
-        query = \
-            """
-            insert into corp_party (corp_party_id, mailing_addr_id, delivery_addr_id, corp_num, party_typ_cd,
-              start_event_id, end_event_id, appointment_dt, cessation_dt, last_nme, middle_nme, first_nme,
-              bus_company_num, business_nme, prev_party_id)
-            values (:corp_party_id, :mailing_addr_id, :delivery_addr_id, :corp_num, :party_typ_cd, :start_event_id,
-              :end_event_id, TO_DATE(:appointment_dt, 'YYYY-mm-dd'), TO_DATE(:cessation_dt, 'YYYY-mm-dd'),
-              :last_nme, :middle_nme, :first_nme, :bus_company_num, :business_name, :prev_party_id)
-            """
+    def _get_new_corp_party_ids(cls, cursor, corp_num: str, count: int) -> List[int]:
+        """Allocate the ids for count new corp parties in one query."""
+        try:
+            if corp_num == 'CP':
+                cursor.execute("""select noncorp_party_seq.NEXTVAL from dual connect by level <= :count""",
+                               count=count)
+                return [int(row[0]) for row in cursor.fetchall()]
+
+            cursor.execute("""
+                SELECT id_num
+                FROM system_id
+                WHERE id_typ_cd = 'CP'
+                FOR UPDATE
+            """)
+
+            corp_party_id = int(cursor.fetchone()[0])
+
+            if corp_party_id:
+                cursor.execute("""
+                    UPDATE system_id
+                    SET id_num = :new_num
+                    WHERE id_typ_cd = 'CP'
+                """, new_num=corp_party_id+count)
+            return list(range(corp_party_id, corp_party_id + count))
+
+        except Exception as err:
+            current_app.logger.error('Error in corp_party: Failed to get next corp_party_id.')
+            raise err
 
+    @classmethod
+    def _create_completing_party(cls, cursor, event_id: int, party: Dict, corp_num: str):
+        """Insert, or update for a correction, the completing party of the event."""
         completing_party_query = \
             """
             insert into completing_party (event_id, mailing_addr_id, last_nme, middle_nme, first_nme,
@@ -345,114 +380,86 @@ class Party:  # pylint: disable=too-many-instance-attributes; need all these fie
             where event_id=:event_id
             """
 
-        # create new corp party entry
-        corp_num = business['business']['identifier']
-        try:
-            if corp_num == 'CP':
-                cursor.execute("""select noncorp_party_seq.NEXTVAL from dual""")
-                row = cursor.fetchone()
-                corp_party_id = int(row[0])
-            else:
-                cursor.execute("""
-                    SELECT id_num
-                    FROM system_id
-                    WHERE id_typ_cd = 'CP'
-                    FOR UPDATE
-                """)
+        delivery_info = party['deliveryAddress'] if 'deliveryAddress' in party else party['mailingAddress']
+        # create new address
+        mailing_addr_id = Address.create_new_address(cursor=cursor, address_info=delivery_info, corp_num=corp_num)
+        if 'mailingAddress' in party:
+            mailing_addr_id = Address.create_new_address(
+                cursor=cursor, address_info=party['mailingAddress'], corp_num=corp_num)
+        if party.get('prev_event_id'):
+            # update old completing party entry instead of creating a new one
+            query = completing_party_update_query
+            event_id = party['prev_event_id']
+        else:
+            query = completing_party_query
+        cursor.execute(
+            query,
+            event_id=event_id,
+            mailing_addr_id=mailing_addr_id,
+            last_nme=party['officer']['lastName'],
+            middle_nme=party['officer'].get('middleInitial', ''),
+            first_nme=party['officer']['firstName'],
+            email=party['officer']['email']
+        )
 
-                corp_party_id = int(cursor.fetchone()[0])
+    @classmethod
+    def create_new_corp_party(cls, cursor, event_id: int, party: Dict, business: Dict):
+        """Insert new party into the corp_party table."""
+        return cls.create_new_corp_parties(cursor, event_id, [party], business)[0]
 
-                if corp_party_id:
-                    cursor.execute("""
-                        UPDATE system_id
-                        SET id_num = :new_num
-                        WHERE id_typ_cd = 'CP'
-                    """, new_num=corp_party_id+1)
+    @classmethod
+    # pylint: disable=too-many-locals; one extra
+    def create_new_corp_parties(cls, cursor, event_id: int, parties: List[Dict], business: Dict) -> List:
+        """Insert the new parties into the corp_party table, returning their corp_party_ids.
 
-        except Exception as err:
-            current_app.logger.error('Error in corp_party: Failed to get next corp_party_id.')
-            raise err
+        The ids and addresses of the parties are allocated together, and the parties are inserted with one
+        executemany. Completing parties are saved to the completing_party table instead, and have no corp_party_id.
+        """
+        corp_num = business['business']['identifier']
+        corp_parties = [party for party in parties if party.get('role_type', 'DIR') != 'CPRTY']
+        corp_party_ids = cls._get_new_corp_party_ids(cursor, corp_num, len(corp_parties)) if corp_parties else []
         try:
-            role_type = party.get('role_type', 'DIR')
-
-            delivery_info = party['deliveryAddress'] if 'deliveryAddress' in party else party['mailingAddress']
-            # create new address
-            delivery_addr_id = Address.create_new_address(cursor=cursor, address_info=delivery_info, corp_num=corp_num)
-            mailing_addr_id = delivery_addr_id
-
-            if 'mailingAddress' in party:
-                mailing_addr_id = Address.create_new_address(
-                    cursor=cursor, address_info=party['mailingAddress'], corp_num=corp_num)
-            if role_type == 'CPRTY':
-                if party.get('prev_event_id'):
-                    # update old completing party entry instead of creating a new one
-                    cursor.execute(
-                        completing_party_update_query,
-                        event_id=party['prev_event_id'],
-                        mailing_addr_id=mailing_addr_id,
-                        last_nme=party['officer']['lastName'],
-                        middle_nme=party['officer'].get('middleInitial', ''),
-                        first_nme=party['officer']['firstName'],
-                        email=party['officer']['email']
-                    )
-                else:
-                    cursor.execute(
-                        completing_party_query,
-                        event_id=event_id,
-                        mailing_addr_id=mailing_addr_id,
-                        last_nme=party['officer']['lastName'],
-                        middle_nme=party['officer'].get('middleInitial', ''),
-                        first_nme=party['officer']['firstName'],
-                        email=party['officer']['email']
-                    )
-            else:
-                date_format = '%Y-%m-%d'
-                if party.get('prev_id'):
-                    cursor.execute(
-                        query,
-                        corp_party_id=corp_party_id,
-                        mailing_addr_id=mailing_addr_id,
-                        delivery_addr_id=delivery_addr_id,
-                        corp_num=corp_num,
-                        party_typ_cd=role_type,
-                        start_event_id=event_id,
-                        end_event_id=event_id if party.get('cessationDate', '') else None,
-                        appointment_dt=str(datetime.datetime.strptime(party['appointmentDate'], date_format))[:10],
-                        cessation_dt=str(datetime.datetime.strptime(party['cessationDate'], date_format))[:10]
-                        if party.get('cessationDate', None) else None,
-                        last_nme=party['officer']['lastName'],
-                        middle_nme=party['officer'].get('middleInitial', ''),
-                        first_nme=party['officer']['firstName'],
-                        bus_company_num=business['business'].get('businessNumber', None),
-                        business_name=party['officer'].get('orgName', ''),
-                        prev_party_id=party['prev_id']
-                    )
-                else:
-                    query = query.replace(', prev_party_id', '').replace(', :prev_party_id', '')
-                    cursor.execute(
-                        query,
-                        corp_party_id=corp_party_id,
-                        mailing_addr_id=mailing_addr_id,
-                        delivery_addr_id=delivery_addr_id,
-                        corp_num=corp_num,
-                        party_typ_cd=role_type,
-                        start_event_id=event_id,
-                        end_event_id=event_id if party.get('cessationDate', '') else None,
-                        appointment_dt=str(datetime.datetime.strptime(party['appointmentDate'], date_format))[:10],
-                        cessation_dt=str(datetime.datetime.strptime(party['cessationDate'], date_format))[:10]
-                        if party.get('cessationDate', None) else None,
-                        last_nme=party['officer']['lastName'],
-                        middle_nme=party['officer'].get('middleInitial', ''),
-                        first_nme=party['officer']['firstName'],
-                        bus_company_num=business['business'].get('businessNumber', None),
-                        business_name=party['officer'].get('orgName', '')
-                    )
+            for party in parties:
+                if party.get('role_type', 'DIR') == 'CPRTY':
+                    cls._create_completing_party(cursor, event_id, party, corp_num)
+
+            # the delivery address of each party, followed by the mailing addresses of the parties that have one
+            delivery_infos = [party['deliveryAddress'] if 'deliveryAddress' in party else party['mailingAddress']
+                              for party in corp_parties]
+            mailing_infos = [party['mailingAddress'] for party in corp_parties if 'mailingAddress' in party]
+            addr_ids = iter(Address.create_new_addresses(cursor, delivery_infos + mailing_infos, corp_num))
+            delivery_addr_ids = [next(addr_ids) for _ in delivery_infos]
+
+            date_format = '%Y-%m-%d'
+            rows = []
+            for corp_party_id, delivery_addr_id, party in zip(corp_party_ids, delivery_addr_ids, corp_parties):
+                rows.append({
+                    'corp_party_id': corp_party_id,
+                    'mailing_addr_id': next(addr_ids) if 'mailingAddress' in party else delivery_addr_id,
+                    'delivery_addr_id': delivery_addr_id,
+                    'corp_num': corp_num,
+                    'party_typ_cd': party.get('role_type', 'DIR'),
+                    'start_event_id': event_id,
+                    'end_event_id': event_id if party.get('cessationDate', '') else None,
+                    'appointment_dt': str(datetime.datetime.strptime(party['appointmentDate'], date_format))[:10],
+                    'cessation_dt': str(datetime.datetime.strptime(party['cessationDate'], date_format))[:10]
+                    if party.get('cessationDate', None) else None,
+                    'last_nme': party['officer']['lastName'],
+                    'middle_nme': party['officer'].get('middleInitial', ''),
+                    'first_nme': party['officer']['firstName'],
+                    'bus_company_num': business['business'].get('businessNumber', None),
+                    'business_name': party['officer'].get('orgName', ''),
+                    'prev_party_id': party.get('prev_id')
+                })
+            if rows:
+                cursor.executemany(cls.CORP_PARTY_INSERT, rows)
 
         except Exception as err:
             current_app.logger.error(f'Error in corp_party: Failed create new party for {corp_num}')
             raise err
 
-        return corp_party_id
+        ids = iter(corp_party_ids)
+        return [None if party.get('role_type', 'DIR') == 'CPRTY' else next(ids) for party in parties]
 
     @classmethod
     def compare_parties(cls, party: Party, officer_json: Dict):
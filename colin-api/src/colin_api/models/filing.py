@@ -263,41 +263,6 @@ class Filing:
             raise err
         return event_id
 
-    @classmethod
-    def _get_events(cls, cursor, corp_num: str, filing_type_code: str) -> List:
-        """Get all event ids of filings for given filing type for this corp."""
-        try:
-            if not cursor:
-                cursor = DB.connection.cursor()
-            cursor.execute(
-                """
-                select event.event_id, event.event_timestmp, filing.period_end_dt
-                from event
-                left join filing on event.event_id = filing.event_id
-                where corp_num=:corp_num and filing_typ_cd=:filing_type
-                """,
-                filing_type=filing_type_code,
-                corp_num=corp_num
-            )
-
-            events = cursor.fetchall()
-            event_list = []
-            for row in events:
-                row = dict(zip([x[0].lower() for x in cursor.description], row))
-                item = {'id': row['event_id'], 'date': row['event_timestmp']}
-
-                # if filing type is an AR include the period_end_dt info
-                if filing_type_code in cls.FILING_TYPES['annualReport']['type_code_list']:
-                    item['annualReportDate'] = row['period_end_dt']
-
-                event_list.append(item)
-
-        except Exception as err:  # pylint: disable=broad-except; want to catch all errors
-            current_app.logger.error(f'error getting events for {corp_num}')
-            raise err
-
-        return event_list
-
     @classmethod
     def _get_filing_type(cls, filing_type_code: str) -> Optional[str]:
         for filing_type in cls.FILING_TYPES:
@@ -545,25 +510,60 @@ class Filing:
     # pylint: disable=too-many-arguments; one extra
     def _create_party_roles(cls, cursor, party: Dict, business: Dict, event_id: str, corrected_id: str = None):
         """Create a corp_party for each role."""
-        for role in party['roles']:
-            party['role_type'] = Party.role_types[(role['roleType'])]
-            if party['role_type'] == 'CPRTY' and corrected_id:
-                # set to old event id for update
-                party['prev_event_id'] = corrected_id
-            party['appointmentDate'] = role['appointmentDate']
-            Party.create_new_corp_party(cursor, event_id, party, business)
+        cls._create_parties_roles(cursor, [party], business, event_id, corrected_id)
+
+    @classmethod
+    # pylint: disable=too-many-arguments; one extra
+    def _create_parties_roles(cls, cursor, parties: List, business: Dict, event_id: str, corrected_id: str = None):
+        """Create a corp_party for each role of each of the parties, in one batch."""
+        party_roles = []
+        for party in parties:
+            for role in party['roles']:
+                party_role = {**party, 'role_type': Party.role_types[(role['roleType'])],
+                              'appointmentDate': role['appointmentDate']}
+                if party_role['role_type'] == 'CPRTY' and corrected_id:
+                    # set to old event id for update
+                    party_role['prev_event_id'] = corrected_id
+                party_roles.append(party_role)
+        Party.create_new_corp_parties(cursor, event_id, party_roles, business)
 
     @classmethod
-    def _get_ar_component_event(cls, cursor, corp_num: str, type_code: str, ar_filing_event_info: Dict) -> str:
-        """Get the event id for the corresponding component included in the AR."""
-        events = cls._get_events(cursor=cursor, corp_num=corp_num, filing_type_code=type_code)
-        event_id = None
-        tmp_timestamp = datetime.datetime.fromtimestamp(0)
-        for event in events:
-            if ar_filing_event_info['event_timestmp'] >= event['date'] > tmp_timestamp:
-                event_id = event['id']
-                tmp_timestamp = event['date']
-        return event_id if event_id else ar_filing_event_info['event_id']
+    def _get_ar_component_events(cls, cursor, corp_num: str, type_codes: List, ar_filing_event_info: Dict) -> Dict:
+        """Get the event ids for the corresponding components included in the AR, by type code, in one query.
+
+        The event for a component is its latest event up to the AR, or the AR event if it has none.
+        """
+        component_events = {type_code: ar_filing_event_info['event_id'] for type_code in type_codes}
+        if not type_codes:
+            return component_events
+
+        binds = {f'type_code_{i}': type_code for i, type_code in enumerate(type_codes)}
+        try:
+            cursor.execute(
+                f"""
+                select filing_typ_cd, event_id from (
+                    select filing.filing_typ_cd, event.event_id,
+                    row_number() over (partition by filing.filing_typ_cd order by event.event_timestmp desc) as rn
+                    from event
+                    join filing on event.event_id = filing.event_id
+                    where corp_num=:corp_num and filing.filing_typ_cd in ({', '.join(f':{name}' for name in binds)})
+                    and event.event_timestmp <= :ar_timestamp and event.event_timestmp > :epoch
+                )
+                where rn = 1
+                """,
+                corp_num=corp_num,
+                ar_timestamp=ar_filing_event_info['event_timestmp'],
+                epoch=datetime.datetime.fromtimestamp(0),
+                **binds
+            )
+            for type_code, event_id in cursor.fetchall():
+                component_events[type_code] = event_id
+
+        except Exception as err:  # pylint: disable=broad-except; want to catch all errors
+            current_app.logger.error(f'error getting AR component events for {corp_num}')
+            raise err
+
+        return component_events
 
     # pylint: disable=too-many-branches, too-many-locals, too-many-statements;
     @classmethod
@@ -605,12 +605,18 @@ class Filing:
             if 'annualGeneralMeetingDate' in components:
                 filing.body['annualGeneralMeetingDate'] = convert_to_json_date(filing_event_info.get('agm_date', None))
 
+            # special rules for ARs with offices or directors included: both component events are fetched together
+            ar_component_events = {}
+            if filing.filing_type == 'annualReport':
+                ar_component_events = cls._get_ar_component_events(
+                    cursor=cursor,
+                    corp_num=corp_num,
+                    type_codes=[type_code for component, type_code in (('offices', 'OTADD'), ('directors', 'OTCDR'))
+                                if component in components],
+                    ar_filing_event_info=filing_event_info)
+
             if 'offices' in components:
-                event_id = filing_event_info['event_id']
-                # special rules for ARs with offices included
-                if filing.filing_type == 'annualReport':
-                    event_id = cls._get_ar_component_event(
-                        cursor=cursor, corp_num=corp_num, type_code='OTADD', ar_filing_event_info=filing_event_info)
+                event_id = ar_component_events.get('OTADD', filing_event_info['event_id'])
                 office_obj_list = Office.get_by_event(cursor=cursor, event_id=event_id)
                 if not office_obj_list:
                     if filing.filing_type != 'annualReport':
@@ -621,11 +627,7 @@ class Filing:
                 filing.body['offices'] = Office.convert_obj_list(office_obj_list)
 
             if 'directors' in components:
-                event_id = filing_event_info['event_id']
-                # special rules for coop ARs with directors included
-                if filing.filing_type == 'annualReport':
-                    event_id = cls._get_ar_component_event(
-                        cursor=cursor, corp_num=corp_num, type_code='OTCDR', ar_filing_event_info=filing_event_info)
+                event_id = ar_component_events.get('OTCDR', filing_event_info['event_id'])
                 directors = Party.get_by_event(cursor=cursor, corp_num=corp_num, event_id=event_id)
                 if not directors:
                     if filing.filing_type != 'annualReport':
@@ -647,13 +649,14 @@ class Filing:
                 if share_structure:
                     filing.body['shareStructure'] = share_structure.to_dict()
 
+            # the names of all types for the event are fetched together, for both the translations and the name
+            event_names = []
+            if 'nameTranslations' in components or 'nameRequest' in components or 'legalName' in components:
+                event_names = CorpName.get_all_by_event(
+                    cursor=cursor, corp_num=corp_num, event_id=filing_event_info['event_id'])
+
             if 'nameTranslations' in components:
-                translations = CorpName.get_by_event(
-                    cursor=cursor,
-                    corp_num=corp_num,
-                    event_id=filing_event_info['event_id'],
-                    type_code='TR'
-                )
+                translations = [name for name in event_names if name.type_code == 'TR']
                 filing.body['nameTranslations'] = []
                 for translation in translations:
                     if translation.event_id == filing_event_info['event_id']:
@@ -664,7 +667,7 @@ class Filing:
                     del filing.body['nameTranslations']
 
             if 'nameRequest' in components or 'legalName' in components:
-                names = CorpName.get_by_event(corp_num=corp_num, event_id=filing_event_info['event_id'], cursor=cursor)
+                names = [name for name in event_names if name.type_code not in (None, 'TR')]
                 for name in names:
                     if name.event_id == filing_event_info['event_id']:
                         if 'nameRequest' in components:
@@ -687,20 +690,18 @@ class Filing:
                     raise InvalidFilingTypeException(filing_type=filing_event_info['filing_type_code'])
                 filing.body['business']['identifier'] = f'BC{filing.business.corp_num}'
 
-            if 'provisionsRemoved' in components:
+            provisions = None
+            if 'provisionsRemoved' in components or 'hasProvisions' in components:
                 provisions = Business.get_corp_restriction(
                     cursor=cursor, event_id=filing_event_info['event_id'], corp_num=corp_num)
+
+            if 'provisionsRemoved' in components:
                 if provisions and provisions['end_event_id'] == filing_event_info['event_id']:
                     filing.body['provisionsRemoved'] = provisions['restriction_ind'] == 'Y'
                 else:
                     filing.body['provisionsRemoved'] = False
 
             if 'hasProvisions' in components:
-                provisions = Business.get_corp_restriction(
-                    cursor=cursor,
-                    event_id=filing_event_info['event_id'],
-                    corp_num=corp_num
-                )
                 if provisions and provisions['restriction_ind'] == 'Y':
                     filing.body['hasProvisions'] = True
                 else:
@@ -845,11 +846,10 @@ class Filing:
                 office_text = cls._process_office(cursor=cursor, filing=filing)
 
                 if parties := filing.body.get('parties', []):
-                    for party in parties:
-                        cls._create_party_roles(cursor=cursor,
-                                                party=party,
-                                                business=business,
-                                                event_id=filing.event_id)
+                    cls._create_parties_roles(cursor=cursor,
+                                              parties=parties,
+                                              business=business,
+                                              event_id=filing.event_id)
                 # add shares if not coop
                 cls._process_share_structure(cursor, filing, corp_num)
                 if filing.body.get('nameRequest'):
@@ -951,7 +951,17 @@ class Filing:
         if filing.filing_type != 'annualReport' and filing.body.get('directors', []):
             # create, cease, change directors
             changed_dirs = []
+            # consecutive directors that are only appointed are created together, but always before the next
+            # cease or change is handled so that it sees the same rows it would have if they were created one by one
+            appointed_dirs = []
             for director in filing.body.get('directors', []):
+                if director['actions'] == ['appointed']:
+                    appointed_dirs.append(director)
+                    continue
+
+                Party.create_new_corp_parties(cursor=cursor, event_id=filing.event_id, parties=appointed_dirs,
+                                              business=business)
+                appointed_dirs = []
                 if 'appointed' in director['actions']:
                     Party.create_new_corp_party(cursor=cursor, event_id=filing.event_id, party=director,
                                                 business=business)
@@ -986,11 +996,13 @@ class Filing:
                             status_code=HTTPStatus.NOT_FOUND
                         )
 
+            Party.create_new_corp_parties(cursor=cursor, event_id=filing.event_id, parties=appointed_dirs,
+                                          business=business)
+
             # add back changed directors as new row - if ceased director with changes this will add them with
             # cessation date + end event id filled
-            for director in changed_dirs:
-                Party.create_new_corp_party(cursor=cursor, event_id=filing.event_id, party=director,
-                                            business=business)
+            Party.create_new_corp_parties(cursor=cursor, event_id=filing.event_id, parties=changed_dirs,
+                                          business=business)
 
             # create new ledger text for address change
             text = 'Director change.'
@@ -70,18 +70,20 @@ class Office:
         if not office_info:
             return None
 
-        description = cursor.description
-        for office_item in office_info:
-            office = dict(zip([x[0].lower() for x in description], office_item))
+        description = [x[0].lower() for x in cursor.description]
+        office_info = [dict(zip(description, office_item)) for office_item in office_info]
+        addresses = Address.get_by_address_ids(
+            cursor, [office[key] for office in office_info for key in ('delivery_addr_id', 'mailing_addr_id')])
+        for office in office_info:
             office_obj = Office()
             office_obj.office_type = cls.OFFICE_TYPES_CODES.get(office['office_typ_cd'], None)
             if office_obj.office_type:
                 office_obj.event_id = office['start_event_id']
                 office_obj.end_event_id = office['end_event_id']
-                office_obj.delivery_address = Address.get_by_address_id(cursor, office['delivery_addr_id']).as_dict()
+                office_obj.delivery_address = addresses[office['delivery_addr_id']].as_dict()
                 office_obj.office_code = office['office_typ_cd']
                 if office['mailing_addr_id']:
-                    office_obj.mailing_address = Address.get_by_address_id(cursor, office['mailing_addr_id']).as_dict()
+                    office_obj.mailing_address = addresses[office['mailing_addr_id']].as_dict()
                 else:
                     office_obj.mailing_address = office_obj.delivery_address
                 offices.append(office_obj)
@@ -17,7 +17,7 @@ Currently this only provides API versioning information
 """
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from flask import current_app
 
@@ -111,33 +111,44 @@ class ShareObject:  # pylint: disable=too-many-instance-attributes;
         to_return = []
 
         share_structs = cursor.fetchall()
+        share_classes = cls._get_share_classes(cursor, [row[0] for row in share_structs], corp_num)
         for row in share_structs:
             share_structure = ShareObject()
             share_structure.start_event_id = row[0]
             share_structure.end_event_id = row[1]
-            share_structure.share_classes = cls._get_share_classes(cursor, share_structure.start_event_id, corp_num)
+            share_structure.share_classes = share_classes.get(share_structure.start_event_id, [])
             to_return.append(share_structure)
 
         return to_return
 
     @classmethod
-    def _get_share_classes(cls, cursor, event_id, corp_num):
-        """Retrieve Share Classes for Corp."""
-        query = """select share_class_id, currency_typ_cd, max_share_ind, share_quantity, spec_rights_ind,
-                   par_value_ind, par_value_amt, class_nme, other_currency from share_struct_cls
-                   where start_event_id=:event_id and corp_num=:corp_num"""
+    def _get_share_classes(cls, cursor, event_ids: List, corp_num: str) -> Dict:
+        """Retrieve the Share Classes for Corp started by each of the events, with their series, in two queries."""
+        event_ids = list(dict.fromkeys(event_ids))
+        if not event_ids:
+            return {}
 
-        share_classes = []
+        share_classes = {}
 
         try:
-            cursor.execute(query,
-                           corp_num=corp_num, event_id=event_id)
-            class_arr = cursor.fetchall()
-
-            description = cursor.description
-
-            for row in class_arr:
-                row = dict(zip([x[0].lower() for x in description], row))
+            class_rows = []
+            # oracle allows at most 1000 expressions in an IN list
+            for index in range(0, len(event_ids), 1000):
+                binds = {f'event_id_{i}': event_id for i, event_id in enumerate(event_ids[index:index + 1000])}
+                query = f"""select share_class_id, currency_typ_cd, max_share_ind, share_quantity, spec_rights_ind,
+                            par_value_ind, par_value_amt, class_nme, other_currency, start_event_id
+                            from share_struct_cls
+                            where start_event_id in ({', '.join(f':{name}' for name in binds)})
+                            and corp_num=:corp_num"""
+                cursor.execute(query,
+                               corp_num=corp_num, **binds)
+                class_arr = cursor.fetchall()
+
+                description = cursor.description
+
+                class_rows.extend(dict(zip([x[0].lower() for x in description], row)) for row in class_arr)
+            share_series = cls._get_share_series(cursor, [row['share_class_id'] for row in class_rows], corp_num)
+            for row in class_rows:
                 share_class = ShareClass()
                 share_class.currency_type = row['currency_typ_cd']
                 share_class.has_max_shares = row['max_share_ind']
@@ -147,8 +158,8 @@ class ShareObject:  # pylint: disable=too-many-instance-attributes;
                 share_class.share_name = row['class_nme']
                 share_class.par_value_amt = row['par_value_amt']
                 share_class.max_number_shares = row['share_quantity']
-                share_class.series = cls._get_share_series(cursor, share_class, corp_num)
-                share_classes.append(share_class)
+                share_class.series = share_series.get(share_class.share_id, [])
+                share_classes.setdefault(row['start_event_id'], []).append(share_class)
 
         except Exception as err:
             current_app.logger.error(f'Error in Share Structure: Failed to retrieve Share Classes for {corp_num}')
@@ -157,32 +168,39 @@ class ShareObject:  # pylint: disable=too-many-instance-attributes;
         return share_classes
 
     @classmethod
-    def _get_share_series(cls, cursor, share_class, identifier):
-        """Retrieve Share Series for Corp."""
-        query = """select series_id, max_share_ind, share_quantity, spec_right_ind,
-                    series_nme from share_series where share_class_id=:class_id and
-                    corp_num=:identifier"""
+    def _get_share_series(cls, cursor, class_ids: List, identifier: str) -> Dict:
+        """Retrieve the Share Series for Corp of each of the share classes, by share class id."""
+        class_ids = list(dict.fromkeys(class_ids))
+        if not class_ids:
+            return {}
 
-        share_series = []
+        share_series = {}
         try:
-            cursor.execute(query,
-                           class_id=share_class.share_id,
-                           identifier=identifier
-                           )
-
-            series_arr = cursor.fetchall()
-
-            description = cursor.description
-
-            for row in series_arr:
-                row = dict(zip([x[0].lower() for x in description], row))
-                series = Share()
-                series.has_max_shares = row['max_share_ind']
-                series.has_special_rights = row['spec_right_ind']
-                series.max_number_shares = row['share_quantity']
-                series.share_id = row['series_id']
-                series.share_name = row['series_nme']
-                share_series.append(series)
+            # oracle allows at most 1000 expressions in an IN list
+            for index in range(0, len(class_ids), 1000):
+                binds = {f'class_id_{i}': class_id for i, class_id in enumerate(class_ids[index:index + 1000])}
+                query = f"""select series_id, max_share_ind, share_quantity, spec_right_ind,
+                            series_nme, share_class_id from share_series
+                            where share_class_id in ({', '.join(f':{name}' for name in binds)}) and
+                            corp_num=:identifier"""
+                cursor.execute(query,
+                               identifier=identifier,
+                               **binds
+                               )
+
+                series_arr = cursor.fetchall()
+
+                description = cursor.description
+
+                for row in series_arr:
+                    row = dict(zip([x[0].lower() for x in description], row))
+                    series = Share()
+                    series.has_max_shares = row['max_share_ind']
+                    series.has_special_rights = row['spec_right_ind']
+                    series.max_number_shares = row['share_quantity']
+                    series.share_id = row['series_id']
+                    series.share_name = row['series_nme']
+                    share_series.setdefault(row['share_class_id'], []).append(series)
 
         except Exception as err:
             current_app.logger.error(f'Error in Share Structure: Failed to retrieve Share Series for {identifier}')
@@ -244,14 +262,51 @@ class ShareObject:  # pylint: disable=too-many-instance-attributes;
 
         max_class_id = get_max_value(cursor, corp_num=corp_num, table='share_struct_cls', column='share_class_id')
         class_id = max_class_id + 1 if max_class_id else 0
+        class_rows = []
+        series_rows = []
         for share_class in shares_list:
-            cls.create_share_class(cursor, event_id, corp_num, class_id, share_class)
+            class_rows.append(cls._get_share_class_row(event_id, corp_num, class_id, share_class))
+            for series_id, share_series in enumerate(share_class.get('series', [])):
+                series_rows.append(cls._get_share_series_row(event_id, corp_num, class_id, series_id, share_series))
             class_id = class_id + 1
 
+        cls.create_share_classes(cursor, corp_num, class_rows)
+        cls.create_share_series(cursor, corp_num, series_rows)
+
     @classmethod
-    def create_share_class(cls, cursor, event_id: str, corp_num: str, class_id: int, class_dict: dict):
-        # pylint: disable=too-many-arguments
-        """Create Share Classes for corp."""
+    def _get_share_class_row(cls, event_id: str, corp_num: str, class_id: int, class_dict: dict) -> dict:
+        """Return the bind values to insert the share class with."""
+        return {
+            'corp_num': corp_num,
+            'class_id': class_id,
+            'event_id': event_id,
+            'currency': class_dict['currency'],
+            'has_max_share': 'N' if class_dict['hasMaximumShares'] else 'Y',
+            'qty': class_dict['maxNumberOfShares'],
+            'has_spec_rights': 'Y' if class_dict['hasRightsOrRestrictions'] else 'N',
+            'has_par_value': 'Y' if class_dict['hasParValue'] else 'N',
+            'par_value': class_dict['parValue'],
+            'name': class_dict['name']
+        }
+
+    @classmethod
+    def _get_share_series_row(  # pylint: disable=too-many-arguments
+            cls, event_id: str, corp_num: str, class_id: int, series_id: int, series_dict: dict) -> dict:
+        """Return the bind values to insert the share series with."""
+        return {
+            'corp_num': corp_num,
+            'class_id': class_id,
+            'series_id': series_id,
+            'event_id': event_id,
+            'has_max_share': 'N' if series_dict['hasMaximumShares'] else 'Y',
+            'qty': series_dict['maxNumberOfShares'],
+            'has_spec_rights': 'Y' if series_dict['hasRightsOrRestrictions'] else 'N',
+            'name': series_dict['name']
+        }
+
+    @classmethod
+    def create_share_classes(cls, cursor, corp_num: str, class_rows: List[dict]):
+        """Insert the Share Classes for corp with one executemany."""
         query = (
             """
             insert into share_struct_cls (corp_num, share_class_id, start_event_id, currency_typ_cd, max_share_ind,
@@ -260,34 +315,17 @@ class ShareObject:  # pylint: disable=too-many-instance-attributes;
                 :par_value, :name)
             """
         )
+        if not class_rows:
+            return
         try:
-            cursor.execute(
-                query,
-                corp_num=corp_num,
-                class_id=class_id,
-                event_id=event_id,
-                currency=class_dict['currency'],
-                has_max_share='N' if class_dict['hasMaximumShares'] else 'Y',
-                qty=class_dict['maxNumberOfShares'],
-                has_spec_rights='Y' if class_dict['hasRightsOrRestrictions'] else 'N',
-                has_par_value='Y' if class_dict['hasParValue'] else 'N',
-                par_value=class_dict['parValue'],
-                name=class_dict['name']
-            )
+            cursor.executemany(query, class_rows)
         except Exception as err:
             current_app.logger.error(f'Error in Share Structure: Failed to create Share Classes for {corp_num}')
             raise err
 
-        series_id = 0
-        for share_series in class_dict.get('series', []):
-            cls.create_share_series(cursor, event_id, corp_num, class_id, series_id, share_series)
-            series_id = series_id + 1
-
     @classmethod
-    def create_share_series(
-            cls, cursor, event_id: str, corp_num: str, class_id: str, series_id: int, series_dict: dict):
-        # pylint: disable=too-many-arguments
-        """Insert Share Series for Share Class and Corp."""
+    def create_share_series(cls, cursor, corp_num: str, series_rows: List[dict]):
+        """Insert the Share Series for the Share Classes of corp with one executemany."""
         query = (
             """
             insert into share_series (corp_num, share_class_id, series_id, start_event_id, max_share_ind,
@@ -295,18 +333,10 @@ class ShareObject:  # pylint: disable=too-many-instance-attributes;
             values (:corp_num, :class_id, :series_id, :event_id, :has_max_share, :qty, :has_spec_rights, :name)
             """
         )
+        if not series_rows:
+            return
         try:
-            cursor.execute(
-                query,
-                corp_num=corp_num,
-                class_id=class_id,
-                series_id=series_id,
-                event_id=event_id,
-                has_max_share='N' if series_dict['hasMaximumShares'] else 'Y',
-                qty=series_dict['maxNumberOfShares'],
-                has_spec_rights='Y' if series_dict['hasRightsOrRestrictions'] else 'N',
-                name=series_dict['name']
-            )
+            cursor.executemany(query, series_rows)
         except Exception as err:
             current_app.logger.error(f'Error in Share Structure: Failed to create Share Series for {corp_num}')
             raise err
@@ -87,6 +87,45 @@ class BusinessInfo(Resource):
         return jsonify({'message': 'Failed to get new corp number'}), HTTPStatus.INTERNAL_SERVER_ERROR
 
 
+@cors_preflight('POST')
+@API.route('/<string:legal_type>/corp-nums', methods=['POST'])
+class CorpNumReservation(Resource):
+    """Reserve blocks of corp numbers."""
+
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    def post(legal_type: str):
+        """Reserve and return a block of sequential corp numbers for the given legal type."""
+        if legal_type not in [x.value for x in Business.LearBusinessTypes]:
+            return jsonify({'message': 'Must provide a valid legal type.'}), HTTPStatus.BAD_REQUEST
+
+        json_data = request.get_json(silent=True) or {}
+        try:
+            count = int(json_data.get('count', 1))
+        except (TypeError, ValueError):
+            count = 0
+        if not 0 < count <= current_app.config['MAX_CORP_NUM_RESERVATION']:
+            return jsonify({'message': 'Must provide a valid count of corp numbers to reserve.'}), \
+                HTTPStatus.BAD_REQUEST
+
+        corp_nums = None
+        con = None
+        try:
+            con = DB.connection
+            con.begin()
+            corp_nums = Business.reserve_corp_nums(con=con, corp_type=legal_type, count=count)
+            con.commit()
+        except Exception as err:  # pylint: disable=broad-except; want to catch all errors
+            current_app.logger.error(err.with_traceback(None))
+            if con:
+                con.rollback()
+
+        if corp_nums:
+            return jsonify({'corpNums': corp_nums}), HTTPStatus.OK
+
+        return jsonify({'message': 'Failed to reserve corp numbers'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+
 @cors_preflight('GET')
 @API.route('/<string:legal_type>/<string:identifier>/names/<string:name_type>', methods=['GET'])
 class BusinessNamesInfo(Resource):
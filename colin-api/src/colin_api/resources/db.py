@@ -15,36 +15,54 @@
 
 These will get initialized by the application.
 """
+import threading
+import time
+
 import cx_Oracle
 from flask import _app_ctx_stack, current_app
 
 
 class OracleDB:
-    """Oracle database connection object for re-use in application."""
+    """Oracle database connection object for re-use in application.
+
+    There is one session pool per app in the process. Each app context acquires a connection from the pool the
+    first time it is used, and it is released back to the pool when the app context is torn down.
+    """
 
     def __init__(self, app=None):
         """initializer, supports setting the app context on instantiation."""
+        self._lock = threading.Lock()
         if app is not None:
             self.init_app(app)
 
     def init_app(self, app):
-        """Create setup for the extension.
+        """Create setup for the extension, and the session pool.
 
+        If the database can't be reached, the pool is created when the first connection is needed instead.
         :param app: Flask app
         :return: naked
         """
         self.app = app
+        app.extensions['oracle_pool_stats'] = {'acquired': 0, 'wait_total': 0.0, 'wait_max': 0.0}
         app.teardown_appcontext(self.teardown)
+        try:
+            app.extensions['oracle_pool'] = self._create_pool(app.config)
+        except cx_Oracle.DatabaseError as err:  # pylint:disable=c-extension-no-member
+            app.logger.error(f'Unable to create the Oracle session pool at startup: {err}')
 
     @staticmethod
-    def teardown():
-        """Oracle session pool cleans up after itself."""
+    def teardown(exception=None):  # pylint: disable=unused-argument
+        """Release the connection acquired by the app context back to the pool."""
         ctx = _app_ctx_stack.top
-        if hasattr(ctx, 'oracle_pool'):
-            ctx.oracle_pool.close()
+        if connection := getattr(ctx, '_oracle_connection', None):
+            try:
+                ctx.app.extensions['oracle_pool'].release(connection)
+            except cx_Oracle.DatabaseError as err:  # pylint:disable=c-extension-no-member
+                ctx.app.logger.error(f'Unable to release the Oracle connection: {err}')
+            ctx._oracle_connection = None  # pylint: disable = protected-access; need this method
 
     @staticmethod
-    def _create_pool():
+    def _create_pool(config):
         """Create the cx_oracle connection pool from the Flask Config Environment.
 
         :return: an instance of the OCI Session Pool
@@ -57,37 +75,72 @@ class OracleDB:
         def init_session(conn, *args):  # pylint: disable=unused-argument; Extra var being passed with call
             cursor = conn.cursor()
             cursor.execute("alter session set TIME_ZONE = 'America/Vancouver'")
-        return cx_Oracle.SessionPool(user=current_app.config.get('ORACLE_USER'),  # pylint:disable=c-extension-no-member
-                                     password=current_app.config.get('ORACLE_PASSWORD'),
-                                     dsn='{0}:{1}/{2}'.format(current_app.config.get('ORACLE_HOST'),
-                                                              current_app.config.get('ORACLE_PORT'),
-                                                              current_app.config.get('ORACLE_DB_NAME')),
-                                     min=1,
-                                     max=10,
-                                     increment=1,
+        pool = cx_Oracle.SessionPool(user=config.get('ORACLE_USER'),  # pylint:disable=c-extension-no-member
+                                     password=config.get('ORACLE_PASSWORD'),
+                                     dsn='{0}:{1}/{2}'.format(config.get('ORACLE_HOST'),
+                                                              config.get('ORACLE_PORT'),
+                                                              config.get('ORACLE_DB_NAME')),
+                                     min=config.get('ORACLE_POOL_MIN', 1),
+                                     max=config.get('ORACLE_POOL_MAX', 10),
+                                     increment=config.get('ORACLE_POOL_INCREMENT', 1),
                                      connectiontype=cx_Oracle.Connection,  # pylint:disable=c-extension-no-member
                                      threaded=True,
-                                     getmode=cx_Oracle.SPOOL_ATTRVAL_NOWAIT,  # pylint:disable=c-extension-no-member
-                                     waitTimeout=1500,
+                                     getmode=cx_Oracle.SPOOL_ATTRVAL_TIMEDWAIT,  # pylint:disable=c-extension-no-member
+                                     waitTimeout=config.get('ORACLE_POOL_WAIT_TIMEOUT', 1500),
                                      timeout=3600,
                                      sessionCallback=init_session,
                                      encoding='UTF-8',
                                      nencoding='UTF-8')
+        pool.stmtcachesize = config.get('ORACLE_STMT_CACHE_SIZE', 50)
+        return pool
+
+    @property
+    def pool(self):
+        """Return the session pool of the current app, creating it if it couldn't be created at startup."""
+        extensions = current_app.extensions
+        if 'oracle_pool' not in extensions:
+            with self._lock:
+                if 'oracle_pool' not in extensions:
+                    extensions['oracle_pool'] = self._create_pool(current_app.config)
+        return extensions['oracle_pool']
 
     @property
     def connection(self):  # pylint: disable=inconsistent-return-statements
         """Create connection property for the NROService.
 
         If this is running in a Flask context,
-        then either get the existing connection pool or create a new one
-        and then return an acquired session
+        then either get the connection already acquired by the app context or acquire one from the pool
         :return: cx_Oracle.connection type
         """
         ctx = _app_ctx_stack.top
         if ctx is not None:
-            if not hasattr(ctx, 'oracle_pool'):
-                ctx._oracle_pool = self._create_pool()  # pylint: disable = protected-access; need this method
-            return ctx._oracle_pool.acquire()  # pylint: disable = protected-access; need this method
+            if not getattr(ctx, '_oracle_connection', None):
+                pool = self.pool
+                start = time.perf_counter()
+                ctx._oracle_connection = pool.acquire()  # pylint: disable = protected-access; need this method
+                wait = time.perf_counter() - start
+                stats = ctx.app.extensions['oracle_pool_stats']
+                with self._lock:
+                    stats['acquired'] += 1
+                    stats['wait_total'] += wait
+                    stats['wait_max'] = max(stats['wait_max'], wait)
+            return ctx._oracle_connection  # pylint: disable = protected-access; need this method
+
+    def get_pool_stats(self) -> dict:
+        """Return the size and usage of the session pool, and the time spent waiting to acquire connections."""
+        pool = self.pool
+        stats = current_app.extensions['oracle_pool_stats']
+        return {
+            'busy': pool.busy,
+            'open': pool.opened,
+            'min': pool.min,
+            'max': pool.max,
+            'statementCacheSize': pool.stmtcachesize,
+            'acquired': stats['acquired'],
+            'waitTotalSeconds': round(stats['wait_total'], 3),
+            'waitMeanSeconds': round(stats['wait_total'] / stats['acquired'], 3) if stats['acquired'] else 0,
+            'waitMaxSeconds': round(stats['wait_max'], 3)
+        }
 
 
 # export instance of this class
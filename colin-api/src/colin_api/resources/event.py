@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Event info endpoint for colin db."""
-from flask import current_app, jsonify
+import json
+from http import HTTPStatus
+
+from flask import Response, current_app, jsonify, request, stream_with_context
 from flask_restx import Resource, cors
 
 from colin_api.resources.business import API
@@ -20,6 +23,10 @@ from colin_api.resources.db import DB
 from colin_api.utils.util import cors_preflight
 
 
+# the rows fetched from oracle in each round trip
+EVENT_FETCH_SIZE = 1000
+
+
 @cors_preflight('GET, POST')
 @API.route('/event/<string:corp_type>/<string:event_id>')
 class EventInfo(Resource):
@@ -28,34 +35,66 @@ class EventInfo(Resource):
     @staticmethod
     @cors.crossdomain(origin='*')
     def get(corp_type, event_id):
-        """Return all event_ids of the corp_type that are greater than the given event_id."""
-        querystring = ("""
+        """Return the event_ids of the corp_types that are greater than the given event_id, in event_id order.
+
+        The corp_type can be a comma separated list of corp types. With a limit, at most that many events are
+        returned, along with the nextEventId to get the next page with, which is null on the last page.
+        The events are streamed to the response as they are fetched.
+        """
+        try:
+            limit = int(request.args.get('limit')) if request.args.get('limit') else None
+        except ValueError:
+            return jsonify({'message': 'limit must be a number'}), HTTPStatus.BAD_REQUEST
+        if limit is not None and limit < 1:
+            return jsonify({'message': 'limit must be greater than 0'}), HTTPStatus.BAD_REQUEST
+
+        binds = {f'corp_type_{i}': corp_type for i, corp_type in enumerate(filter(None, corp_type.split(',')))}
+        querystring = (f"""
             select event.event_id, corporation.corp_num, corporation.corp_typ_cd, filing.filing_typ_cd
             from event
             join filing on event.event_id = filing.event_id
             join corporation on EVENT.corp_num = corporation.corp_num
-            where corporation.corp_typ_cd = :corp_type
+            where corporation.corp_typ_cd in ({', '.join(f':{name}' for name in binds)})
             """)
+        if event_id != 'earliest':
+            querystring += 'and event.event_id > :max_event_id '
+            binds['max_event_id'] = event_id
+        else:
+            querystring += "and event_timestmp > TO_DATE('2019-03-08', 'yyyy-mm-dd') "
+        querystring += 'order by event.event_id asc'
+        if limit:
+            querystring = f'select * from ({querystring}) where rownum <= :limit'
+            binds['limit'] = limit
+
         try:
             cursor = DB.connection.cursor()
-            if event_id != 'earliest':
-                querystring += 'and event.event_id > :max_event_id '
-                cursor.execute(querystring, max_event_id=event_id, corp_type=corp_type)
-            else:
-                querystring += "and event_timestmp > TO_DATE('2019-03-08', 'yyyy-mm-dd') order by event.event_id asc"
-                cursor.execute(querystring, corp_type=corp_type)
-            event_info = cursor.fetchall()
-            event_list = []
-            for event in event_info:
-                event = dict(zip([x[0].lower() for x in cursor.description], event))
-                event_list.append(event)
-            return jsonify({'events': event_list})
-
+            cursor.arraysize = min(limit or EVENT_FETCH_SIZE, EVENT_FETCH_SIZE)
+            cursor.prefetchrows = cursor.arraysize + 1
+            cursor.execute(querystring, **binds)
+            columns = [x[0].lower() for x in cursor.description]
+            rows = cursor.fetchmany()
         except Exception as err:  # pylint: disable=broad-except; want to catch all errors
             current_app.logger.error(err.with_traceback(None))
             return jsonify(
                 {'message': 'Error when trying to retrieve events from COLIN'}), 500
 
+        def generate_events(rows):
+            yield '{"events": ['
+            count = 0
+            last_event_id = None
+            while rows:
+                for row in rows:
+                    yield (',' if count else '') + json.dumps(dict(zip(columns, row)), default=str)
+                    count += 1
+                    last_event_id = row[0]
+                rows = cursor.fetchmany()
+            yield ']'
+            if limit:
+                yield f', "nextEventId": {json.dumps(last_event_id if count == limit else None)}'
+            yield '}'
+
+        return Response(stream_with_context(generate_events(rows)), mimetype='application/json')
+
 
 @cors_preflight('GET')
 @API.route('/event/corp_num/<string:corp_num>')
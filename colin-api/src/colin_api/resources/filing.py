@@ -16,6 +16,7 @@
 Currently this only provides API versioning information
 """
 from http import HTTPStatus
+from typing import Tuple
 
 from flask import current_app, jsonify, request
 from flask_restx import Resource, cors
@@ -84,30 +85,34 @@ class FilingInfo(Resource):
     @cors.crossdomain(origin='*')
     def post(legal_type, identifier, **kwargs):
         """Create a new filing."""
-        # pylint: disable=unused-argument,too-many-branches; filing_type is only used for the get
+        # pylint: disable=unused-argument; filing_type is only used for the get
+        body, status = FilingInfo.create_filing(legal_type, identifier, request.get_json())
+        return jsonify(body), status
+
+    @staticmethod
+    def create_filing(legal_type: str, identifier: str, json_data: dict) -> Tuple[dict, HTTPStatus]:
+        """Validate and add the filing in its own transaction, returning the completed filing or the error."""
+        # pylint: disable=too-many-return-statements,too-many-branches
         try:
             if legal_type not in [x.value for x in Business.LearBusinessTypes]:
-                return jsonify({'message': 'Must provide a valid legal type.'}), HTTPStatus.BAD_REQUEST
+                return {'message': 'Must provide a valid legal type.'}, HTTPStatus.BAD_REQUEST
 
-            json_data = request.get_json()
             if not json_data:
-                return jsonify({'message': 'No input data provided'}), HTTPStatus.BAD_REQUEST
+                return {'message': 'No input data provided'}, HTTPStatus.BAD_REQUEST
 
             # validate schema
             is_valid, errors = validate(json_data, 'filing', validate_schema=True)
             if not is_valid:
                 for err in errors:
                     print(err.message)
-                return jsonify(
-                    {'message': 'Error: Invalid Filing schema'}), HTTPStatus.BAD_REQUEST
+                return {'message': 'Error: Invalid Filing schema'}, HTTPStatus.BAD_REQUEST
 
             json_data = json_data.get('filing', None)
 
             # ensure that the business in the AR matches the business in the URL
             if identifier != json_data['business']['identifier']:
-                return jsonify(
-                    {'message': 'Error: Identifier in URL does not match identifier in filing data'}
-                ), HTTPStatus.BAD_REQUEST
+                return {'message': 'Error: Identifier in URL does not match identifier in filing data'}, \
+                    HTTPStatus.BAD_REQUEST
 
             # convert identifier if BC legal_type
             if legal_type in Business.CORP_TYPE_CONVERSION[Business.LearBusinessTypes.BCOMP.value]:
@@ -157,7 +162,7 @@ class FilingInfo(Resource):
 
                 # success! commit the db changes
                 con.commit()
-                return jsonify(completed_filing.as_dict()), HTTPStatus.CREATED
+                return completed_filing.as_dict(), HTTPStatus.CREATED
 
             except Exception as db_err:
                 current_app.logger.error('failed to file - rolling back partial db changes.')
@@ -168,9 +173,8 @@ class FilingInfo(Resource):
         except Exception as err:  # pylint: disable=broad-except; want to catch all errors
             # general catch-all exception
             current_app.logger.error(err.with_traceback(None))
-            return jsonify(
-                {'message': f'Error when trying to file for business {identifier}'}
-            ), HTTPStatus.INTERNAL_SERVER_ERROR
+            return {'message': f'Error when trying to file for business {identifier}'}, \
+                HTTPStatus.INTERNAL_SERVER_ERROR
 
     @staticmethod
     def _add_filings(con, json_data: dict, filing_list: list, identifier: str, corp_types: list) -> list:
@@ -193,3 +197,32 @@ class FilingInfo(Resource):
             event_id = Filing.add_filing(con, filing)
             filings_added.append({'event_id': event_id, 'filing_type': filing_type})
         return filings_added
+
+
+@cors_preflight('POST')
+@API.route('/<string:legal_type>/<string:identifier>/filings')
+class FilingBatch(Resource):
+    """Create a batch of filings for a business."""
+
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    def post(legal_type, identifier):
+        """Create the filings in order, each in its own transaction, stopping at the first that fails.
+
+        The later filings are not created, so the business's filings are never applied out of order.
+        Returns the colin event ids of each created filing, and the error of the failed filing.
+        """
+        json_data = request.get_json()
+        if not json_data or not isinstance(json_data.get('filings'), list):
+            return jsonify({'message': 'No filings provided'}), HTTPStatus.BAD_REQUEST
+
+        results = []
+        for filing_json in json_data['filings']:
+            filing_id = filing_json.get('filingId') if isinstance(filing_json, dict) else None
+            body, status = FilingInfo.create_filing(legal_type, identifier, filing_json)
+            if status != HTTPStatus.CREATED:
+                results.append({'filingId': filing_id, 'error': body['message'], 'status': status})
+                break
+            results.append({'filingId': filing_id, 'colinIds': body['filing']['header']['colinIds']})
+
+        return jsonify({'filings': results}), HTTPStatus.OK
@@ -48,6 +48,19 @@ class Healthz(Resource):
         return {'message': 'api is healthy'}, 200
 
 
+@API.route('pool')
+class Pool(Resource):
+    """Reports the usage of the database session pool."""
+
+    @staticmethod
+    def get():
+        """Return a JSON object of the session pool's busy and open connections and the time spent waiting for them."""
+        try:
+            return DB.get_pool_stats(), 200
+        except cx_Oracle.DatabaseError as err:  # pylint:disable=c-extension-no-member
+            return {'message': 'pool is down', 'details': str(err)}, 500
+
+
 @API.route('readyz')
 class Readyz(Resource):
     """Determines if the service is ready to respond."""
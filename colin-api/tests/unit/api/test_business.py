@@ -53,3 +53,20 @@ def test_get_business_new_corp(client):
 
     assert 200 == rv_cp.status_code
     assert 200 == rv_bc.status_code
+
+
+@oracle_integration
+def test_reserve_corp_nums(client):
+    """Assert that a block of sequential corp numbers can be reserved from COLIN."""
+    rv = client.post('/api/v1/businesses/CP/corp-nums', json={'count': 3})
+
+    assert 200 == rv.status_code
+    corp_nums = [int(corp_num) for corp_num in rv.json['corpNums']]
+    assert corp_nums == list(range(corp_nums[0], corp_nums[0] + 3))
+
+
+def test_reserve_corp_nums_invalid_count(client):
+    """Assert that the count of corp numbers to reserve is validated."""
+    rv = client.post('/api/v1/businesses/CP/corp-nums', json={'count': 0})
+
+    assert 400 == rv.status_code
@@ -0,0 +1,51 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the event end-point.
+
+Test-Suite to ensure that the /event endpoint is working as expected.
+"""
+from tests import oracle_integration
+
+
+@oracle_integration
+def test_get_events_paged(client):
+    """Assert that the events are paged through in event_id order, with the next event id of each page."""
+    rv = client.get('/api/v1/businesses/event/CP/earliest?limit=5')
+
+    assert 200 == rv.status_code
+    first_page = rv.json['events']
+    assert len(first_page) == 5
+    assert rv.json['nextEventId'] == first_page[-1]['event_id']
+    assert [event['event_id'] for event in first_page] == sorted(event['event_id'] for event in first_page)
+
+    rv = client.get(f'/api/v1/businesses/event/CP/{rv.json["nextEventId"]}?limit=5')
+
+    assert 200 == rv.status_code
+    assert rv.json['events'][0]['event_id'] > first_page[-1]['event_id']
+
+
+@oracle_integration
+def test_get_events_corp_types(client):
+    """Assert that the events of several corp types are returned by one call."""
+    rv = client.get('/api/v1/businesses/event/CP,BC/earliest?limit=1000')
+
+    assert 200 == rv.status_code
+    assert {event['corp_typ_cd'] for event in rv.json['events']} <= {'CP', 'BC'}
+
+
+def test_get_events_invalid_limit(client):
+    """Assert that a limit that isn't a positive number is rejected."""
+    rv = client.get('/api/v1/businesses/event/CP/earliest?limit=none')
+
+    assert 400 == rv.status_code
@@ -0,0 +1,44 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks of the latency of getting a filing, by filing type."""
+import statistics
+import time
+
+import pytest
+
+from tests import benchmark, oracle_integration
+
+
+RUNS = 20
+
+
+@benchmark
+@oracle_integration
+@pytest.mark.parametrize('url', [
+    '/api/v1/businesses/CP/CP0001965/filings/annualReport',
+    '/api/v1/businesses/CP/CP0001965/filings/changeOfDirectors',
+    '/api/v1/businesses/CP/CP0001965/filings/changeOfAddress',
+    '/api/v1/businesses/CP/CP0001939/filings/changeOfName',
+])
+def test_get_filing_latency(client, url):
+    """Assert that the filing can be got, printing the mean and worst latency of getting it."""
+    latencies = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        rv = client.get(url)
+        latencies.append(time.perf_counter() - start)
+        assert 200 == rv.status_code
+
+    print(f'\n{url}: mean {statistics.mean(latencies) * 1000:.1f}ms, max {max(latencies) * 1000:.1f}ms '
+          f'over {RUNS} runs')
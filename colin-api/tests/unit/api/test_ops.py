@@ -16,6 +16,7 @@
 
 Test-Suite to ensure that the /ops endpoint is working as expected.
 """
+from colin_api import config, create_app
 from tests import oracle_integration
 
 
@@ -28,9 +29,10 @@ def test_ops_healthz_success(client):
     assert {'message': 'api is healthy'} == rv.json
 
 
-def test_ops_healthz_fail(app_request):
+def test_ops_healthz_fail(monkeypatch):
     """Assert that the service is unhealthy if a connection toThe database cannot be made."""
-    app_request.config['ORACLE_DB_NAME'] = 'somethingnotreal'
+    monkeypatch.setattr(config.TestConfig, 'ORACLE_DB_NAME', 'somethingnotreal')
+    app_request = create_app('testing')
     with app_request.test_client() as client:
         rv = client.get('/ops/healthz')
 
@@ -38,6 +40,19 @@ def test_ops_healthz_fail(app_request):
         assert 'api is down' in rv.json.values()
 
 
+@oracle_integration
+def test_ops_pool(client):
+    """Assert that the session pool is reused across requests, and its usage is reported."""
+    client.get('/ops/healthz')
+    client.get('/ops/healthz')
+    rv = client.get('/ops/pool')
+
+    assert 200 == rv.status_code
+    assert rv.json['acquired'] >= 2
+    assert rv.json['busy'] == 0
+    assert 1 <= rv.json['open'] <= rv.json['max']
+
+
 def test_ops_readyz(client):
     """Asserts that the service is ready to serve."""
     rv = client.get('/ops/readyz')
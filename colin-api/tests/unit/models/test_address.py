@@ -0,0 +1,102 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the addresses of offices and parties are loaded in batches."""
+from datetime import datetime
+
+import pytest
+
+from colin_api.exceptions import AddressNotFoundException
+from colin_api.models import Address, Office, Party
+
+
+ADDRESS_COLUMNS = ['ADDR_ID', 'ADDR_LINE_1', 'ADDR_LINE_2', 'ADDR_LINE_3', 'CITY', 'PROVINCE', 'FULL_DESC',
+                   'POSTAL_CD', 'DELIVERY_INSTRUCTIONS']
+OFFICE_COLUMNS = ['START_EVENT_ID', 'END_EVENT_ID', 'MAILING_ADDR_ID', 'DELIVERY_ADDR_ID', 'OFFICE_TYP_CD']
+PARTY_COLUMNS = ['FIRST_NME', 'MIDDLE_NME', 'LAST_NME', 'DELIVERY_ADDR_ID', 'MAILING_ADDR_ID', 'APPOINTMENT_DT',
+                 'CESSATION_DT', 'START_EVENT_ID', 'END_EVENT_ID', 'BUSINESS_NME', 'PARTY_TYP_CD', 'CORP_PARTY_ID']
+
+
+class CountingCursor:
+    """A cursor that counts the queries executed, returning the rows given for each table queried."""
+
+    def __init__(self, rows: dict):
+        """Initialize with the (columns, rows) to return for each table."""
+        self.rows = rows
+        self.executed = []
+        self.description = None
+        self._result = []
+
+    def execute(self, query, **kwargs):
+        """Record the query, and select the rows of the table it queries."""
+        self.executed.append(query)
+        table = next(table for table in self.rows if f'from {table}' in query.lower())
+        columns, rows = self.rows[table]
+        if table == 'address':
+            rows = [row for row in rows if row[0] in kwargs.values()]
+        self.description = [(column,) for column in columns]
+        self._result = rows
+
+    def fetchall(self):
+        """Return the selected rows."""
+        return self._result
+
+    def fetchone(self):
+        """Return the first selected row."""
+        return self._result[0] if self._result else None
+
+
+def _address_rows(count):
+    return [(addr_id, f'{addr_id} Main St', None, None, 'Victoria', 'BC', 'Canada', 'V8W 1A1', None)
+            for addr_id in range(1, count + 1)]
+
+
+def test_offices_load_addresses_in_one_query(app):
+    """Assert that the addresses of all of the offices are fetched with one query."""
+    cursor = CountingCursor({
+        'office': (OFFICE_COLUMNS, [(1, None, 2, 1, 'RG'), (1, None, None, 3, 'RC')]),
+        'address': (ADDRESS_COLUMNS, _address_rows(3))
+    })
+    with app.app_context():
+        offices = Office._build_offices_list(  # pylint: disable=protected-access
+            cursor, querystring='select * from office where corp_num=:identifier', identifier='CP0000001')
+
+    assert len(cursor.executed) == 2
+    assert offices[0].delivery_address['streetAddress'] == '1 Main St'
+    assert offices[0].mailing_address['streetAddress'] == '2 Main St'
+    assert offices[1].mailing_address == offices[1].delivery_address
+
+
+def test_parties_load_addresses_in_one_query(app):
+    """Assert that the addresses of 20 directors are fetched with one query, instead of one query per address."""
+    directors = [(f'FIRST{i}', '', f'LAST{i}', 2 * i + 1, 2 * i + 2, datetime(2020, 1, 1), None, 1, None, None,
+                  'DIR', i) for i in range(20)]
+    cursor = CountingCursor({
+        'corp_party': (PARTY_COLUMNS, directors),
+        'address': (ADDRESS_COLUMNS, _address_rows(40))
+    })
+    with app.app_context():
+        parties = Party.get_current(cursor, 'CP0000001')
+
+    assert len(cursor.executed) == 2
+    assert len(parties) == 20
+    assert parties[0].delivery_address['streetAddress'] == '1 Main St'
+    assert parties[0].mailing_address['streetAddress'] == '2 Main St'
+
+
+def test_get_by_address_ids_missing(app):
+    """Assert that an address that isn't found raises an AddressNotFoundException."""
+    cursor = CountingCursor({'address': (ADDRESS_COLUMNS, _address_rows(1))})
+    with app.app_context():
+        with pytest.raises(AddressNotFoundException):
+            Address.get_by_address_ids(cursor, [1, 2])
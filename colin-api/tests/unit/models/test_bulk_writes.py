@@ -0,0 +1,109 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the share structures and parties of large filings are written in batches."""
+from colin_api.models import Party, ShareObject
+from colin_api.models.filing import Filing
+
+
+class RecordingCursor:
+    """A cursor that records the round trips made, returning 100 for every id queried."""
+
+    rowcount = 1
+
+    def __init__(self):
+        """Initialize with no round trips."""
+        self.round_trips = []
+
+    def execute(self, query, **kwargs):  # pylint: disable=unused-argument
+        """Record the query."""
+        self.round_trips.append((query, 1))
+
+    def executemany(self, query, rows):
+        """Record the query, and the number of rows inserted with it."""
+        self.round_trips.append((query, len(rows)))
+
+    def fetchone(self):
+        """Return the next id."""
+        return (100,)
+
+    def inserted(self, table):
+        """Return the number of rows inserted into the table."""
+        return sum(rows for query, rows in self.round_trips if f'insert into {table} ' in query.lower())
+
+    def index(self, statement):
+        """Return the indexes of the round trips made with the statement."""
+        return [i for i, (query, _) in enumerate(self.round_trips) if statement in query.lower()]
+
+
+def _address(street):
+    return {'streetAddress': street, 'addressCity': 'Victoria', 'addressRegion': 'BC', 'addressCountry': 'Canada',
+            'postalCode': 'V8W 1A1'}
+
+
+def test_create_share_structure_in_batches(app):
+    """Assert that 20 share classes with 5 series each are inserted with one round trip per table."""
+    shares_list = [{'name': f'Class {i}', 'currency': 'CAD', 'hasMaximumShares': True, 'maxNumberOfShares': 100,
+                    'hasRightsOrRestrictions': False, 'hasParValue': False, 'parValue': None,
+                    'series': [{'name': f'Series {i}-{j}', 'hasMaximumShares': False, 'maxNumberOfShares': None,
+                                'hasRightsOrRestrictions': False} for j in range(5)]}
+                   for i in range(20)]
+    cursor = RecordingCursor()
+    with app.app_context():
+        ShareObject.create_share_structure(cursor, 'BC0000001', 1, shares_list)
+
+    # the share_struct insert, the max class id, and one insert each for the classes and the series
+    assert len(cursor.round_trips) == 4
+    assert cursor.inserted('share_struct_cls') == 20
+    assert cursor.inserted('share_series') == 100
+
+
+def test_create_new_corp_parties_in_batches(app):
+    """Assert that 50 parties, and their addresses, are inserted with a constant number of round trips."""
+    parties = [{'officer': {'firstName': f'FIRST{i}', 'lastName': f'LAST{i}'}, 'appointmentDate': '2021-01-01',
+                'deliveryAddress': _address(f'{i} Main St'), 'mailingAddress': _address(f'{i} Mail St')}
+               for i in range(50)]
+    cursor = RecordingCursor()
+    with app.app_context():
+        corp_party_ids = Party.create_new_corp_parties(cursor, 1, parties, {'business': {'identifier': 'BC0000001'}})
+
+    # the party ids and address ids are each allocated with a select and an update, then inserted in one round trip
+    assert len(cursor.round_trips) == 6
+    assert corp_party_ids == list(range(100, 150))
+    assert cursor.inserted('address') == 100
+    assert cursor.inserted('corp_party') == 50
+
+
+def test_process_directors_ceases_before_appointing_same_name(app):
+    """Assert that a director ceased and appointed again under the same name is ceased before being appointed."""
+    def director(first_name, actions):
+        return {'officer': {'firstName': first_name, 'lastName': 'SMITH'}, 'appointmentDate': '2021-01-01',
+                'deliveryAddress': _address('1 Main St'), 'actions': actions}
+
+    filing = Filing()
+    filing.filing_type = 'changeOfDirectors'
+    filing.event_id = 1
+    filing.body = {'directors': [director('ANNE', ['appointed']),
+                                 {**director('J', ['ceased']), 'cessationDate': '2021-01-01'},
+                                 director('J', ['appointed'])]}
+    cursor = RecordingCursor()
+    with app.app_context():
+        Filing._process_directors(  # pylint: disable=protected-access
+            cursor, filing, {'business': {'identifier': 'BC0000001'}}, 'BC0000001')
+
+    # the appointed director before the cease is inserted before it, the one after the cease after it
+    inserts = cursor.index('insert into corp_party ')
+    updates = cursor.index('update corp_party')
+    assert len(inserts) == 2
+    assert len(updates) == 1
+    assert inserts[0] < updates[0] < inserts[1]
@@ -0,0 +1,101 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests to assure the components of a filing are fetched in few queries."""
+from datetime import datetime
+
+from colin_api.models import CorpName, ShareObject
+from colin_api.models.filing import Filing
+from tests.unit.models.test_address import CountingCursor
+
+
+NAME_COLUMNS = ['START_EVENT_ID', 'CORP_NME', 'CORP_NAME_TYP_CD', 'CORP_NUM', 'END_EVENT_ID']
+CLASS_COLUMNS = ['SHARE_CLASS_ID', 'CURRENCY_TYP_CD', 'MAX_SHARE_IND', 'SHARE_QUANTITY', 'SPEC_RIGHTS_IND',
+                 'PAR_VALUE_IND', 'PAR_VALUE_AMT', 'CLASS_NME', 'OTHER_CURRENCY', 'START_EVENT_ID']
+SERIES_COLUMNS = ['SERIES_ID', 'MAX_SHARE_IND', 'SHARE_QUANTITY', 'SPEC_RIGHT_IND', 'SERIES_NME', 'SHARE_CLASS_ID']
+
+
+def test_ar_component_events_in_one_query(app):
+    """Assert that the latest office and director events up to an AR are fetched with one query."""
+    cursor = CountingCursor({'event': (['FILING_TYP_CD', 'EVENT_ID'], [('OTADD', 5)])})
+    ar_event = {'event_id': 10, 'event_timestmp': datetime(2021, 1, 1)}
+    with app.app_context():
+        events = Filing._get_ar_component_events(  # pylint: disable=protected-access
+            cursor, 'CP0000001', ['OTADD', 'OTCDR'], ar_event)
+
+    assert len(cursor.executed) == 1
+    assert 'partition by filing.filing_typ_cd' in cursor.executed[0]
+    # the directors have no event before the AR, so they are read from the AR event
+    assert events == {'OTADD': 5, 'OTCDR': 10}
+
+
+def test_ar_component_events_without_components(app):
+    """Assert that an AR with no offices or directors doesn't query the events."""
+    cursor = CountingCursor({})
+    with app.app_context():
+        events = Filing._get_ar_component_events(  # pylint: disable=protected-access
+            cursor, 'CP0000001', [], {'event_id': 10, 'event_timestmp': datetime(2021, 1, 1)})
+
+    assert not cursor.executed
+    assert events == {}
+
+
+def test_get_all_by_event_returns_names_of_all_types(app):
+    """Assert that the legal name and the translations of an event are fetched with one query."""
+    cursor = CountingCursor({'corp_name': (NAME_COLUMNS, [(10, 'NEW NAME LTD.', 'CO', 'BC0000001', None),
+                                                          (10, 'NOUVEAU NOM', 'TR', 'BC0000001', None),
+                                                          (3, 'OLD NAME', 'TR', 'BC0000001', 10)])})
+    with app.app_context():
+        names = CorpName.get_all_by_event(cursor, 'BC0000001', 10)
+
+    assert len(cursor.executed) == 1
+    assert [name.corp_name for name in names if name.type_code not in (None, 'TR')] == ['NEW NAME LTD.']
+    translations = [name for name in names if name.type_code == 'TR']
+    assert [(name.corp_name, name.event_id, name.end_event_id) for name in translations] == \
+        [('NOUVEAU NOM', 10, None), ('OLD NAME', 3, 10)]
+
+
+def test_share_structures_grouped_by_event(app):
+    """Assert that the classes and series of all share structures are fetched with one query each."""
+    cursor = CountingCursor({
+        'share_struct_cls': (CLASS_COLUMNS, [(1, 'CAD', True, 100, False, False, None, 'Class A', None, 10),
+                                             (2, 'CAD', False, None, False, False, None, 'Class B', None, 10),
+                                             (3, 'CAD', False, None, False, False, None, 'Class C', None, 20)]),
+        'share_series': (SERIES_COLUMNS, [(1, False, None, False, 'Series A1', 1),
+                                          (2, False, None, False, 'Series A2', 1),
+                                          (3, False, None, False, 'Series C1', 3)]),
+        'share_struct': (['START_EVENT_ID', 'END_EVENT_ID'], [(10, 20), (20, None)])
+    })
+    with app.app_context():
+        share_structures = ShareObject.get_all(cursor, 'BC0000001')
+
+    # the share structures, their classes, and the series of the classes
+    assert len(cursor.executed) == 3
+    assert [[share_class.share_name for share_class in share_structure.share_classes]
+            for share_structure in share_structures] == [['Class A', 'Class B'], ['Class C']]
+    assert [[series.share_name for series in share_class.series]
+            for share_class in share_structures[0].share_classes] == [['Series A1', 'Series A2'], []]
+    assert [series.share_name for series in share_structures[1].share_classes[0].series] == ['Series C1']
+
+
+def test_share_classes_chunked(app):
+    """Assert that the classes of more than 1000 share structures are fetched 1000 events at a time."""
+    cursor = CountingCursor({'share_struct_cls': (CLASS_COLUMNS, [])})
+    with app.app_context():
+        share_classes = ShareObject._get_share_classes(  # pylint: disable=protected-access
+            cursor, list(range(1500)), 'BC0000001')
+
+    assert len(cursor.executed) == 2
+    assert ':event_id_999)' in cursor.executed[0]
+    assert ':event_id_499)' in cursor.executed[1]
+    assert share_classes == {}
@@ -26,4 +26,7 @@ skip_coop_ia = pytest.mark.skip(reason='no coop IA currently')
 oracle_integration = pytest.mark.skipif((os.getenv('ORACLE_INTEGRATION_TESTING', False) is False),
                                         reason='requires access to a test version of Oracle CTST')
 
+benchmark = pytest.mark.skipif((os.getenv('RUN_BENCHMARKS', False) is False),
+                               reason='Benchmarks are only run when requested.')
+
 skip_in_pod = pytest.mark.skipif((os.getenv('POD_TESTING', False) is False), reason='Skip test when running in pod')
@@ -14,6 +14,11 @@ class Config(object):
     EMAIL_SMTP = os.getenv('EMAIL_SMTP', '')
     ENVIRONMENT = os.getenv('ENVIRONMENT', '')
     MONTH_REPORT_DATES = os.getenv('MONTH_REPORT_DATES', '')
+    # 'notebook' runs the papermill notebooks, 'sql' runs the reports from the rollups in the reporting schema
+    REPORT_ENGINE = os.getenv('REPORT_ENGINE', 'notebook')
+    ROLLUP_REFRESH_DAYS = int(os.getenv('ROLLUP_REFRESH_DAYS', '7'))
+    NOTEBOOK_WORKERS = int(os.getenv('NOTEBOOK_WORKERS', '4'))
+    NOTEBOOK_TIMEOUT = int(os.getenv('NOTEBOOK_TIMEOUT', '3600'))
 
     # POSTGRESQL
     PG_USER = os.getenv('PG_USER', '')
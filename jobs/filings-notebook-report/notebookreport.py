@@ -4,10 +4,12 @@ import ast
 import fnmatch
 import logging
 import os
+import signal
 import smtplib
 import sys
 import time
 import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from datetime import datetime, timedelta
 from email import encoders
 from email.mime.base import MIMEBase
@@ -18,6 +20,7 @@ import papermill as pm
 from dateutil.relativedelta import relativedelta
 from flask import Flask, current_app
 
+import reportengine
 from config import Config
 from util.logging import setup_logging
 
@@ -108,56 +111,133 @@ def send_email(note_book, emailtype, errormessage):
     server.quit()
     os.remove(os.getenv('DATA_DIR', '')+filename)
 
-def processnotebooks(notebookdirectory):
-    """Process Notebook."""
+class NotebookTimeoutError(Exception):
+    """Raised when a notebook runs longer than its timeout."""
+
+
+def _raise_timeout(signum, frame):  # pylint: disable=unused-argument
+    raise NotebookTimeoutError('Notebook timed out')
+
+
+def execute_notebook(file, output_file, timeout):
+    """Execute the notebook to its own output file in a pool process, failing when it runs past the timeout."""
+    signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.alarm(timeout)
+    try:
+        pm.execute_notebook(file, output_file, parameters=None)
+    finally:
+        signal.alarm(0)
+        if os.path.exists(output_file):
+            os.remove(output_file)
+
+
+def processnotebooks(notebookdirectory):  # pylint: disable=too-many-locals
+    """Process Notebook.
+
+    The notebooks run at the same time in a process pool. A failed notebook is retried after RETRY_INTERVAL,
+    without holding up the others, until it has been tried RETRY_TIMES.
+    """
     status = False
     now = datetime.now()
-    
+
     try:
         retry_times = int(os.getenv('RETRY_TIMES', '1'))
         retry_interval = int(os.getenv('RETRY_INTERVAL', '60'))
+        max_workers = int(os.getenv('NOTEBOOK_WORKERS', '4'))
+        timeout = int(os.getenv('NOTEBOOK_TIMEOUT', '3600'))
         if notebookdirectory == 'monthly':
             days = ast.literal_eval(os.getenv('MONTH_REPORT_DATES', ''))
     except Exception:
         logging.exception('Error processing notebook for %s', notebookdirectory)
         send_email(notebookdirectory, 'ERROR', traceback.format_exc())
         return status
-    
+
     # For monthly tasks, we only run on the specified days
-    if notebookdirectory == 'daily' or (notebookdirectory == 'monthly' and now.day in days):        
+    if notebookdirectory == 'daily' or (notebookdirectory == 'monthly' and now.day in days):
         logging.info('Processing: %s', notebookdirectory)
-        
-        num_files = len(os.listdir(notebookdirectory))
-        file_processed = 0
-        
-        for file in findfiles(notebookdirectory, '*.ipynb'):
-            file_processed += 1
-            note_book = os.path.basename(file)
-            for attempt in range(retry_times):
-                try:                    
-                    pm.execute_notebook(file, os.getenv('DATA_DIR', '')+'temp.ipynb', parameters=None)
-                    send_email(note_book, '', '')
-                    os.remove(os.getenv('DATA_DIR', '')+'temp.ipynb')                    
-                    status = True                    
-                    break
-                except Exception:
-                    if attempt + 1 == retry_times:
-                        # If any errors occur with the notebook processing they will be logged to the log file
-                        logging.exception(
-                            'Error processing notebook %s at %s/%s try.', notebookdirectory, attempt + 1,
-                            retry_times)
-                        send_email(notebookdirectory, 'ERROR', traceback.format_exc())
-                    else:
-                        # If any errors occur with the notebook processing they will be logged to the log file
-                        logging.exception('Error processing notebook %s at %s/%s try. '
-                                          'Sleeping for %s secs before next try', notebookdirectory, attempt + 1,
-                                          retry_times, retry_interval)
-                        time.sleep(retry_interval)
+
+        # (time it can start, notebook file, attempt) for each notebook waiting to run
+        pending = [(time.monotonic(), file, 1) for file in findfiles(notebookdirectory, '*.ipynb')]
+        started = {file: time.monotonic() for _, file, _ in pending}
+        summary = {}
+        running = {}
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            while pending or running:
+                ready = [item for item in pending if item[0] <= time.monotonic()]
+                for item in ready:
+                    pending.remove(item)
+                    _, file, attempt = item
+                    note_book = os.path.basename(file)
+                    # each run of each notebook gets its own output file, so they can't clobber each other
+                    output_file = os.getenv('DATA_DIR', '') + \
+                        f'{os.path.splitext(note_book)[0]}_{os.getpid()}_{attempt}.ipynb'
+                    running[executor.submit(execute_notebook, file, output_file, timeout)] = (file, attempt)
+
+                wait_for = min((item[0] for item in pending), default=time.monotonic()) - time.monotonic()
+                if not running:
+                    # nothing to wait on until the next retry is due
+                    time.sleep(max(wait_for, 0))
+                    continue
+                done, _ = wait(running, timeout=max(wait_for, 0) if pending else None, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file, attempt = running.pop(future)
+                    note_book = os.path.basename(file)
+                    try:
+                        future.result()
+                        send_email(note_book, '', '')
+                        status = True
+                        summary[note_book] = ('succeeded', attempt, time.monotonic() - started[file])
+                    except Exception as err:  # pylint: disable=broad-except
+                        errormessage = ''.join(traceback.format_exception(type(err), err, err.__traceback__))
+                        if attempt == retry_times:
+                            # If any errors occur with the notebook processing they will be logged to the log file
+                            logging.error('Error processing notebook %s at %s/%s try.\n%s',
+                                          note_book, attempt, retry_times, errormessage)
+                            send_email(notebookdirectory, 'ERROR', errormessage)
+                            summary[note_book] = ('failed', attempt, time.monotonic() - started[file])
+                        else:
+                            logging.error('Error processing notebook %s at %s/%s try. '
+                                          'Retrying in %s secs.\n%s',
+                                          note_book, attempt, retry_times, retry_interval, errormessage)
+                            pending.append((time.monotonic() + retry_interval, file, attempt + 1))
+
+        for note_book, (result, attempts, elapsed) in summary.items():
+            logging.info('Notebook %s %s after %s tries in %s', note_book, result, attempts,
+                         timedelta(seconds=round(elapsed)))
+    return status
+
+
+def processreports(schedule):
+    """Process the SQL reports on the schedule, refreshing the rollups they read from first."""
+    status = False
+    now = datetime.now()
+
+    try:
+        if schedule == 'monthly':
+            days = ast.literal_eval(os.getenv('MONTH_REPORT_DATES', ''))
+        if schedule == 'daily' or (schedule == 'monthly' and now.day in days):
+            logging.info('Processing: %s', schedule)
+            report_date = (now - timedelta(1)).date()
+            conn = reportengine.connect()
+            try:
+                reportengine.refresh_rollups(conn, report_date)
+                for report_name, report in reportengine.REPORTS.items():
+                    if report.schedule != schedule:
                         continue
-            if not status and num_files == file_processed:
-                break
+                    start = time.perf_counter()
+                    reportengine.write_report(conn, report_name, report_date)
+                    logging.info('Report %s written in %.1fs', report_name, time.perf_counter() - start)
+                    send_email(report_name, '', '')
+                    status = True
+            finally:
+                conn.close()
+    except Exception:
+        logging.exception('Error processing reports for %s', schedule)
+        send_email(schedule, 'ERROR', traceback.format_exc())
+        status = False
     return status
 
+
 if __name__ == '__main__':
     start_time = datetime.utcnow()
 
@@ -166,7 +246,10 @@ if __name__ == '__main__':
         if not os.path.isdir(subdir):
             os.mkdir(subdir)
 
-        processnotebooks(subdir)
+        if Config.REPORT_ENGINE == 'sql':
+            processreports(subdir)
+        else:
+            processnotebooks(subdir)
 
     end_time = datetime.utcnow()
     logging.info('job - jupyter notebook report completed in: %s', end_time - start_time)
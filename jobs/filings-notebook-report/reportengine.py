@@ -0,0 +1,262 @@
+"""The Report Engine - runs the filings reports as SQL aggregates, streaming each one to a CSV file.
+
+The statistics over the filings are read from daily rollup tables. Each run refreshes the rollups
+incrementally: only the days since the last refresh, and a trailing window of ROLLUP_REFRESH_DAYS to catch
+filings that changed after they were rolled up, are aggregated again. The history is only scanned the first time,
+or when the rollups are rebuilt.
+"""
+import csv
+import logging
+import os
+from datetime import date, timedelta
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import psycopg2
+from dateutil.relativedelta import relativedelta
+
+from config import Config
+
+
+# the report dates are days in pacific standard time
+LOCAL_DATE = "date({column} at time zone 'pst')"
+
+
+def local_start(parameter: str) -> str:
+    """Return the start of the local date parameter, as a timestamp the indexed columns can be range scanned with."""
+    return f"(CAST(%({parameter})s AS timestamp) at time zone 'pst')"
+
+
+# the rollups are created by the legal-api migrations, in a schema the job writes to
+ROLLUP_SCHEMA = 'reporting'
+
+# each rollup is aggregated from the filings on or after the since date
+ROLLUPS = {
+    'report_filing_daily': f"""
+        INSERT INTO {ROLLUP_SCHEMA}.report_filing_daily (day, filing_type, legal_type, status, filing_count)
+        SELECT {LOCAL_DATE.format(column='f.filing_date')}, f.filing_type, COALESCE(b.legal_type, ''),
+               COALESCE(f.status, ''), count(*)
+        FROM filings f LEFT JOIN businesses b ON b.id = f.business_id
+        WHERE f.filing_date >= {local_start('since')} AND f.filing_type IS NOT NULL
+        GROUP BY 1, 2, 3, 4
+    """,
+    'report_completed_filing_daily': f"""
+        INSERT INTO {ROLLUP_SCHEMA}.report_completed_filing_daily (day, business_id, filing_type, filing_count)
+        SELECT {LOCAL_DATE.format(column='f.completion_date')}, f.business_id, f.filing_type, count(*)
+        FROM filings f
+        WHERE f.completion_date >= {local_start('since')} AND f.status = 'COMPLETED' AND f.business_id IS NOT NULL
+        AND f.filing_type IS NOT NULL
+        GROUP BY 1, 2, 3
+    """
+}
+
+
+def get_last_month(report_date: date) -> date:
+    """Return the date a month before the day the report is run, which the monthly reports are named for."""
+    return report_date + timedelta(days=1) - relativedelta(months=1)
+
+
+class Section(NamedTuple):
+    """A query whose rows are written to the report under the heading, or the empty text if it has no rows."""
+
+    heading: str
+    sql: str
+    empty_text: Optional[str] = None
+
+
+class Report(NamedTuple):
+    """A report, the schedule it is run on, and the sections written to its CSV file."""
+
+    schedule: str
+    get_filename: Callable[[date], str]
+    sections: List[Section]
+
+
+REPORTS: Dict[str, Report] = {
+    'incorpfilings': Report(
+        schedule='daily',
+        get_filename=lambda report_date: f'incorporation_filings_daily_stats_{report_date:%Y-%m-%d}.csv',
+        sections=[
+            Section(
+                heading='Incorporattion Application(s) on {report_date:%Y-%m-%d}:\n',
+                empty_text='No Data Retrieved on {report_date:%Y-%m-%d}',
+                sql=f"""
+                    SELECT b.identifier AS INCORPORATION_NUMBER
+                           , b.legal_name AS INCORPORATION_NAME
+                           , u.username AS FILING_USER
+                           , f.status
+                           , f.filing_date at time zone 'utc' at time zone 'pst' AS FILING_TIMESTAMP_PST
+                           , f.effective_date at time zone 'utc' at time zone 'pst' AS EFFECTIVE_TIMESTAMP_PST
+                    FROM businesses b, filings f, users u
+                    WHERE b.id = f.business_id
+                    AND f.filing_type = 'incorporationApplication'
+                    AND f.submitter_id = u.id
+                    AND f.filing_date >= {local_start('report_date')}
+                    AND f.filing_date < {local_start('next_date')}
+                    ORDER BY FILING_TIMESTAMP_PST
+                """),
+            Section(
+                heading='\n\n\n The Total Number of Incorporattion Applications to Date:\n',
+                sql=f"""
+                    SELECT COALESCE(sum(filing_count), 0) AS count
+                    FROM {ROLLUP_SCHEMA}.report_filing_daily
+                    WHERE filing_type = 'incorporationApplication' AND day <= %(report_date)s
+                """),
+            Section(
+                heading='\n\n\n The Total Number of Benefit Corporations to Date:\n',
+                sql="SELECT count(*) FROM businesses b WHERE b.legal_type = 'BEN'"),
+        ]),
+    'coopfilings': Report(
+        schedule='monthly',
+        get_filename=lambda report_date: f'coop_filings_monthly_stats_for_{get_last_month(report_date):%B_%Y}.csv',
+        sections=[
+            Section(
+                heading='',
+                sql=f"""
+                    WITH Detail AS (
+                        SELECT b.identifier AS COOPERATIVE_NUMBER
+                               , b.legal_name AS COOPERATIVE_NAME
+                               , sum(r.filing_count) AS FILINGS_TOTAL_COMPLETED
+                               , (SELECT STRING_AGG(t.filing_type, ', ')
+                                  FROM {ROLLUP_SCHEMA}.report_completed_filing_daily t
+                                       , generate_series(1, t.filing_count)
+                                  WHERE t.business_id = b.id AND t.day > %(month_start)s
+                                  AND t.day <= %(report_date)s) AS FILING_TYPES_COMPLETED
+                        FROM {ROLLUP_SCHEMA}.report_completed_filing_daily r, businesses b
+                        WHERE b.id = r.business_id
+                        AND b.legal_type = 'CP'
+                        AND r.day > %(month_start)s
+                        AND r.day <= %(report_date)s
+                        GROUP BY b.id, b.identifier, b.legal_name
+                    )
+                    SELECT * FROM Detail
+                    UNION ALL
+                    SELECT 'SUM' identifier, null, sum(FILINGS_TOTAL_COMPLETED) AS count, null
+                    FROM Detail
+                """),
+        ]),
+    'cooperative': Report(
+        schedule='monthly',
+        get_filename=lambda report_date: f'cooperative_monthly_stats_for_{get_last_month(report_date):%B_%Y}.csv',
+        sections=[
+            Section(
+                heading='Number of Cooperatives Created in Last 10 Years:\n',
+                sql=f"""
+                    SELECT date_part('year', founding_date) AS year, COUNT(*)
+                    FROM businesses
+                    WHERE founding_date >= {local_start('years_start')}
+                    GROUP BY date_part('year', founding_date)
+                    ORDER BY date_part('year', founding_date) DESC
+                """),
+            Section(
+                heading='\n\n\n Number of Cooperatives Dissoluted in Last 10 Years:\n',
+                empty_text='\n\n\n Number of Cooperatives Dissoluted in Last 10 Years:\n count\n 0\n',
+                sql=f"""
+                    SELECT date_part('year', dissolution_date) AS year
+                          , COUNT(*) companies_dissoluted
+                    FROM businesses
+                    WHERE dissolution_date >= {local_start('years_start')}
+                    GROUP BY date_part('year', dissolution_date)
+                    ORDER BY date_part('year', dissolution_date) DESC
+                """),
+            Section(
+                heading='\n\n\n Number of Cooperatives with Directors:\n',
+                sql="""
+                    WITH directors AS (
+                        SELECT count(*) AS cnt
+                        FROM parties pt, party_roles pr
+                        WHERE pt.id = pr.party_id AND pr.cessation_date is null AND pr.role = 'director'
+                        GROUP BY pr.business_id
+                    )
+                    SELECT concat('Having One Director:', ' ', count(*) FILTER (WHERE cnt = 1)) AS count
+                    FROM directors
+                    UNION ALL
+                    SELECT concat('Having Two or Three Directors:', ' ', count(*) FILTER (WHERE cnt IN (2, 3)))
+                    FROM directors
+                    UNION ALL
+                    SELECT concat('Having Four or More Directors:', ' ', count(*) FILTER (WHERE cnt > 3))
+                    FROM directors
+                """),
+            Section(
+                heading='\n\n\n Number of None BC Businesses:\n',
+                empty_text='\n\n\n Number of None BC Businesses:\n count\n 0\n',
+                sql="""
+                    SELECT count(*) FROM businesses b, parties pt, party_roles pr, addresses a
+                    WHERE b.id = pr.business_id AND pt.id = pr.party_id AND pr.role = 'director'
+                    AND (pt.delivery_address_id = a.id OR pt.mailing_address_id = a.id)
+                    AND lower(a.region) not like 'bc'
+                """),
+        ]),
+}
+
+
+def connect(config=Config):
+    """Return a connection to the database the reports are run against."""
+    return psycopg2.connect(user=config.PG_USER,
+                            password=config.PG_PASSWORD,
+                            host=config.PG_HOST,
+                            port=config.PG_PORT,
+                            database=config.PG_NAME)
+
+
+def refresh_rollups(conn, report_date: date, rebuild: bool = False):
+    """Aggregate the filings since each rollup was last refreshed, through the report date, into the rollups."""
+    with conn, conn.cursor() as cursor:
+        for rollup, sql in ROLLUPS.items():
+            cursor.execute(f'SELECT refreshed_through FROM {ROLLUP_SCHEMA}.report_rollup_state '
+                           'WHERE rollup = %s FOR UPDATE', (rollup,))
+            row = cursor.fetchone()
+            if rebuild or not row:
+                since = date(1970, 1, 1)
+            else:
+                since = min(row[0] + timedelta(days=1), report_date) - timedelta(days=Config.ROLLUP_REFRESH_DAYS)
+
+            cursor.execute(f'DELETE FROM {ROLLUP_SCHEMA}.{rollup} WHERE day >= %(since)s', {'since': since})
+            cursor.execute(sql, {'since': since})
+            cursor.execute(f'DELETE FROM {ROLLUP_SCHEMA}.{rollup} WHERE day > %(report_date)s',
+                           {'report_date': report_date})
+            cursor.execute(f"""
+                INSERT INTO {ROLLUP_SCHEMA}.report_rollup_state (rollup, refreshed_through)
+                VALUES (%(rollup)s, %(report_date)s)
+                ON CONFLICT (rollup) DO UPDATE SET refreshed_through = EXCLUDED.refreshed_through
+            """, {'rollup': rollup, 'report_date': report_date})
+            logging.info('Refreshed %s from %s through %s.', rollup, since, report_date)
+
+
+def get_parameters(report_date: date) -> dict:
+    """Return the query parameters for the report date."""
+    return {
+        'report_date': report_date,
+        'next_date': report_date + timedelta(days=1),
+        'month_start': report_date - relativedelta(months=1),
+        'years_start': report_date + timedelta(days=2) - relativedelta(years=9)
+    }
+
+
+def write_section(conn, file, section: Section, parameters: dict):
+    """Stream the rows of the section's query to the file as CSV, with the column names as the header."""
+    with conn.cursor(name='report_section') as cursor:
+        cursor.itersize = 1000
+        cursor.execute(section.sql, parameters)
+        rows = iter(cursor)
+        first_row = next(rows, None)
+        if first_row is None and section.empty_text is not None:
+            file.write(section.empty_text.format(**parameters))
+            return
+
+        file.write(section.heading.format(**parameters))
+        writer = csv.writer(file, lineterminator='\n')
+        writer.writerow([column.name for column in cursor.description])
+        if first_row is not None:
+            writer.writerow(first_row)
+            writer.writerows(rows)
+
+
+def write_report(conn, report_name: str, report_date: date, data_dir: str = None) -> str:
+    """Write the report for the report date to its CSV file in the data dir, returning the file name."""
+    report = REPORTS[report_name]
+    filename = (data_dir if data_dir is not None else os.getenv('DATA_DIR', '')) + report.get_filename(report_date)
+    parameters = get_parameters(report_date)
+    with conn, open(filename, 'w', encoding='utf-8') as file:
+        for section in report.sections:
+            write_section(conn, file, section, parameters)
+    return filename
@@ -1,8 +1,9 @@
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 import psycopg2
 import pytest
 import ast
+import reportengine
 from notebookreport import processnotebooks
 
 def test_connection_failed():
@@ -50,3 +51,23 @@ def test_filings_monthly_notebook_report(report_type):
     assert status == True
 
 
+test_reports_data = [
+    ('incorpfilings'),
+    ('coopfilings'),
+    ('cooperative'),
+]
+
+
+@pytest.mark.parametrize("report_name", test_reports_data)
+def test_write_report(report_name, tmp_path):
+    report_date = (datetime.now() - timedelta(1)).date()
+    conn = reportengine.connect()
+    try:
+        reportengine.refresh_rollups(conn, report_date)
+        filename = reportengine.write_report(conn, report_name, report_date, str(tmp_path) + '/')
+    finally:
+        conn.close()
+
+    assert os.path.basename(filename) == reportengine.REPORTS[report_name].get_filename(report_date)
+    with open(filename) as f:
+        assert f.read()
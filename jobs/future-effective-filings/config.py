@@ -76,6 +76,16 @@ class _Config(object):  # pylint: disable=too-few-public-methods
         'subject': os.getenv('NATS_FILER_SUBJECT', 'entity.filing.filer')
     }
 
+    # the scheduler listens for the future effective filings entity-pay publishes when they are paid
+    FUTURE_EFFECTIVE_SUBSCRIPTION_OPTIONS = {
+        'subject': os.getenv('NATS_FUTURE_EFFECTIVE_SUBJECT', 'entity.filing.future_effective'),
+        'queue': os.getenv('NATS_FUTURE_EFFECTIVE_QUEUE', 'future-effective-scheduler'),
+        'durable_name': os.getenv('NATS_FUTURE_EFFECTIVE_QUEUE', 'future-effective-scheduler') + '_durable'
+    }
+    # seconds between the scheduler's checks against legal-api, and how far ahead it loads filings
+    SCHEDULER_RECONCILE_INTERVAL = float(os.getenv('SCHEDULER_RECONCILE_INTERVAL', '300'))
+    SCHEDULER_LOAD_AHEAD = float(os.getenv('SCHEDULER_LOAD_AHEAD', '86400'))
+
     PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
 
     COLIN_URL = os.getenv('COLIN_URL', '')
@@ -85,6 +95,13 @@ class _Config(object):  # pylint: disable=too-few-public-methods
     PASSWORD = os.getenv('AUTH_PASSWORD', '')
     SENTRY_DSN = os.getenv('SENTRY_DSN', '')
 
+    # the timeouts in seconds, and the retries of idempotent requests, used by utils.http_client
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5'))
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+
     SECRET_KEY = 'a secret'
 
     TESTING = False
@@ -14,16 +14,22 @@
 """The Future Effective Date service.
 
 This module script is for putting filings with future effective dates on the entity filer queue.
+
+Run as a job, it puts the filings that are due on the queue and exits.
+Run with --scheduler, it keeps running and puts each filing on the queue at its effective date.
 """
+import argparse
 import asyncio
+import heapq
+import json
 import logging
 import os
 import random
-from datetime import datetime, timezone
+import signal
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
 
-import requests
 import sentry_sdk  # noqa: I001; pylint: disable=ungrouped-imports; conflicts with Flake8
-from dateutil.parser import parse
 from dotenv import find_dotenv, load_dotenv
 from entity_queue_common.service import ServiceWorker
 from flask import Flask
@@ -33,6 +39,7 @@ from sentry_sdk.integrations.logging import LoggingIntegration  # noqa: I001
 from stan.aio.client import Client as STAN  # noqa N814; by convention the name is STAN
 
 import config  # pylint: disable=import-error
+from utils import http_client  # pylint: disable=import-error
 from utils.logging import setup_logging  # pylint: disable=import-error
 
 
@@ -70,18 +77,125 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
             dsn=app.config.get('SENTRY_DSN'),
             integrations=[SENTRY_LOGGING]
         )
+    http_client.init_app(app)
 
     return app
 
 
-def get_filings(app: Flask = None):
-    """Get a filing with filing_id."""
-    response = requests.get(f'{app.config["LEGAL_URL"]}/internal/filings/PAID')
+def get_filings(app: Flask = None, until: datetime = None) -> List[Dict]:
+    """Return the paid filings whose effective date has been reached, or is before until if given."""
+    params = {'until': until.isoformat()} if until else None
+    response = http_client.get(f'{app.config["LEGAL_URL"]}/internal/filings/future_effective', params=params)
     if not response or response.status_code != 200:
         app.logger.error(f'Failed to collect filings from legal-api. \
             {response} {response.json()} {response.status_code}')
         raise Exception
-    return response.json()
+    return response.json()['filings']
+
+
+class FutureEffectiveScheduler:
+    """Puts each future effective filing on the filer queue at its effective date.
+
+    The filings are held in a heap ordered by effective date. The heap is loaded from legal-api at startup,
+    kept current from the events entity-pay publishes when a future effective filing is paid, and reconciled
+    with legal-api every reconcile_interval seconds to pick up any events that were missed.
+    Only one scheduler should be run at a time.
+    """
+
+    def __init__(self, app: Flask, queue_service: ServiceWorker, reconcile_interval: float, load_ahead: float):
+        """Initialize the scheduler with an empty heap."""
+        self.app = app
+        self.queue_service = queue_service
+        self.reconcile_interval = reconcile_interval
+        self.load_ahead = load_ahead
+        self._heap = []
+        # the effective date each filing is scheduled for, so a rescheduled filing's old heap entry is skipped
+        self._scheduled: Dict[int, datetime] = {}
+        # when each filing was put on the queue, so it isn't put on again until the filer has had a chance at it
+        self._published: Dict[int, datetime] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+
+    def schedule(self, filing_id: int, effective_date: datetime):
+        """Schedule the filing to be put on the queue at its effective date."""
+        published = self._published.get(filing_id)
+        if self._scheduled.get(filing_id) == effective_date or \
+                (published and datetime.now(timezone.utc) - published < timedelta(seconds=self.reconcile_interval)):
+            return
+        self._scheduled[filing_id] = effective_date
+        heapq.heappush(self._heap, (effective_date, filing_id))
+        self._wakeup.set()
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """Remove and return the ids of the filings whose effective date has been reached."""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            effective_date, filing_id = heapq.heappop(self._heap)
+            if self._scheduled.get(filing_id) == effective_date:
+                del self._scheduled[filing_id]
+                due.append(filing_id)
+        return due
+
+    def seconds_until_next(self, now: datetime) -> float:
+        """Return the seconds until the next filing is due, or the reconcile interval if none are scheduled."""
+        if not self._heap:
+            return self.reconcile_interval
+        return max((self._heap[0][0] - now).total_seconds(), 0)
+
+    async def publish_due(self):
+        """Put the filings that are due on the filer queue."""
+        now = datetime.now(timezone.utc)
+        if not (filing_ids := self.pop_due(now)):
+            return
+        msgs = [{'filing': {'id': filing_id}} for filing_id in filing_ids]
+        failed = {msg['filing']['id'] for msg in await self.queue_service.publish_batch(subject, msgs)}
+        for filing_id in filing_ids:
+            if filing_id not in failed:
+                self._published[filing_id] = now
+        # the failed filings are scheduled again when the scheduler next reconciles
+        self.app.logger.debug(f'Put {len(filing_ids) - len(failed)} of {len(filing_ids)} filings on the queue.')
+
+    async def reconcile(self):
+        """Schedule the paid filings in legal-api that are effective before the load ahead period ends."""
+        until = datetime.now(timezone.utc) + timedelta(seconds=self.load_ahead)
+        filings = await asyncio.get_running_loop().run_in_executor(None, get_filings, self.app, until)
+        paid_ids = {filing['filingId'] for filing in filings}
+        # the filings published since the last reconcile and no longer paid have been applied
+        self._published = {filing_id: published for filing_id, published in self._published.items()
+                           if filing_id in paid_ids}
+        for filing in filings:
+            self.schedule(filing['filingId'], datetime.fromisoformat(filing['effectiveDate']))
+        self.app.logger.debug(f'Reconciled {len(filings)} filings, {len(self._scheduled)} scheduled.')
+
+    async def cb_future_effective(self, msg):
+        """Schedule the filing in the future effective event published by entity-pay."""
+        filing = json.loads(msg.data.decode('utf-8'))['filing']
+        self.schedule(filing['id'], datetime.fromisoformat(filing['effectiveDate']))
+
+    def stop(self):
+        """Stop the scheduler after the current step."""
+        self._stopping.set()
+        self._wakeup.set()
+
+    async def run(self):
+        """Put the filings on the queue as they become due, reconciling with legal-api periodically."""
+        loop = asyncio.get_running_loop()
+        next_reconcile = loop.time()
+        while not self._stopping.is_set():
+            if loop.time() >= next_reconcile:
+                try:
+                    await self.reconcile()
+                except Exception as err:  # pylint: disable=broad-except; keep scheduling, and retry next interval
+                    self.app.logger.error(f'Failed to reconcile the future effective filings: {err}')
+                next_reconcile = loop.time() + self.reconcile_interval
+
+            self._wakeup.clear()
+            await self.publish_due()
+            timeout = min(next_reconcile - loop.time(), self.seconds_until_next(datetime.now(timezone.utc)))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                pass
 
 
 async def run(loop, application: Flask = None):  # pylint: disable=redefined-outer-name
@@ -100,27 +214,64 @@ async def run(loop, application: Flask = None):  # pylint: disable=redefined-out
 
     with application.app_context():
         try:
-            filings = get_filings(app=application)
-            if not filings:
+            filing_ids = [filing['filingId'] for filing in get_filings(app=application)]
+            if not filing_ids:
                 application.logger.debug('No PAID filings found to apply.')
-            for filing in filings:
-                filing_id = filing['filing']['header']['filingId']
-                effective_date = filing['filing']['header']['effectiveDate']
-                # NB: effective_date and now are both UTC
-                now = datetime.utcnow().replace(tzinfo=timezone.utc)
-                valid = effective_date and parse(effective_date) <= now
-                if valid:
-                    msg = {'filing': {'id': filing_id}}
-                    await queue_service.publish(subject, msg)
-                    application.logger.debug(f'Successfully put filing {filing_id} on the queue.')
+            msgs = [{'filing': {'id': filing_id}} for filing_id in filing_ids]
+            failed = await queue_service.publish_batch(subject, msgs)
+            application.logger.debug(f'Successfully put {len(filing_ids) - len(failed)} of {len(filing_ids)} '
+                                     'filings on the queue.')
         except Exception as err:  # pylint: disable=broad-except
             application.logger.error(err)
+        finally:
+            await queue_service.close()
+            http_client.log_latency(application.logger)
+
+
+async def run_scheduler(loop, application: Flask = None):  # pylint: disable=redefined-outer-name
+    """Run the scheduler until the process is stopped."""
+    if application is None:
+        application = create_app()
+
+    queue_config = config.get_named_config('production')
+    queue_service = ServiceWorker(
+        loop=loop,
+        nats_connection_options=default_nats_options,
+        stan_connection_options=default_stan_options,
+        subscription_options=application.config['FUTURE_EFFECTIVE_SUBSCRIPTION_OPTIONS'],
+        config=queue_config
+    )
+    scheduler = FutureEffectiveScheduler(app=application,
+                                         queue_service=queue_service,
+                                         reconcile_interval=application.config['SCHEDULER_RECONCILE_INTERVAL'],
+                                         load_ahead=application.config['SCHEDULER_LOAD_AHEAD'])
+    queue_service.cb_handler = scheduler.cb_future_effective
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, scheduler.stop)
+
+    await queue_service.connect()
+
+    with application.app_context():
+        try:
+            await scheduler.run()
+        finally:
+            await queue_service.close()
+            http_client.log_latency(application.logger)
+
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Put the future effective filings on the entity filer queue.')
+    parser.add_argument('--scheduler', action='store_true',
+                        help='keep running, putting each filing on the queue at its effective date')
+    args = parser.parse_args()
+
     application = create_app()
     try:
         event_loop = asyncio.get_event_loop()
-        event_loop.run_until_complete(run(event_loop, application))
+        if args.scheduler:
+            event_loop.run_until_complete(run_scheduler(event_loop, application))
+        else:
+            event_loop.run_until_complete(run(event_loop, application))
     except Exception as err:  # pylint: disable=broad-except; Catching all errors from the frameworks
         application.logger.error(err)  # pylint: disable=no-member
         raise err
@@ -48,8 +48,22 @@ class _Config(object):  # pylint: disable=too-few-public-methods
 
     COLIN_URL = os.getenv('COLIN_URL', '')
     LEGAL_URL = os.getenv('LEGAL_URL', '')
+    # corps whose filings are sent to colin at the same time
+    UPDATE_COLIN_WORKERS = int(os.getenv('UPDATE_COLIN_WORKERS', '4'))
+    # filings fetched from legal-api per request
+    COLIN_SYNC_PAGE_SIZE = int(os.getenv('COLIN_SYNC_PAGE_SIZE', '500'))
+    # filings of a corp sent to colin per request, and the seconds to wait for colin to create them
+    COLIN_BATCH_SIZE = int(os.getenv('COLIN_BATCH_SIZE', '20'))
+    COLIN_BATCH_READ_TIMEOUT = float(os.getenv('COLIN_BATCH_READ_TIMEOUT', '600'))
     SENTRY_DSN = os.getenv('SENTRY_DSN', '')
 
+    # the timeouts in seconds, and the retries of idempotent requests, used by utils.http_client
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5'))
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+
     ACCOUNT_SVC_AUTH_URL = os.getenv('ACCOUNT_SVC_AUTH_URL', None)
     ACCOUNT_SVC_CLIENT_ID = os.getenv('ACCOUNT_SVC_CLIENT_ID', None)
     ACCOUNT_SVC_CLIENT_SECRET = os.getenv('ACCOUNT_SVC_CLIENT_SECRET', None)
@@ -17,15 +17,17 @@ This module is the API for the Legal Entity system.
 """
 import logging
 import os
+from itertools import groupby
 
-import requests
 import sentry_sdk  # noqa: I001; pylint: disable=ungrouped-imports; conflicts with Flake8
 from flask import Flask
 from legal_api.models import Business
 from legal_api.services.bootstrap import AccountService
+from requests.exceptions import RequestException
 from sentry_sdk.integrations.logging import LoggingIntegration  # noqa: I001
 
 import config  # pylint: disable=import-error; false positive in gha only
+from utils import http_client  # noqa: I001; pylint: disable=import-error; false positive in gha only
 from utils.logging import setup_logging  # noqa: I001; pylint: disable=import-error; false positive in gha only
 # noqa: 1005
 setup_logging(os.path.join(
@@ -48,6 +50,7 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
         )
 
     register_shellcontext(app)
+    http_client.init_app(app)
 
     return app
 
@@ -61,51 +64,94 @@ def register_shellcontext(app):
     app.shell_context_processor(shell_context)
 
 
-def get_filings(app: Flask = None):
-    """Get a filing with filing_id."""
-    req = requests.get(f'{app.config["LEGAL_URL"]}/internal/filings')
+def get_filings(app: Flask = None, cursor: int = None):
+    """Return a page of the filings to send to colin, and the cursor for the next page (None after the last)."""
+    params = {'limit': app.config['COLIN_SYNC_PAGE_SIZE']}
+    if cursor:
+        params['cursor'] = cursor
+    req = http_client.get(f'{app.config["LEGAL_URL"]}/internal/filings', params=params)
     if not req or req.status_code != 200:
         app.logger.error(f'Failed to collect filings from legal-api. {req} {req.json()} {req.status_code}')
         raise Exception
-    return req.json()
+    return req.json()['filings'], req.json()['cursor']
 
 
-def send_filing(app: Flask = None, filing: dict = None, filing_id: str = None):
-    """Post to colin-api with filing."""
-    clean_none(filing)
-
-    filing_type = filing['filing']['header'].get('name', None)
+def get_legal_type(filing: dict) -> str:
+    """Return the legal type the filing is sent to colin under."""
     identifier = filing['filing']['business'].get('identifier', None)
     if identifier[:2] == Business.LegalTypes.COOP.value:
-        legal_type = Business.LegalTypes.COOP.value
-    else:
-        legal_type = filing['filing']['business'].get('legalType', Business.LegalTypes.BCOMP.value)
-
-    req = None
-    if legal_type and identifier and filing_type:
-        req = requests.post(f'{app.config["COLIN_URL"]}/{legal_type}/{identifier}/filings/{filing_type}', json=filing)
-
-    if not req or req.status_code != 201:
-        app.logger.error(f'Filing {filing_id} not created in colin {identifier}.')
-        # raise Exception
-        return None
-    # if it's an AR containing multiple filings it will have multiple colinIds
-    return req.json()['filing']['header']['colinIds']
-
-
-def update_colin_id(app: Flask = None, filing_id: str = None, colin_ids: list = None, token: dict = None):
-    """Update the colin_id in the filings table."""
-    req = requests.patch(
-        f'{app.config["LEGAL_URL"]}/internal/filings/{filing_id}',
+        return Business.LegalTypes.COOP.value
+    return filing['filing']['business'].get('legalType', Business.LegalTypes.BCOMP.value)
+
+
+def send_filings(app: Flask = None, identifier: str = None, legal_type: str = None, filings: list = None) -> dict:
+    """Post the business's filings to colin-api in one request, returning the colin ids of each filing created.
+
+    Colin stops at the first filing that fails, so the filings after it are not created. The request is not
+    retried, and is given a longer read timeout than the others, since colin commits each filing as it creates it.
+    """
+    for filing in filings:
+        clean_none(filing)
+
+    req = http_client.post(f'{app.config["COLIN_URL"]}/{legal_type}/{identifier}/filings',
+                           json={'filings': filings},
+                           timeout=(app.config['HTTP_CONNECT_TIMEOUT'], app.config['COLIN_BATCH_READ_TIMEOUT']))
+    if not req or req.status_code != 200:
+        app.logger.error(f'Filings {[filing["filingId"] for filing in filings]} not created in colin {identifier}.')
+        return {}
+
+    colin_ids = {}
+    for result in req.json()['filings']:
+        if result.get('colinIds'):
+            # if it's an AR containing multiple filings it will have multiple colinIds
+            colin_ids[str(result['filingId'])] = result['colinIds']
+        else:
+            app.logger.error(f'Filing {result["filingId"]} not created in colin {identifier}: {result.get("error")}')
+    return colin_ids
+
+
+def update_colin_ids(app: Flask = None, colin_ids: dict = None, token: dict = None):
+    """Update the colin_ids of the filings in the filings table."""
+    req = http_client.patch(
+        f'{app.config["LEGAL_URL"]}/internal/filings/colin_ids',
         json={'colinIds': colin_ids},
         headers={'Authorization': f'Bearer {token}'}
     )
     if not req or req.status_code != 202:
-        app.logger.error(f'Failed to update colin id in legal db for filing {filing_id} {req.status_code}')
+        app.logger.error(f'Failed to update colin ids in legal db for filings {list(colin_ids)} {req.status_code}')
         return False
     return True
 
 
+def sync_business_filings(app: Flask = None, identifier: str = None, filings: list = None, token: dict = None):
+    """Send the business's filings to colin in order, stopping at the first that fails.
+
+    The filings are sent in batches of at most COLIN_BATCH_SIZE, so a batch that times out leaves few filings
+    created in colin but not recorded in legal.
+    """
+    batch_size = app.config['COLIN_BATCH_SIZE']
+    # the legal type can change with an alteration, so each run of filings under one legal type is sent separately
+    for legal_type, run_filings in groupby(filings, key=get_legal_type):
+        run_filings = list(run_filings)
+        for start in range(0, len(run_filings), batch_size):
+            batch = run_filings[start:start + batch_size]
+            try:
+                colin_ids = send_filings(app=app, identifier=identifier, legal_type=legal_type, filings=batch)
+                update = update_colin_ids(app=app, colin_ids=colin_ids, token=token) if colin_ids else None
+            except RequestException as err:
+                app.logger.error(f'Failed to sync filings {[filing["filingId"] for filing in batch]} '
+                                 f'for {identifier}: {err}')
+                return False
+            if update:
+                app.logger.debug(f'Successfully updated filings {list(colin_ids)}')
+            if not update or len(colin_ids) < len(batch):
+                failed = [filing['filingId'] for filing in batch
+                          if not update or str(filing['filingId']) not in colin_ids]
+                app.logger.error(f'Failed to update filings {failed} with colin event id.')
+                return False
+    return True
+
+
 def clean_none(dictionary: dict = None):
     """Replace all none values with empty string."""
     for key in dictionary.keys():
@@ -122,41 +168,55 @@ def is_test_coop(identifier: str):
 
 
 def run():
-    """Get filings that haven't been synced with colin and send them to the colin-api."""
+    """Get filings that haven't been synced with colin and send them to the colin-api.
+
+    The filings are fetched a page at a time. Businesses are synced at the same time, each with its filings
+    sent in order, and a business is skipped for the rest of the run once one of its filings fails.
+    """
     application = create_app()
-    corps_with_failed_filing = []
     with application.app_context():
         try:
             # get updater-job token
             token = AccountService.get_bearer_token()
 
-            filings = get_filings(app=application)
-            if not filings:
-                # pylint: disable=no-member; false positive
-                application.logger.debug('No completed filings to send to colin.')
-            for filing in filings:
-                filing_id = filing['filingId']
-                identifier = filing['filing']['business']['identifier']
-                if identifier in corps_with_failed_filing or is_test_coop(identifier):
-                    # pylint: disable=no-member; false positive
-                    application.logger.debug(f'Skipping filing {filing_id} for'
-                                             f' {filing["filing"]["business"]["identifier"]}.')
-                else:
-                    colin_ids = send_filing(app=application, filing=filing, filing_id=filing_id)
-                    update = None
-                    if colin_ids:
-                        update = update_colin_id(app=application, filing_id=filing_id, colin_ids=colin_ids, token=token)
-                    if update:
+            failed_identifiers = set()
+            synced = []
+            cursor = None
+            while True:
+                filings, cursor = get_filings(app=application, cursor=cursor)
+                filings_by_business = {}
+                for filing in filings:
+                    identifier = filing['filing']['business']['identifier']
+                    if is_test_coop(identifier) or identifier in failed_identifiers:
                         # pylint: disable=no-member; false positive
-                        application.logger.debug(f'Successfully updated filing {filing_id}')
+                        application.logger.debug(f'Skipping filing {filing["filingId"]} for {identifier}.')
                     else:
-                        corps_with_failed_filing.append(filing['filing']['business']['identifier'])
-                        # pylint: disable=no-member; false positive
-                        application.logger.error(f'Failed to update filing {filing_id} with colin event id.')
+                        filings_by_business.setdefault(identifier, []).append(filing)
+
+                page_synced = http_client.map_concurrently(
+                    lambda item: sync_business_filings(app=application, identifier=item[0], filings=item[1],
+                                                       token=token),
+                    filings_by_business.items(),
+                    max_workers=application.config['UPDATE_COLIN_WORKERS']
+                )
+                failed_identifiers.update(identifier for identifier, business_synced
+                                          in zip(filings_by_business, page_synced) if not business_synced)
+                synced.extend(page_synced)
+                if not cursor:
+                    break
+
+            if not synced:
+                # pylint: disable=no-member; false positive
+                application.logger.debug('No completed filings to send to colin.')
+            # pylint: disable=no-member; false positive
+            application.logger.debug(f'Synced {synced.count(True)} of {len(synced)} business batches with colin, '
+                                     f'{len(failed_identifiers)} businesses failed.')
 
         except Exception as err:  # noqa: B902
             # pylint: disable=no-member; false positive
             application.logger.error(err)
+        finally:
+            http_client.log_latency(application.logger)  # pylint: disable=no-member; false positive
 
 
 if __name__ == '__main__':
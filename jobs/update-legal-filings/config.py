@@ -48,8 +48,22 @@ class _Config(object):  # pylint: disable=too-few-public-methods
 
     COLIN_URL = os.getenv('COLIN_URL', '')
     LEGAL_URL = os.getenv('LEGAL_URL', '')
+    # the number of colin events checked against legal in each request
+    COLIN_EVENT_CHECK_BATCH_SIZE = int(os.getenv('COLIN_EVENT_CHECK_BATCH_SIZE', '1000'))
+    # events fetched from colin per request
+    COLIN_EVENT_PAGE_SIZE = int(os.getenv('COLIN_EVENT_PAGE_SIZE', '5000'))
+    # corps whose filings are applied at the same time, and how many applied events between checkpoints
+    UPDATE_FILINGS_WORKERS = int(os.getenv('UPDATE_FILINGS_WORKERS', '4'))
+    CHECKPOINT_INTERVAL = int(os.getenv('CHECKPOINT_INTERVAL', '50'))
     SENTRY_DSN = os.getenv('SENTRY_DSN', '')
 
+    # the timeouts in seconds, and the retries of idempotent requests, used by utils.http_client
+    HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', '5'))
+    HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', '60'))
+    HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', '3'))
+    HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '0.5'))
+    HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+
     ACCOUNT_SVC_AUTH_URL = os.getenv('ACCOUNT_SVC_AUTH_URL', None)
     ACCOUNT_SVC_CLIENT_ID = os.getenv('ACCOUNT_SVC_CLIENT_ID', None)
     ACCOUNT_SVC_CLIENT_SECRET = os.getenv('ACCOUNT_SVC_CLIENT_SECRET', None)
@@ -18,8 +18,9 @@ This module is the API for the Legal Entity system.
 import asyncio
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
 import sentry_sdk  # noqa: I001, E501; pylint: disable=ungrouped-imports; conflicts with Flake8
 from colin_api.models.business import Business
 from colin_api.models.filing import Filing
@@ -30,6 +31,7 @@ from sentry_sdk import capture_message
 from sentry_sdk.integrations.logging import LoggingIntegration  # noqa: I001
 
 import config  # pylint: disable=import-error
+from utils import http_client  # pylint: disable=import-error
 from utils.logging import setup_logging  # pylint: disable=import-error
 
 # noqa: I003
@@ -55,6 +57,7 @@ def create_app(run_mode=os.getenv('FLASK_ENV', 'production')):
         )
 
     register_shellcontext(app)
+    http_client.init_app(app)
 
     return app
 
@@ -81,7 +84,7 @@ def check_for_manual_filings(application: Flask = None, token: dict = None):
                                    Business.TypeCodes.CCC_COMP.value]
 
     # get max colin event_id from legal
-    response = requests.get(f'{legal_url}/internal/filings/colin_id')
+    response = http_client.get(f'{legal_url}/internal/filings/colin_id')
     if response.status_code not in [200, 404]:
         application.logger.error(f'Error getting last updated colin id from \
             legal: {response.status_code} {response.json()}')
@@ -92,19 +95,20 @@ def check_for_manual_filings(application: Flask = None, token: dict = None):
             last_event_id = dict(response.json())['maxId']
         if last_event_id:
             last_event_id = str(last_event_id)
-            # get all event_ids greater than above
+            # get all event_ids greater than above, for all of the corp types, a page at a time
+            colin_events = {'events': []}
+            page_size = application.config.get('COLIN_EVENT_PAGE_SIZE', 5000)
             try:
-                for corp_type in corp_types:
+                while last_event_id:
                     # call colin api for ids + filing types list
-                    response = requests.get(f'{colin_url}/event/{corp_type}/{last_event_id}')
+                    response = http_client.get(f'{colin_url}/event/{",".join(corp_types)}/{last_event_id}',
+                                               params={'limit': page_size})
                     event_info = dict(response.json())
                     events = event_info.get('events')
-                    if corp_type in no_corp_num_prefix_in_colin:
-                        append_corp_num_prefixes(events, 'BC')
-                    if colin_events:
-                        colin_events.get('events').extend(events)
-                    else:
-                        colin_events = event_info
+                    append_corp_num_prefixes(
+                        [event for event in events if event['corp_typ_cd'] in no_corp_num_prefix_in_colin], 'BC')
+                    colin_events['events'].extend(events)
+                    last_event_id = event_info.get('nextEventId')
 
             except Exception as err:
                 application.logger.error('Error getting event_ids from colin')
@@ -121,25 +125,42 @@ def check_for_manual_filings(application: Flask = None, token: dict = None):
             # }
 
             # for each event_id: if not in legal db table then add event_id to list
-            for info in colin_events['events']:
-                # check that event is associated with one of the coops loaded into legal db
-                response = requests.get(
-                    f'{legal_url}/{info["corp_num"]}',
-                    headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
-                )
-                if response.status_code == 200:
-                    # check legal table
-                    response = requests.get(f'{legal_url}/internal/filings/colin_id/{info["event_id"]}')
-                    if response.status_code == 404:
-                        id_list.append(info)
-                    elif response.status_code != 200:
-                        application.logger.error(f'Error checking for colin id {info["event_id"]} in legal')
-                else:
-                    application.logger.error('No ids returned from colin_last_update table in legal db.')
+            id_list = get_new_colin_events(application, token, colin_events['events'])
 
     return id_list
 
 
+def get_new_colin_events(application: Flask, token: dict, events: list) -> list:
+    """Return the events for businesses in legal whose event ids are not recorded in legal yet.
+
+    The events are checked against legal in batches, and compared here, rather than one request per event.
+    Raises an error if a batch can't be checked, so none of the events are applied.
+    """
+    new_events = []
+    batch_size = application.config['COLIN_EVENT_CHECK_BATCH_SIZE']
+    for start in range(0, len(events), batch_size):
+        batch = events[start:start + batch_size]
+        response = http_client.post(
+            f'{application.config["LEGAL_URL"]}/internal/filings/colin_events',
+            json={'events': [{'corpNum': info['corp_num'], 'eventId': info['event_id']} for info in batch]},
+            headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
+        )
+        if response.status_code != 200:
+            # raised so the run stops before the checkpoint can move past the events that weren't checked
+            application.logger.error(f'Error checking colin ids {batch[0]["event_id"]} to '
+                                     f'{batch[-1]["event_id"]} in legal: {response.status_code}')
+            raise Exception
+
+        checked = response.json()
+        identifiers = set(checked['identifiers'])
+        colin_ids = set(checked['colinIds'])
+        # only events for the businesses loaded into legal db, that are not in legal db yet
+        new_events.extend(info for info in batch
+                          if info['corp_num'] in identifiers and int(info['event_id']) not in colin_ids)
+
+    return new_events
+
+
 def append_corp_num_prefixes(events, corp_num_prefix):
     """Append corp num prefix to Colin corp num to make Lear compatible."""
     for event in events:
@@ -161,55 +182,134 @@ def get_filing(event_info: dict = None, application: Flask = None):  # pylint: d
 
     identifier = event_info['corp_num']
     event_id = event_info['event_id']
-    response = requests.get(
+    response = http_client.get(
         f'{application.config["COLIN_URL"]}/{legal_type}/{identifier}/filings/{filing_type}?eventId={event_id}'
     )
     filing = dict(response.json())
     return filing
 
 
-def update_filings(application):  # pylint: disable=redefined-outer-name, too-many-branches
-    """Get filings in colin that are not in lear and send them to lear."""
+class EventCheckpoint:
+    """Track the highest event id that every event up to has been applied, so it can be saved as it advances.
+
+    Events that failed or were skipped are never applied, so the checkpoint stops just before the first of them
+    and the next run tries them again.
+    """
+
+    def __init__(self, event_ids: list):
+        """Initialize the checkpoint with all of the event ids to be applied."""
+        self._event_ids = sorted(event_ids)
+        self._applied = set()
+        self._next = 0
+        self._lock = threading.Lock()
+        self.max_event_id = 0
+
+    def applied(self, event_id: int):
+        """Mark the event as applied, advancing the checkpoint past it and any applied events after it."""
+        with self._lock:
+            self._applied.add(event_id)
+            while self._next < len(self._event_ids) and self._event_ids[self._next] in self._applied:
+                self.max_event_id = self._event_ids[self._next]
+                self._next += 1
+
+    @property
+    def applied_count(self) -> int:
+        """Return the number of events up to the checkpoint."""
+        return self._next
+
+
+def apply_corp_filings(application: Flask, token: dict, corp_events: list, checkpoint: EventCheckpoint) -> dict:
+    # pylint: disable=redefined-outer-name
+    """Apply the corp's filings to legal in event order, skipping the rest once one fails.
+
+    This ensures we don't apply filings out of order when one fails.
+    """
+    result = {'successful': 0, 'failed': [], 'skipped': []}
+    for index, event_info in enumerate(corp_events):
+        try:
+            filing = get_filing(event_info, application)
+
+            # call legal api with filing
+            application.logger.debug(f'sending filing with event info: {event_info} to legal api.')
+            response = http_client.post(
+                f'{application.config["LEGAL_URL"]}/{event_info["corp_num"]}/filings',
+                json=filing,
+                headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
+            )
+            failed = response.status_code != 201
+        except Exception as err:  # pylint: disable=broad-except; the corp's remaining filings are skipped
+            application.logger.error(f'Error applying filing with event info: {event_info}: {err}')
+            failed = True
+
+        if failed:
+            application.logger.error(f'Legal failed to create filing for {event_info["corp_num"]}')
+            result['failed'].append(event_info)
+            result['skipped'].extend(corp_events[index + 1:])
+            break
+
+        result['successful'] += 1
+        checkpoint.applied(int(event_info['event_id']))
+    return result
+
+
+def update_max_event_id(application: Flask, token: dict, max_event_id: int):  # pylint: disable=redefined-outer-name
+    """Update max_event_id in legal_db."""
+    application.logger.debug('setting last_event_id in legal_db to {}'.format(max_event_id))
+    response = http_client.post(
+        f'{application.config["LEGAL_URL"]}/internal/filings/colin_id/{max_event_id}',
+        headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
+    )
+    if response.status_code != 201:
+        application.logger.error(
+            f'Error adding {max_event_id} colin_last_update table in legal db {response.status_code}'
+        )
+    else:
+        if dict(response.json())['maxId'] != max_event_id:
+            application.logger.error('Updated colin id is not max colin id in legal db.')
+        else:
+            application.logger.debug('Successfully updated colin id in legal db.')
+
+
+def update_filings(application):  # pylint: disable=redefined-outer-name, too-many-locals
+    """Get filings in colin that are not in lear and send them to lear.
+
+    Corps are applied concurrently, each with its filings in event order, and the max_event_id is
+    checkpointed in legal as the applied events advance, so a failed run does not redo the whole batch.
+    """
     successful_filings = 0
     failed_filing_events = []
-    corps_with_failed_filing = []
     skipped_filings = []
-    first_failed_id = None
-    try:  # pylint: disable=too-many-nested-blocks
+    try:
         # get updater-job token
         token = AccountService.get_bearer_token()
 
         # check if there are filings to send to legal
         manual_filings_info = check_for_manual_filings(application, token)
-        max_event_id = 0
+        checkpoint = EventCheckpoint([int(event_info['event_id']) for event_info in manual_filings_info])
+        last_checkpoint, last_checkpoint_count = 0, 0
 
         if len(manual_filings_info) > 0:
+            events_by_corp = {}
             for event_info in manual_filings_info:
-                # Make sure this coop has no outstanding filings that failed to be applied.
-                # This ensures we don't apply filings out of order when one fails.
-                if event_info['corp_num'] not in corps_with_failed_filing:
-                    filing = get_filing(event_info, application)
-
-                    # call legal api with filing
-                    application.logger.debug(f'sending filing with event info: {event_info} to legal api.')
-                    response = requests.post(
-                        f'{application.config["LEGAL_URL"]}/{event_info["corp_num"]}/filings',
-                        json=filing,
-                        headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
-                    )
-                    if response.status_code != 201:
-                        if not first_failed_id:
-                            first_failed_id = event_info['event_id']
-                        failed_filing_events.append(event_info)
-                        corps_with_failed_filing.append(event_info['corp_num'])
-                        application.logger.error(f'Legal failed to create filing for {event_info["corp_num"]}')
-                    else:
-                        # update max_event_id entered
-                        successful_filings += 1
-                        if int(event_info['event_id']) > max_event_id:
-                            max_event_id = int(event_info['event_id'])
-                else:
-                    skipped_filings.append(event_info)
+                events_by_corp.setdefault(event_info['corp_num'], []).append(event_info)
+
+            with ThreadPoolExecutor(max_workers=application.config['UPDATE_FILINGS_WORKERS']) as executor:
+                futures = [
+                    executor.submit(apply_corp_filings, application, token,
+                                    sorted(corp_events, key=lambda event_info: int(event_info['event_id'])),
+                                    checkpoint)
+                    for corp_events in events_by_corp.values()
+                ]
+                for future in as_completed(futures):
+                    result = future.result()
+                    successful_filings += result['successful']
+                    failed_filing_events.extend(result['failed'])
+                    skipped_filings.extend(result['skipped'])
+
+                    if not SET_EVENTS_MANUALLY and checkpoint.applied_count - last_checkpoint_count >= \
+                            application.config['CHECKPOINT_INTERVAL']:
+                        last_checkpoint, last_checkpoint_count = checkpoint.max_event_id, checkpoint.applied_count
+                        update_max_event_id(application, token, last_checkpoint)
         else:
             application.logger.debug('0 filings updated in legal db.')
 
@@ -218,31 +318,14 @@ def update_filings(application):  # pylint: disable=redefined-outer-name, too-ma
         application.logger.debug(f'failed filings: {len(failed_filing_events)}')
         application.logger.debug(f'failed filings event info: {failed_filing_events}')
 
+        # if one of the events failed, the checkpoint stays below it so that the next run will try it again
+        # this way failed filings wont get buried/forgotten after multiple runs
+        max_event_id = checkpoint.max_event_id
         # if manually bringing across filings, set to first id so you don't skip any filings on the next run
         if SET_EVENTS_MANUALLY:
-            first_failed_id = 102125621
-
-        # if one of the events failed then save that id minus one so that the next run will try it again
-        # this way failed filings wont get buried/forgotten after multiple runs
-        if first_failed_id:
-            max_event_id = first_failed_id - 1
-        if max_event_id > 0:
-            # update max_event_id in legal_db
-            application.logger.debug('setting last_event_id in legal_db to {}'.format(max_event_id))
-            response = requests.post(
-                f'{application.config["LEGAL_URL"]}/internal/filings/colin_id/{max_event_id}',
-                headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
-            )
-            if response.status_code != 201:
-                application.logger.error(
-                    f'Error adding {max_event_id} colin_last_update table in legal db {response.status_code}'
-                )
-            else:
-                if dict(response.json())['maxId'] != max_event_id:
-                    application.logger.error('Updated colin id is not max colin id in legal db.')
-                else:
-                    application.logger.debug('Successfully updated colin id in legal db.')
-
+            max_event_id = 102125621 - 1
+        if max_event_id > last_checkpoint:
+            update_max_event_id(application, token, max_event_id)
         else:
             application.logger.debug('colin_last_update not updated in legal db.')
 
@@ -274,7 +357,7 @@ async def update_business_nos(application):  # pylint: disable=redefined-outer-n
 
         # get identifiers with outstanding tax_ids
         application.logger.debug('Getting businesses with outstanding tax ids from legal api...')
-        response = requests.get(
+        response = http_client.get(
             application.config['LEGAL_URL'] + '/internal/tax_ids',
             headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
         )
@@ -286,7 +369,7 @@ async def update_business_nos(application):  # pylint: disable=redefined-outer-n
         if identifiers['identifiers']:
             # get tax ids that exist for above entities
             application.logger.debug(f'Getting tax ids for {identifiers["identifiers"]} from colin api...')
-            response = requests.get(
+            response = http_client.get(
                 application.config['COLIN_URL'] + '/internal/tax_ids',
                 json=identifiers,
                 headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
@@ -298,7 +381,7 @@ async def update_business_nos(application):  # pylint: disable=redefined-outer-n
             if tax_ids.keys():
                 # update lear with new tax ids from colin
                 application.logger.debug(f'Updating tax ids for {tax_ids.keys()} in lear...')
-                response = requests.post(
+                response = http_client.post(
                     application.config['LEGAL_URL'] + '/internal/tax_ids',
                     json=tax_ids,
                     headers={'Content-Type': 'application/json', 'Authorization': f'Bearer {token}'}
@@ -326,3 +409,4 @@ if __name__ == '__main__':
         event_loop = asyncio.get_event_loop()
         qsm = QueueService(app=application, loop=event_loop)
         event_loop.run_until_complete(update_business_nos(application))
+        http_client.log_latency(application.logger)
@@ -0,0 +1,164 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The HTTP client shared by the jobs.
+
+Requests to the same base URL share a session, so their connections are kept alive and reused.
+Every request has a timeout. Idempotent requests are retried with a backoff on connection errors and
+on the statuses in RETRY_STATUSES; other requests are only retried when the connection could not be made.
+The latency of each endpoint is recorded, and logged by log_latency().
+"""
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset(['DELETE', 'GET', 'HEAD', 'OPTIONS', 'PUT', 'TRACE'])
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# the settings used by the sessions, which can be set from the job config with init_app
+SETTINGS = {
+    'HTTP_CONNECT_TIMEOUT': 5.0,
+    'HTTP_READ_TIMEOUT': 60.0,
+    'HTTP_RETRIES': 3,
+    'HTTP_BACKOFF_FACTOR': 0.5,
+    'HTTP_POOL_SIZE': 10
+}
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+_latency: Dict[str, Dict] = {}
+_latency_lock = threading.Lock()
+
+
+def init_app(app):
+    """Use the HTTP_* settings in the app config, closing any sessions created with the old settings."""
+    for key in SETTINGS:
+        if key in app.config:
+            SETTINGS[key] = app.config[key]
+    close()
+
+
+def get_session(url: str) -> requests.Session:
+    """Return the session for the base URL of the url, creating it on first use."""
+    base_url = '{0.scheme}://{0.netloc}'.format(urlsplit(url))
+    with _sessions_lock:
+        if base_url not in _sessions:
+            retry = Retry(total=int(SETTINGS['HTTP_RETRIES']),
+                          backoff_factor=float(SETTINGS['HTTP_BACKOFF_FACTOR']),
+                          status_forcelist=RETRY_STATUSES,
+                          allowed_methods=IDEMPOTENT_METHODS,
+                          raise_on_status=False)
+            adapter = HTTPAdapter(max_retries=retry,
+                                  pool_connections=1,
+                                  pool_maxsize=int(SETTINGS['HTTP_POOL_SIZE']))
+            session = requests.Session()
+            session.mount(base_url, adapter)
+            _sessions[base_url] = session
+        return _sessions[base_url]
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """Send the request on the session for its base URL, recording the latency of the endpoint."""
+    kwargs.setdefault('timeout', (float(SETTINGS['HTTP_CONNECT_TIMEOUT']), float(SETTINGS['HTTP_READ_TIMEOUT'])))
+    endpoint = get_endpoint(method, url)
+    start = time.perf_counter()
+    try:
+        response = get_session(url).request(method, url, **kwargs)
+    except requests.exceptions.RequestException:
+        _record_latency(endpoint, time.perf_counter() - start, failed=True)
+        raise
+    elapsed = time.perf_counter() - start
+    _record_latency(endpoint, elapsed, failed=response.status_code >= 500)
+    logger.debug('%s %s %.3fs', endpoint, response.status_code, elapsed)
+    return response
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """Send a GET request."""
+    return request('GET', url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    """Send a POST request."""
+    return request('POST', url, **kwargs)
+
+
+def put(url: str, **kwargs) -> requests.Response:
+    """Send a PUT request."""
+    return request('PUT', url, **kwargs)
+
+
+def patch(url: str, **kwargs) -> requests.Response:
+    """Send a PATCH request."""
+    return request('PATCH', url, **kwargs)
+
+
+def map_concurrently(func: Callable, items: Iterable, max_workers: int) -> List:
+    """Return the results of calling func on each item, with at most max_workers calls at the same time.
+
+    The results are in the order of the items, and the first error raised by a call is raised.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(func, items))
+
+
+def get_endpoint(method: str, url: str) -> str:
+    """Return the endpoint of the request, with the ids in its path replaced so the calls to it are grouped."""
+    parts = urlsplit(url)
+    path = re.sub(r'/\d+(?=/|$)', '/{id}', parts.path)
+    return f'{method} {parts.netloc}{path}'
+
+
+def _record_latency(endpoint: str, elapsed: float, failed: bool):
+    """Add the request to the latency of its endpoint."""
+    with _latency_lock:
+        stats = _latency.setdefault(endpoint, {'count': 0, 'failed': 0, 'total': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['failed'] += int(failed)
+        stats['total'] += elapsed
+        stats['max'] = max(stats['max'], elapsed)
+
+
+def get_latency() -> Dict[str, Tuple[int, int, float, float]]:
+    """Return the (count, failed, mean seconds, max seconds) of the requests to each endpoint."""
+    with _latency_lock:
+        return {endpoint: (stats['count'], stats['failed'], stats['total'] / stats['count'], stats['max'])
+                for endpoint, stats in _latency.items()}
+
+
+def log_latency(log: logging.Logger = logger):
+    """Log the latency of each endpoint called, slowest in total first."""
+    latency = get_latency()
+    for endpoint, (count, failed, mean, maximum) in sorted(latency.items(),
+                                                           key=lambda item: item[1][0] * item[1][2],
+                                                           reverse=True):
+        log.info(f'{endpoint}: {count} requests, {failed} failed, mean {mean:.3f}s, max {maximum:.3f}s')
+
+
+def close():
+    """Close the sessions, and their connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
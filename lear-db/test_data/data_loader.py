@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Loads the businesses from the COLIN_API, as provided in a csv file."""
+import argparse
 import csv
+import json
 import os
+import time
 from http import HTTPStatus
 
 import requests
@@ -29,6 +32,8 @@ from legal_api.models import (
 from legal_api.services import queue
 from legal_api.models.colin_event_id import ColinEventId
 
+from utils import http_client
+
 
 load_dotenv(find_dotenv())
 
@@ -100,6 +105,156 @@ def load_corps(csv_filepath: str = 'corp_nums/corps_to_load.csv'):
                     FAILED_CORPS.append(corp_num)
                     continue
 
+def get_corp_identifier(corp_num: str):
+    """Return the legal type and LEAR identifier for a corp number in the csv file."""
+    if corp_num[:2] == Business.LegalTypes.COOP.value:
+        return Business.LegalTypes.COOP.value, corp_num
+    return Business.LegalTypes.COMP.value, 'BC' + corp_num[-7:]
+
+
+def fetch_corp(corp: tuple) -> dict:
+    """Fetch the filing to load the corp from in COLIN, returning the result of the fetch.
+
+    Only reads from COLIN, so it can run in a worker thread. The result status is 'fetched', 'skipped' or 'failed'.
+    """
+    legal_type, corp_num = corp
+    try:
+        if not (filing_event := get_data_load_required_filing_event(legal_type, corp_num)):
+            return {'corp_num': corp_num, 'status': 'skipped', 'reason': 'no icorp app or conversion ledger event'}
+
+        filing_type = get_filing_type(filing_event.get('filing_typ_cd'))
+        if not (colin_filing := get_filing(filing_type, legal_type, filing_event)):
+            return {'corp_num': corp_num, 'status': 'skipped', 'reason': 'no filing retrieved from filing event'}
+
+        return {'corp_num': corp_num, 'status': 'fetched', 'filing_type': filing_type,
+                'colin_filing': colin_filing, 'event_id': filing_event.get('event_id')}
+    except requests.exceptions.Timeout:
+        return {'corp_num': corp_num, 'status': 'failed', 'reason': 'colin_api request timed out'}
+    except Exception as err:  # pylint: disable=broad-except
+        return {'corp_num': corp_num, 'status': 'failed', 'reason': repr(err)}
+
+
+def read_checkpoint(checkpoint_filepath: str) -> dict:
+    """Return the corps already loaded or skipped by earlier runs, from the checkpoint file."""
+    if not os.path.exists(checkpoint_filepath):
+        return {'loaded': [], 'skipped': []}
+    with open(checkpoint_filepath, 'r') as checkpoint_file:
+        return json.load(checkpoint_file)
+
+
+def write_checkpoint(checkpoint_filepath: str, checkpoint: dict):
+    """Replace the checkpoint file, so a run that is stopped part way through never leaves it half written."""
+    with open(checkpoint_filepath + '.tmp', 'w') as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(checkpoint_filepath + '.tmp', checkpoint_filepath)
+
+
+def find_loaded_corps(results: list) -> dict:
+    """Return the filings already created by earlier runs for the fetched COLIN events, by corp number.
+
+    A corp has no business until the filer has processed its filing, so a run stopped after the commit of a batch
+    is picked up from the COLIN event the filing was created from.
+    """
+    corp_nums = {result['event_id']: result['corp_num'] for result in results}
+    rows = db.session.query(ColinEventId.colin_event_id, ColinEventId.filing_id). \
+        join(Filing, Filing.id == ColinEventId.filing_id). \
+        filter(ColinEventId.colin_event_id.in_(list(corp_nums)),
+               Filing._source == Filing.Source.COLIN.value)  # pylint: disable=protected-access
+    return {corp_nums[colin_event_id]: filing_id for colin_event_id, filing_id in rows}
+
+
+def load_corps_batch(results: list) -> list:
+    """Create the filings for the fetched corps in one commit, returning the corps loaded and their filing ids."""
+    filings = []
+    for result in results:
+        filing = create_filing(result['filing_type'], result['colin_filing'], result['event_id'], result['corp_num'])
+        db.session.add(filing)
+        filings.append((result['corp_num'], filing))
+    db.session.commit()
+    return [(corp_num, filing.id) for corp_num, filing in filings]
+
+
+def queue_corps_batch(loaded: list) -> dict:
+    """Queue the filings of the loaded corps in order, returning the filing ids that could not be queued by corp."""
+    unqueued = {}
+    for corp_num, filing_id in loaded:
+        try:
+            queue.publish_json({'filing': {'id': filing_id}})
+        except Exception:  # pylint: disable=broad-except
+            unqueued[corp_num] = filing_id
+    return unqueued
+
+
+def load_corps_bulk(csv_filepath: str = 'corp_nums/corps_to_load.csv',  # pylint: disable=too-many-locals
+                    checkpoint_filepath: str = 'corp_nums/corps_to_load.checkpoint.json',
+                    max_workers: int = 10,
+                    batch_size: int = 100) -> dict:
+    """Load the corps in the csv file in batches, returning a summary of the run.
+
+    The COLIN filings for a batch are fetched by up to max_workers threads, and the batch is saved in one commit.
+    The corps loaded are recorded in the checkpoint file as soon as the batch is committed, before their filings
+    are queued, and the corps skipped after each batch. Corps in the checkpoint, and corps that already have a
+    filing for their COLIN event, are not loaded again when the loader is re-run, so a stopped run picks up where
+    it left off. Failed corps are tried again. Filings that were committed but could not be queued are listed in
+    the summary by corp, to be queued again by hand.
+    """
+    start = time.perf_counter()
+    checkpoint = read_checkpoint(checkpoint_filepath)
+    done = set(checkpoint['loaded']) | set(checkpoint['skipped'])
+    with open(csv_filepath, 'r') as csvfile:
+        corps = [get_corp_identifier(row['CORP_NUM']) for row in csv.DictReader(csvfile)]
+    corps = [corp for corp in corps if corp[1] not in done]
+
+    summary = {'total': len(corps) + len(done), 'resumed_from': len(done),
+               'loaded': 0, 'skipped': 0, 'failed': {}, 'unqueued': {}}
+    with FLASK_APP.app_context():
+        for index in range(0, len(corps), batch_size):
+            batch = corps[index:index + batch_size]
+            existing = {identifier for identifier, in db.session.query(Business.identifier).filter(
+                Business.identifier.in_([corp_num for _, corp_num in batch]))}
+            checkpoint['skipped'].extend(existing)
+            summary['skipped'] += len(existing)
+
+            fetched = []
+            for result in http_client.map_concurrently(fetch_corp,
+                                                       [corp for corp in batch if corp[1] not in existing],
+                                                       max_workers):
+                if result['status'] == 'fetched':
+                    fetched.append(result)
+                elif result['status'] == 'skipped':
+                    checkpoint['skipped'].append(result['corp_num'])
+                    summary['skipped'] += 1
+                else:
+                    summary['failed'][result['corp_num']] = result['reason']
+
+            if fetched:
+                already_loaded = find_loaded_corps(fetched)
+                checkpoint['loaded'].extend(already_loaded)
+                summary['loaded'] += len(already_loaded)
+                fetched = [result for result in fetched if result['corp_num'] not in already_loaded]
+
+            if fetched:
+                try:
+                    loaded = load_corps_batch(fetched)
+                except Exception as err:  # pylint: disable=broad-except
+                    db.session.rollback()
+                    summary['failed'].update({result['corp_num']: repr(err) for result in fetched})
+                else:
+                    checkpoint['loaded'].extend(corp_num for corp_num, _ in loaded)
+                    summary['loaded'] += len(loaded)
+                    write_checkpoint(checkpoint_filepath, checkpoint)
+                    summary['unqueued'].update(queue_corps_batch(loaded))
+
+            write_checkpoint(checkpoint_filepath, checkpoint)
+            elapsed = time.perf_counter() - start
+            print(f'{index + len(batch)}/{len(corps)} corps processed in {elapsed:.0f}s')
+
+    elapsed = time.perf_counter() - start
+    summary['elapsed_seconds'] = round(elapsed, 1)
+    summary['corps_per_second'] = round((len(corps) / elapsed) if elapsed else 0, 2)
+    return summary
+
+
 def create_filing(filing_type, colin_filing, colin_event_id, corp_num):
     """Create legal api filing using colin filing as base"""
     effective_date = colin_filing['filing']['business']['foundingDate']
@@ -130,7 +285,7 @@ def get_filing_events_for_corp(legal_type, corp_num):
     if(legal_type == Business.LegalTypes.COMP.value):
         colin_corp_num = corp_num[-7:]
 
-    r = requests.get(f'{COLIN_API}/api/v1/businesses/event/corp_num/{colin_corp_num}', timeout=TIMEOUT)
+    r = http_client.get(f'{COLIN_API}/api/v1/businesses/event/corp_num/{colin_corp_num}', timeout=TIMEOUT)
     if r.status_code != HTTPStatus.OK or not r.json():
         return None
 
@@ -142,8 +297,9 @@ def get_filing(colin_filing_type, legal_type, event_info: dict = None):  # pylin
     identifier = event_info['corp_num']
     event_id = event_info['event_id']
     print(f'{COLIN_API}/api/v1/businesses/{legal_type}/{identifier}/filings/{colin_filing_type}?eventId={event_id}')
-    response = requests.get(
-        f'{COLIN_API}/api/v1/businesses/{legal_type}/{identifier}/filings/{colin_filing_type}?eventId={event_id}'
+    response = http_client.get(
+        f'{COLIN_API}/api/v1/businesses/{legal_type}/{identifier}/filings/{colin_filing_type}?eventId={event_id}',
+        timeout=TIMEOUT
     )
     filing = dict(response.json())
     return filing
@@ -158,7 +314,23 @@ def get_filing_type(filing_typ_cd):
 
 
 if __name__ == '__main__':
-    load_corps(csv_filepath='corp_nums/corps_to_load.csv')
-    print(f'processed: {ROWCOUNT} rows')
-    print(f'Successfully loaded  {len(NEW_CORPS)}')
-    print(f'Failed to load {len(FAILED_CORPS)}')
+    parser = argparse.ArgumentParser(description='Load the corps in the csv file from COLIN.')
+    parser.add_argument('--csv', default='corp_nums/corps_to_load.csv', help='the csv file of corps to load')
+    parser.add_argument('--bulk', action='store_true', help='load the corps in parallel batches')
+    parser.add_argument('--checkpoint', default='corp_nums/corps_to_load.checkpoint.json',
+                        help='the file the progress of a bulk load is kept in, to resume it from')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('LOADER_WORKERS', '10')),
+                        help='the most COLIN requests to make at the same time')
+    parser.add_argument('--batch-size', type=int, default=int(os.getenv('LOADER_BATCH_SIZE', '100')),
+                        help='the number of corps saved in each commit')
+    args = parser.parse_args()
+
+    if args.bulk:
+        print(json.dumps(load_corps_bulk(args.csv, args.checkpoint, args.workers, args.batch_size), indent=2))
+    else:
+        load_corps(csv_filepath=args.csv)
+        print(f'processed: {ROWCOUNT} rows')
+        print(f'Successfully loaded  {len(NEW_CORPS)}')
+        print(f'Failed to load {len(FAILED_CORPS)}')
+    for endpoint, (count, failed, mean, maximum) in http_client.get_latency().items():
+        print(f'{endpoint}: {count} requests, {failed} failed, mean {mean:.3f}s, max {maximum:.3f}s')
@@ -22,6 +22,7 @@ from flask_migrate import Migrate, MigrateCommand
 
 from legal_api import create_app
 from legal_api.models import db
+from legal_api.services import VersionCompactionService
 # models included so that migrate can build the database migrations
 from legal_api import models  # pylint: disable=unused-import
 
@@ -50,6 +51,37 @@ def list_routes():
         print(line)
 
 
+@MANAGER.option('-d', '--horizon-days', dest='horizon_days', type=int, default=None,
+                help='archive version rows superseded more than this many days ago')
+@MANAGER.option('--dry-run', dest='dry_run', action='store_true', default=False,
+                help='only report the row counts and the estimated space saved')
+@MANAGER.option('--no-archive', dest='archive', action='store_false', default=True)
+@MANAGER.option('--no-collapse', dest='collapse', action='store_false', default=True)
+@MANAGER.option('--no-reindex', dest='reindex', action='store_false', default=True)
+def compact_versions(horizon_days, dry_run, archive, collapse, reindex):
+    """Archive, collapse and reindex the continuum version tables."""
+    horizon = VersionCompactionService.get_horizon(horizon_days)
+    print(f'horizon: {horizon.isoformat()}')
+
+    if dry_run:
+        print('{:30s} {:>12s} {:>12s} {:>12s} {:>16s}'.format(
+            'table', 'rows', 'archivable', 'no-op', 'est. bytes saved'))
+        for row in VersionCompactionService.report(horizon):
+            print('{table:30s} {totalRows:12d} {archivableRows:12d} {noopRows:12d} {estimatedBytesSaved:16d}'
+                  .format(**row))
+        return
+
+    if collapse:
+        for table, rowcount in VersionCompactionService.collapse_noop_versions().items():
+            print(f'collapsed {rowcount} no-op versions in {table}')
+    if archive:
+        for table, rowcount in VersionCompactionService.archive(horizon).items():
+            print(f'archived {rowcount} versions from {table}')
+    if reindex:
+        for table in VersionCompactionService.rebuild_indexes():
+            print(f'reindexed {table}')
+
+
 if __name__ == '__main__':
     logging.log(logging.INFO, 'Running the Manager')
     MANAGER.run()
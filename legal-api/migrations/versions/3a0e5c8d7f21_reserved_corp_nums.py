@@ -0,0 +1,33 @@
+"""Add reserved_corp_nums table for the pool of corp numbers reserved in COLIN
+
+Revision ID: 3a0e5c8d7f21
+Revises: 78ddb7f6f8b5
+Create Date: 2021-05-03 10:12:44.118349
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3a0e5c8d7f21'
+down_revision = '78ddb7f6f8b5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('reserved_corp_nums',
+                    sa.Column('identifier', sa.String(length=10), nullable=False),
+                    sa.Column('corp_type', sa.String(length=10), nullable=False),
+                    sa.Column('reserved_date', sa.DateTime(timezone=True), nullable=True),
+                    sa.Column('used_date', sa.DateTime(timezone=True), nullable=True),
+                    sa.PrimaryKeyConstraint('identifier')
+                    )
+    op.create_index('ix_reserved_corp_nums_available', 'reserved_corp_nums', ['corp_type', 'identifier'],
+                    unique=False, postgresql_where=sa.text('used_date IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_reserved_corp_nums_available', table_name='reserved_corp_nums')
+    op.drop_table('reserved_corp_nums')
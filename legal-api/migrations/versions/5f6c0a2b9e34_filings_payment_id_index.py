@@ -0,0 +1,23 @@
+"""Add an index on filings.payment_id for the payment token lookup
+
+Revision ID: 5f6c0a2b9e34
+Revises: 3a0e5c8d7f21
+Create Date: 2021-05-05 09:41:27.503116
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5f6c0a2b9e34'
+down_revision = '3a0e5c8d7f21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_filings_payment_id'), 'filings', ['payment_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_filings_payment_id'), table_name='filings')
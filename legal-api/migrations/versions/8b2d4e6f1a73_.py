@@ -0,0 +1,27 @@
+"""Add a partial index on the completed filings to send to colin, and an index on colin_event_ids.filing_id
+
+Revision ID: 8b2d4e6f1a73
+Revises: 5f6c0a2b9e34
+Create Date: 2021-05-12 10:16:42.118305
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '8b2d4e6f1a73'
+down_revision = '5f6c0a2b9e34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_filings_completed_filing_date', 'filings', ['filing_date', 'id'], unique=False,
+                    postgresql_where=sa.text("status = 'COMPLETED' AND effective_date IS NOT NULL"))
+    op.create_index(op.f('ix_colin_event_ids_filing_id'), 'colin_event_ids', ['filing_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_colin_event_ids_filing_id'), table_name='colin_event_ids')
+    op.drop_index('ix_filings_completed_filing_date', table_name='filings')
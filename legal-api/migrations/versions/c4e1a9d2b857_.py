@@ -0,0 +1,23 @@
+"""Add an index on filings (status, effective_date) for the future effective filings that are due
+
+Revision ID: c4e1a9d2b857
+Revises: 8b2d4e6f1a73
+Create Date: 2021-05-14 14:02:09.561734
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4e1a9d2b857'
+down_revision = '8b2d4e6f1a73'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_filings_status_effective_date', 'filings', ['status', 'effective_date'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_filings_status_effective_date', table_name='filings')
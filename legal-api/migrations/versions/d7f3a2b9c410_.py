@@ -0,0 +1,51 @@
+"""Add the daily filing rollups the filings report job reads, in a reporting schema of their own
+
+Revision ID: d7f3a2b9c410
+Revises: c4e1a9d2b857
+Create Date: 2021-05-20 10:31:44.128305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7f3a2b9c410'
+down_revision = 'c4e1a9d2b857'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # the rollups are written by the report job only, and are outside the models, so autogenerate leaves them alone
+    op.execute('CREATE SCHEMA IF NOT EXISTS reporting')
+    op.create_table('report_rollup_state',
+                    sa.Column('rollup', sa.String(length=50), nullable=False),
+                    sa.Column('refreshed_through', sa.Date(), nullable=False),
+                    sa.PrimaryKeyConstraint('rollup'),
+                    schema='reporting'
+                    )
+    op.create_table('report_filing_daily',
+                    sa.Column('day', sa.Date(), nullable=False),
+                    sa.Column('filing_type', sa.String(length=30), nullable=False),
+                    sa.Column('legal_type', sa.String(length=10), nullable=False),
+                    sa.Column('status', sa.String(length=20), nullable=False),
+                    sa.Column('filing_count', sa.Integer(), nullable=False),
+                    sa.PrimaryKeyConstraint('day', 'filing_type', 'legal_type', 'status'),
+                    schema='reporting'
+                    )
+    op.create_table('report_completed_filing_daily',
+                    sa.Column('day', sa.Date(), nullable=False),
+                    sa.Column('business_id', sa.Integer(), nullable=False),
+                    sa.Column('filing_type', sa.String(length=30), nullable=False),
+                    sa.Column('filing_count', sa.Integer(), nullable=False),
+                    sa.PrimaryKeyConstraint('day', 'business_id', 'filing_type'),
+                    schema='reporting'
+                    )
+
+
+def downgrade():
+    op.drop_table('report_completed_filing_daily', schema='reporting')
+    op.drop_table('report_filing_daily', schema='reporting')
+    op.drop_table('report_rollup_state', schema='reporting')
+    op.execute('DROP SCHEMA IF EXISTS reporting')
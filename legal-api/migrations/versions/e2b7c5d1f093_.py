@@ -0,0 +1,41 @@
+"""Add the archive tables the version compaction moves superseded version rows into, in an archive schema
+
+Revision ID: e2b7c5d1f093
+Revises: d7f3a2b9c410
+Create Date: 2021-05-21 09:12:37.402118
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2b7c5d1f093'
+down_revision = 'd7f3a2b9c410'
+branch_labels = None
+depends_on = None
+
+VERSION_TABLES = [
+    'addresses_version',
+    'aliases_version',
+    'businesses_version',
+    'offices_version',
+    'parties_version',
+    'party_roles_version',
+    'resolutions_version',
+    'share_classes_version',
+    'share_series_version',
+    'users_version'
+]
+
+
+def upgrade():
+    # the archive tables mirror the version tables, and are outside the models, so autogenerate leaves them alone
+    op.execute('CREATE SCHEMA IF NOT EXISTS archive')
+    for table in VERSION_TABLES:
+        op.execute(f'CREATE TABLE archive.{table} (LIKE public.{table} INCLUDING DEFAULTS)')
+
+
+def downgrade():
+    for table in VERSION_TABLES:
+        op.execute(f'DROP TABLE archive.{table}')
+    op.execute('DROP SCHEMA IF EXISTS archive')
@@ -23,6 +23,7 @@ from .filing import Filing
 from .office import Office, OfficeType
 from .party_role import Party, PartyRole
 from .registration_bootstrap import RegistrationBootstrap
+from .reserved_corp_num import ReservedCorpNum
 from .resolution import Resolution
 from .share_class import ShareClass
 from .share_series import ShareSeries
@@ -31,5 +32,5 @@ from .user import User
 
 __all__ = ('db',
            'Address', 'Alias', 'Business', 'ColinLastUpdate', 'Comment', 'Filing',
-           'Office', 'OfficeType', 'Party', 'RegistrationBootstrap', 'Resolution',
+           'Office', 'OfficeType', 'Party', 'RegistrationBootstrap', 'ReservedCorpNum', 'Resolution',
            'PartyRole', 'ShareClass', 'ShareSeries', 'User')
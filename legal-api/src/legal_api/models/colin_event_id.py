@@ -15,6 +15,9 @@
 
 The ColinEventId class and Schema are held in this module.
 """
+from typing import List, Tuple
+
+from sqlalchemy import text
 
 from .db import db
 
@@ -25,7 +28,7 @@ class ColinEventId(db.Model):  # pylint: disable=too-few-public-methods
     __tablename__ = 'colin_event_ids'
 
     colin_event_id = db.Column('colin_event_id', db.Integer, unique=True, primary_key=True)
-    filing_id = db.Column('filing_id', db.Integer, db.ForeignKey('filings.id'))
+    filing_id = db.Column('filing_id', db.Integer, db.ForeignKey('filings.id'), index=True)
 
     def save(self):
         """Save the object to the database immediately."""
@@ -47,3 +50,24 @@ class ColinEventId(db.Model):  # pylint: disable=too-few-public-methods
         colin_event_id_obj =\
             db.session.query(ColinEventId).filter(ColinEventId.colin_event_id == colin_id).one_or_none()
         return colin_event_id_obj
+
+    @staticmethod
+    def check_events(events: List[Tuple[str, int]]) -> Tuple[List[str], List[int]]:
+        """Return the corp nums of the events that are businesses in lear, and the event ids already recorded.
+
+        The (corp num, event id) pairs are checked together in one query.
+        """
+        if not events:
+            return [], []
+        rows = db.session.execute(
+            text("""
+                SELECT e.corp_num, e.event_id, b.identifier IS NOT NULL, c.colin_event_id IS NOT NULL
+                FROM unnest(CAST(:corp_nums AS varchar[]), CAST(:event_ids AS integer[])) AS e(corp_num, event_id)
+                LEFT JOIN businesses b ON b.identifier = e.corp_num
+                LEFT JOIN colin_event_ids c ON c.colin_event_id = e.event_id
+            """),
+            {'corp_nums': [corp_num for corp_num, _ in events], 'event_ids': [event_id for _, event_id in events]}
+        ).fetchall()
+        identifiers = sorted({corp_num for corp_num, _, business_exists, _ in rows if business_exists})
+        colin_ids = sorted({event_id for _, event_id, _, colin_id_exists in rows if colin_id_exists})
+        return identifiers, colin_ids
@@ -16,13 +16,13 @@ import copy
 from datetime import date, datetime
 from enum import Enum
 from http import HTTPStatus
-from typing import List
+from typing import List, Tuple
 
 from flask import current_app
 from sqlalchemy import desc, event, inspect, or_
 from sqlalchemy.dialects.postgresql import JSONB, dialect
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.orm import backref
+from sqlalchemy.orm import aliased, backref
 
 from legal_api.exceptions import BusinessException
 from legal_api.models.colin_event_id import ColinEventId
@@ -167,6 +167,13 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
         ]
     }
 
+    __table_args__ = (
+        # the completed filings still to be sent to colin, see get_completed_filings_for_colin
+        db.Index('ix_filings_completed_filing_date', 'filing_date', 'id',
+                 postgresql_where=db.text("status = 'COMPLETED' AND effective_date IS NOT NULL")),
+        db.Index('ix_filings_status_effective_date', 'status', 'effective_date'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     _completion_date = db.Column('completion_date', db.DateTime(timezone=True))
     _filing_date = db.Column('filing_date', db.DateTime(timezone=True), default=datetime.utcnow)
@@ -175,7 +182,7 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
     tech_correction_json = db.Column('tech_correction_json', JSONB)
     effective_date = db.Column('effective_date', db.DateTime(timezone=True), default=datetime.utcnow)
     _payment_status_code = db.Column('payment_status_code', db.String(50))
-    _payment_token = db.Column('payment_id', db.String(4096))
+    _payment_token = db.Column('payment_id', db.String(4096), index=True)
     _payment_completion_date = db.Column('payment_completion_date', db.DateTime(timezone=True))
     _status = db.Column('status', db.String(20), default=Status.DRAFT)
     paper_only = db.Column('paper_only', db.Boolean, unique=False, default=False)
@@ -521,15 +528,50 @@ class Filing(db.Model):  # pylint: disable=too-many-instance-attributes,too-many
         return filing.first()
 
     @staticmethod
-    def get_completed_filings_for_colin():
-        """Return the filings with statuses in the status array input."""
-        filings = db.session.query(Filing). \
+    def get_completed_filings_for_colin(limit: int = None, after_filing_id: int = None) -> List:
+        """Return the completed filings that have not been sent to colin, in filing date order.
+
+        Each row has the filing, the legal type and legal name of its business, and for a correction the
+        colin event id of the filing it corrects, all fetched in one query.
+        Pass the id of the last filing of a page as after_filing_id to get the next page.
+        """
+        # the businesses table is used rather than the Business model, which imports this module
+        businesses = db.metadata.tables['businesses']
+        corrected_filing_id = Filing._filing_json['filing']['correction']['correctedFilingId'].astext
+        corrected_colin_event_id = aliased(ColinEventId)
+        corrected_filing_colin_id = db.session.query(db.func.min(corrected_colin_event_id.colin_event_id)). \
+            filter(corrected_colin_event_id.filing_id == db.cast(corrected_filing_id, db.Integer)). \
+            as_scalar()
+
+        query = db.session.query(Filing,
+                                 businesses.c.legal_type,
+                                 businesses.c.legal_name,
+                                 corrected_filing_colin_id.label('corrected_filing_colin_id')). \
+            outerjoin(businesses, businesses.c.id == Filing.business_id). \
+            outerjoin(ColinEventId, ColinEventId.filing_id == Filing.id). \
             filter(
-                Filing.colin_event_ids == None,  # pylint: disable=singleton-comparison # noqa: E711;
+                ColinEventId.colin_event_id == None,  # pylint: disable=singleton-comparison # noqa: E711;
                 Filing._status == Filing.Status.COMPLETED.value,
-                Filing.effective_date != None   # pylint: disable=singleton-comparison # noqa: E711;
-            ).order_by(Filing.filing_date).all()
-        return filings
+                Filing.effective_date != None  # pylint: disable=singleton-comparison # noqa: E711;
+            )
+        if after_filing_id:
+            after = db.session.query(Filing._filing_date).filter(Filing.id == after_filing_id).scalar()
+            if after:
+                query = query.filter(db.tuple_(Filing._filing_date, Filing.id) > db.tuple_(after, after_filing_id))
+        return query.order_by(Filing._filing_date, Filing.id).limit(limit).all()
+
+    @staticmethod
+    def get_future_effective_filings(effective_before: datetime = None) -> List[Tuple[int, datetime]]:
+        """Return the (id, effective date) of the paid filings effective before the date, soonest first.
+
+        The date defaults to now, for the filings that are due.
+        """
+        if effective_before is None:
+            effective_before = db.func.now()
+        return db.session.query(Filing.id, Filing.effective_date). \
+            filter(Filing._status == Filing.Status.PAID.value,
+                   Filing.effective_date <= effective_before). \
+            order_by(Filing.effective_date, Filing.id).all()
 
     @staticmethod
     def get_all_filings_by_status(status):
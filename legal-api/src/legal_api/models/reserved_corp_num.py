@@ -0,0 +1,88 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""This model manages the pool of corporation numbers reserved in COLIN.
+
+Corporation numbers are reserved from COLIN in blocks, and handed out one at a time to incorporations.
+A reserved number that has no used_date has been reserved in COLIN but not yet assigned to a business,
+which is what needs to be reconciled if the pool is ever abandoned.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import List
+
+from .db import db
+
+
+class ReservedCorpNum(db.Model):
+    """A corporation number reserved in COLIN for use by an incorporation."""
+
+    __tablename__ = 'reserved_corp_nums'
+
+    __table_args__ = (
+        # the numbers still to be handed out, see take_next
+        db.Index('ix_reserved_corp_nums_available', 'corp_type', 'identifier',
+                 postgresql_where=db.text('used_date IS NULL')),
+    )
+
+    identifier = db.Column('identifier', db.String(10), primary_key=True)
+    corp_type = db.Column('corp_type', db.String(10), nullable=False)
+    reserved_date = db.Column('reserved_date', db.DateTime(timezone=True), default=datetime.utcnow)
+    used_date = db.Column('used_date', db.DateTime(timezone=True), nullable=True)
+
+    @classmethod
+    def count_available(cls, corp_type: str) -> int:
+        """Return the number of reserved corporation numbers not yet used for the corp type."""
+        return cls.query.filter_by(corp_type=corp_type, used_date=None).count()
+
+    @classmethod
+    def find_unused(cls, corp_type: str = None) -> List[ReservedCorpNum]:
+        """Return the reserved corporation numbers that have not been used, for reconciliation with COLIN."""
+        query = cls.query.filter_by(used_date=None)
+        if corp_type:
+            query = query.filter_by(corp_type=corp_type)
+        return query.order_by(cls.identifier).all()
+
+    @classmethod
+    def take_next(cls, corp_type: str) -> ReservedCorpNum:
+        """Mark the lowest available corporation number as used, and return it.
+
+        The row is locked, skipping rows locked by other workers, and the change is committed with the session.
+        """
+        reserved = cls.query.filter_by(corp_type=corp_type, used_date=None) \
+            .order_by(cls.identifier) \
+            .with_for_update(skip_locked=True) \
+            .first()
+        if reserved:
+            reserved.used_date = datetime.utcnow()
+            db.session.add(reserved)
+        return reserved
+
+    @classmethod
+    def add_block(cls, corp_type: str, identifiers: List[str]):
+        """Add a block of newly reserved corporation numbers to the pool.
+
+        The numbers are already reserved in COLIN, so they are committed on their own connection
+        rather than with whatever unit of work the session is in the middle of.
+        """
+        if not identifiers:
+            return
+        reserved_date = datetime.utcnow()
+        with db.session.get_bind().connect() as connection:
+            with connection.begin():
+                connection.execute(
+                    cls.__table__.insert(),
+                    [{'identifier': identifier, 'corp_type': corp_type, 'reserved_date': reserved_date}
+                     for identifier in identifiers]
+                )
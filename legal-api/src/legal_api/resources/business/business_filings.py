@@ -735,29 +735,34 @@ class InternalFilings(Resource):
     @staticmethod
     @cors.crossdomain(origin='*')
     def get(status=None):
-        """Get filings by status formatted in json."""
+        """Get filings by status formatted in json.
+
+        Without a status, these are the completed filings still to be sent to colin. Passing a limit returns
+        a page of them with the cursor to pass for the next page, which is None after the last page.
+        """
         pending_filings = []
         filings = []
 
         if status is None:
-            pending_filings = Filing.get_completed_filings_for_colin()
-            for filing in pending_filings:
+            limit = request.args.get('limit', None, type=int)
+            pending_filings = Filing.get_completed_filings_for_colin(
+                limit=limit, after_filing_id=request.args.get('cursor', None, type=int))
+            for filing, legal_type, legal_name, corrected_filing_colin_id in pending_filings:
                 filing_json = filing.filing_json
-                business = Business.find_by_internal_id(filing.business_id)
                 if filing_json and filing.filing_type != 'lear_epoch' and \
-                        (filing.filing_type != 'correction' or business.legal_type != business.LegalTypes.COOP.value):
+                        (filing.filing_type != 'correction' or legal_type != Business.LegalTypes.COOP.value):
                     filing_json['filingId'] = filing.id
                     filing_json['filing']['header']['learEffectiveDate'] = filing.effective_date.isoformat()
                     if not filing_json['filing']['business'].get('legalName'):
-                        business = Business.find_by_internal_id(filing.business_id)
-                        filing_json['filing']['business']['legalName'] = business.legal_name
+                        filing_json['filing']['business']['legalName'] = legal_name
                     if filing.filing_type == 'correction':
-                        colin_ids = \
-                            ColinEventId.get_by_filing_id(filing_json['filing']['correction']['correctedFilingId'])
-                        if not colin_ids:
+                        if not corrected_filing_colin_id:
                             continue
-                        filing_json['filing']['correction']['correctedFilingColinId'] = colin_ids[0]  # should only be 1
+                        filing_json['filing']['correction']['correctedFilingColinId'] = corrected_filing_colin_id
                     filings.append(filing_json)
+            if limit:
+                cursor = pending_filings[-1][0].id if len(pending_filings) == limit else None
+                return jsonify({'filings': filings, 'cursor': cursor}), HTTPStatus.OK
             return jsonify(filings), HTTPStatus.OK
 
         pending_filings = Filing.get_all_filings_by_status(status)
@@ -784,15 +789,15 @@ class InternalFilings(Resource):
             filing = Filing.find_by_id(filing_id)
             if not filing:
                 return {'message': f'{filing_id} no filings found'}, HTTPStatus.NOT_FOUND
-            for colin_id in colin_ids:
-                try:
+            try:
+                for colin_id in colin_ids:
                     colin_event_id_obj = ColinEventId()
                     colin_event_id_obj.colin_event_id = colin_id
                     filing.colin_event_ids.append(colin_event_id_obj)
-                    filing.save()
-                except BusinessException as err:
-                    current_app.logger.Error(f'Error adding colin event id {colin_id} to filing with id {filing_id}')
-                    return None, None, {'message': err.error}, err.status_code
+                filing.save()
+            except BusinessException as err:
+                current_app.logger.Error(f'Error adding colin event ids {colin_ids} to filing with id {filing_id}')
+                return None, None, {'message': err.error}, err.status_code
 
             return jsonify(filing.json), HTTPStatus.ACCEPTED
         except Exception as err:
@@ -800,6 +805,94 @@ class InternalFilings(Resource):
             raise err
 
 
+@cors_preflight('PATCH')
+@API.route('/internal/filings/colin_ids', methods=['PATCH', 'OPTIONS'])
+class InternalColinIds(Resource):
+    """Internal endpoint for linking colin event ids to a batch of filings."""
+
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    @jwt.requires_auth
+    def patch():
+        """Add the colin event ids to each filing, in one transaction."""
+        if not jwt.validate_roles([COLIN_SVC_ROLE]):
+            return jsonify({'message': 'You are not authorized to update the colin id'}), HTTPStatus.UNAUTHORIZED
+
+        json_input = request.get_json()
+        if not json_input or not isinstance(json_input.get('colinIds'), dict):
+            return jsonify({'message': 'No colin ids in the body of the request.'}), HTTPStatus.BAD_REQUEST
+        try:
+            colin_ids = {int(filing_id): [int(colin_id) for colin_id in ids]
+                         for filing_id, ids in json_input['colinIds'].items()}
+        except (TypeError, ValueError):
+            return jsonify({'message': 'The colin ids must be lists of integers keyed by filing id.'}), \
+                HTTPStatus.BAD_REQUEST
+
+        filings = Filing.query.filter(Filing.id.in_(colin_ids.keys())).all()
+        if missing := set(colin_ids.keys()) - {filing.id for filing in filings}:
+            return jsonify({'message': f'{sorted(missing)} no filings found'}), HTTPStatus.NOT_FOUND
+
+        try:
+            for filing in filings:
+                for colin_id in colin_ids[filing.id]:
+                    colin_event_id_obj = ColinEventId()
+                    colin_event_id_obj.colin_event_id = colin_id
+                    filing.colin_event_ids.append(colin_event_id_obj)
+                filing.save_to_session()
+            db.session.commit()
+        except Exception as err:  # pylint: disable=broad-except; none of the colin ids are added
+            db.session.rollback()
+            current_app.logger.error(f'Error adding colin event ids {colin_ids}: {err}')
+            return jsonify({'message': 'Failed to add the colin event ids.'}), HTTPStatus.INTERNAL_SERVER_ERROR
+
+        return jsonify({'colinIds': {str(filing_id): ids for filing_id, ids in colin_ids.items()}}), HTTPStatus.ACCEPTED
+
+
+@cors_preflight('GET')
+@API.route('/internal/filings/future_effective', methods=['GET', 'OPTIONS'])
+class InternalFutureEffectiveFilings(Resource):
+    """Internal endpoint for the future effective filings job."""
+
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    def get():
+        """Return the paid filings whose effective date has been reached, or is before the until date if given."""
+        until = None
+        if request.args.get('until'):
+            try:
+                until = datetime.datetime.fromisoformat(request.args.get('until'))
+            except ValueError:
+                return jsonify({'message': 'until must be an ISO 8601 date time.'}), HTTPStatus.BAD_REQUEST
+        filings = Filing.get_future_effective_filings(until)
+        return jsonify({'filings': [{'filingId': filing_id, 'effectiveDate': effective_date.isoformat()}
+                                    for filing_id, effective_date in filings]}), HTTPStatus.OK
+
+
+@cors_preflight('POST')
+@API.route('/internal/filings/colin_events', methods=['POST', 'OPTIONS'])
+class ColinEventCheck(Resource):
+    """Endpoint for checking a batch of colin events against lear."""
+
+    @staticmethod
+    @cors.crossdomain(origin='*')
+    @jwt.requires_auth
+    def post():
+        """Return which of the events' corps are in lear, and which of the event ids are already recorded."""
+        if not jwt.validate_roles([COLIN_SVC_ROLE]):
+            return jsonify({'message': 'You are not authorized to check colin events'}), HTTPStatus.UNAUTHORIZED
+
+        json_input = request.get_json()
+        if not json_input or not isinstance(json_input.get('events'), list):
+            return jsonify({'message': 'No events in the body of the request.'}), HTTPStatus.BAD_REQUEST
+        try:
+            events = [(str(event['corpNum']), int(event['eventId'])) for event in json_input['events']]
+        except (KeyError, TypeError, ValueError):
+            return jsonify({'message': 'Each event needs a corpNum and an integer eventId.'}), HTTPStatus.BAD_REQUEST
+
+        identifiers, colin_ids = ColinEventId.check_events(events)
+        return jsonify({'identifiers': identifiers, 'colinIds': colin_ids}), HTTPStatus.OK
+
+
 @cors_preflight('GET, POST, PUT, PATCH, DELETE')
 @API.route('/internal/filings/colin_id', methods=['GET', 'OPTIONS'])
 @API.route('/internal/filings/colin_id/<int:colin_id>', methods=['GET', 'POST', 'OPTIONS'])
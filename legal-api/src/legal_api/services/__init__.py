@@ -19,6 +19,7 @@ from .document_meta import DocumentMetaService
 from .flags import Flags
 from .namex import NameXService
 from .queue import QueueService
+from .version_compaction import VersionCompactionService
 
 
 flags = Flags()  # pylint: disable=invalid-name; shared variables are lower case by Flask convention.
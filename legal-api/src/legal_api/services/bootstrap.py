@@ -17,6 +17,8 @@ import contextlib
 import json
 import secrets
 import string
+import threading
+import time
 from http import HTTPStatus
 from typing import Dict, Union
 
@@ -90,37 +92,77 @@ class RegistrationBootstrapService:
 class AccountService:
     """Wrapper to call Authentication Services.
 
-    @TODO Cache and refresh / retry token as needed to reduce calls.
+    The service account token is cached until shortly before it expires,
+    and the calls share one keep-alive session.
     """
 
     BEARER: str = 'Bearer '
     CONTENT_TYPE_JSON = {'Content-Type': 'application/json'}
+    # seconds before the token expires that it is refreshed, so it does not expire in flight
+    TOKEN_REFRESH_MARGIN = 30
 
     try:
         timeout = int(current_app.config.get('ACCOUNT_SVC_TIMEOUT', 20))
     except Exception:
         timeout = 20
 
+    _session: requests.Session = None
+    _session_lock = threading.Lock()
+    _tokens: Dict[tuple, tuple] = {}
+    _token_lock = threading.Lock()
+
+    @classmethod
+    def get_session(cls) -> requests.Session:
+        """Return the keep-alive session shared by the calls to the account services."""
+        if not cls._session:
+            with cls._session_lock:
+                if not cls._session:
+                    cls._session = requests.Session()
+        return cls._session
+
     @classmethod
     def get_bearer_token(cls):
-        """Get a valid Bearer token for the service to use."""
+        """Get a valid Bearer token for the service to use.
+
+        The token is reused until it is within TOKEN_REFRESH_MARGIN seconds of its expires_in.
+        """
         token_url = current_app.config.get('ACCOUNT_SVC_AUTH_URL')
         client_id = current_app.config.get('ACCOUNT_SVC_CLIENT_ID')
         client_secret = current_app.config.get('ACCOUNT_SVC_CLIENT_SECRET')
 
-        data = 'grant_type=client_credentials'
+        with cls._token_lock:
+            token, expires_at = cls._tokens.get((token_url, client_id), (None, 0))
+            if token and time.monotonic() < expires_at:
+                return token
+
+            data = 'grant_type=client_credentials'
 
-        # get service account token
-        res = requests.post(url=token_url,
-                            data=data,
-                            headers={'content-type': 'application/x-www-form-urlencoded'},
-                            auth=(client_id, client_secret),
-                            timeout=cls.timeout)
+            # get service account token
+            res = cls.get_session().post(url=token_url,
+                                         data=data,
+                                         headers={'content-type': 'application/x-www-form-urlencoded'},
+                                         auth=(client_id, client_secret),
+                                         timeout=cls.timeout)
 
-        try:
-            return res.json().get('access_token')
-        except Exception:
-            return None
+            try:
+                token_json = res.json()
+                token = token_json.get('access_token')
+            except Exception:
+                return None
+
+            try:
+                expires_in = int(token_json.get('expires_in', 0))
+            except (TypeError, ValueError):
+                expires_in = 0
+            if token and expires_in > cls.TOKEN_REFRESH_MARGIN:
+                cls._tokens[(token_url, client_id)] = (token, time.monotonic() + expires_in - cls.TOKEN_REFRESH_MARGIN)
+            return token
+
+    @classmethod
+    def clear_token_cache(cls):
+        """Forget the cached tokens, so the next call fetches a new one."""
+        with cls._token_lock:
+            cls._tokens.clear()
 
     @classmethod
     def create_affiliation(cls, account: int,
@@ -142,7 +184,7 @@ class AccountService:
                                   'corpTypeCode': corp_type_code,
                                   'name': business_name or business_registration
                                   })
-        entity_record = requests.post(
+        entity_record = cls.get_session().post(
             url=account_svc_entity_url,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
@@ -155,7 +197,7 @@ class AccountService:
             'businessIdentifier': business_registration,
             'passCode': ''
         })
-        affiliate = requests.post(
+        affiliate = cls.get_session().post(
             url=account_svc_affiliate_url,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
@@ -187,7 +229,7 @@ class AccountService:
             'corpTypeCode': corp_type_code,
             'name': business_name
         })
-        entity_record = requests.patch(
+        entity_record = cls.get_session().patch(
             url=account_svc_entity_url + '/' + business_registration,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
@@ -212,14 +254,14 @@ class AccountService:
         token = cls.get_bearer_token()
 
         # Delete an account:business affiliation
-        affiliate = requests.delete(
+        affiliate = cls.get_session().delete(
             url=account_svc_affiliate_url + '/' + business_registration,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
             timeout=cls.timeout
         )
         # Delete an entity record
-        entity_record = requests.delete(
+        entity_record = cls.get_session().delete(
             url=account_svc_entity_url + '/' + business_registration,
             headers={**cls.CONTENT_TYPE_JSON,
                      'Authorization': cls.BEARER + token},
@@ -0,0 +1,177 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This provides the maintenance tasks for the sqlalchemy-continuum version tables.
+
+The version tables are only ever appended to, so over time they are compacted by:
+- archiving version rows that were superseded before a horizon into the tables of the same name in the
+  archive schema, which the migrations create
+- collapsing update versions that did not change any column into the version before them
+- rebuilding the indexes of the version tables
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from flask import current_app
+from sqlalchemy import text
+from sqlalchemy.orm import configure_mappers
+from sqlalchemy_continuum import versioning_manager
+from sqlalchemy_continuum.operation import Operation
+
+from legal_api.models import db
+
+
+# the schema of the archive tables, created by the migrations so they are not seen by autogenerate
+ARCHIVE_SCHEMA = 'archive'
+
+# columns maintained by continuum rather than copied from the parent table
+VERSION_COLUMNS = ('transaction_id', 'end_transaction_id', 'operation_type')
+
+# a version row is archivable once the transaction that superseded it, or that deleted the record, is past the horizon
+ARCHIVABLE_WHERE = f"""
+    tx.id = COALESCE(v.end_transaction_id,
+                     CASE WHEN v.operation_type = {Operation.DELETE} THEN v.transaction_id END)
+    AND tx.issued_at < :horizon
+"""
+
+
+class VersionCompactionService:
+    """Provides the archive, collapse and reindex tasks for the version tables."""
+
+    @staticmethod
+    def get_version_tables() -> List:
+        """Return the version tables of all the versioned models."""
+        configure_mappers()
+        return sorted((version_cls.__table__ for version_cls in versioning_manager.version_class_map.values()),
+                      key=lambda table: table.name)
+
+    @staticmethod
+    def get_horizon(horizon_days: int = None) -> datetime:
+        """Return the point in time before which superseded version rows are archived."""
+        if horizon_days is None:
+            horizon_days = current_app.config.get('VERSION_ARCHIVE_HORIZON_DAYS')
+        return datetime.utcnow() - timedelta(days=int(horizon_days))
+
+    @staticmethod
+    def report(horizon: datetime) -> List[Dict]:
+        """Return the row counts, and an estimate of the space saved, for each version table without changing it."""
+        report = []
+        for table in VersionCompactionService.get_version_tables():
+            total_rows, table_bytes = db.session.execute(
+                text(f'SELECT count(*), pg_total_relation_size(\'{table.name}\') FROM {table.name}')
+            ).first()
+            archivable_rows = db.session.execute(
+                text(f'SELECT count(*) FROM {table.name} v, transaction tx WHERE {ARCHIVABLE_WHERE}'),
+                {'horizon': horizon}
+            ).scalar()
+            noop_rows = db.session.execute(
+                text(f'SELECT count(*) FROM ({VersionCompactionService._noop_versions_sql(table)}) noop')
+            ).scalar()
+            removable_rows = min(total_rows, archivable_rows + noop_rows)
+            report.append({
+                'table': table.name,
+                'totalRows': total_rows,
+                'archivableRows': archivable_rows,
+                'noopRows': noop_rows,
+                'tableBytes': table_bytes,
+                'estimatedBytesSaved': int(table_bytes * removable_rows / total_rows) if total_rows else 0
+            })
+        return report
+
+    @staticmethod
+    def archive(horizon: datetime) -> Dict[str, int]:
+        """Move the version rows superseded before the horizon into the archive tables.
+
+        A version table without an archive table is skipped, until a migration adds one for it.
+        """
+        archived = {}
+        for table in VersionCompactionService.get_version_tables():
+            archive_table = f'{ARCHIVE_SCHEMA}.{table.name}'
+            if not db.session.execute(text('SELECT to_regclass(:name)'), {'name': archive_table}).scalar():
+                current_app.logger.warning(f'No archive table for {table.name}, it was not archived.')
+                continue
+
+            columns = ', '.join(f'"{column.name}"' for column in table.columns)
+            rv = db.session.execute(
+                text(f"""
+                    WITH archived AS (
+                        DELETE FROM {table.name} v USING transaction tx
+                        WHERE {ARCHIVABLE_WHERE}
+                        RETURNING v.*
+                    )
+                    INSERT INTO {archive_table} ({columns}) SELECT {columns} FROM archived
+                """),
+                {'horizon': horizon}
+            )
+            archived[table.name] = rv.rowcount
+            db.session.commit()
+        return archived
+
+    @staticmethod
+    def collapse_noop_versions() -> Dict[str, int]:
+        """Remove the update versions that changed no columns, extending the validity of the version before them.
+
+        A run of consecutive no-op versions is collapsed one version per pass, so the previous version is
+        always a real change when its end transaction is moved forward.
+        """
+        collapsed = {}
+        for table in VersionCompactionService.get_version_tables():
+            collapsed[table.name] = 0
+            while True:
+                rv = db.session.execute(
+                    text(f"""
+                        WITH noop AS ({VersionCompactionService._noop_versions_sql(table)}),
+                        collapsible AS (
+                            SELECT * FROM noop
+                            WHERE NOT EXISTS (SELECT 1 FROM noop prev_noop
+                                              WHERE prev_noop.id = noop.id
+                                              AND prev_noop.transaction_id = noop.prev_transaction_id)
+                        ),
+                        extended AS (
+                            UPDATE {table.name} prev SET end_transaction_id = collapsible.end_transaction_id
+                            FROM collapsible
+                            WHERE prev.id = collapsible.id AND prev.transaction_id = collapsible.prev_transaction_id
+                        )
+                        DELETE FROM {table.name} v USING collapsible
+                        WHERE v.id = collapsible.id AND v.transaction_id = collapsible.transaction_id
+                    """)
+                )
+                db.session.commit()
+                if not rv.rowcount:
+                    break
+                collapsed[table.name] += rv.rowcount
+        return collapsed
+
+    @staticmethod
+    def rebuild_indexes() -> List[str]:
+        """Rebuild the indexes of the version tables."""
+        tables = []
+        for table in VersionCompactionService.get_version_tables():
+            db.session.execute(text(f'REINDEX TABLE {table.name}'))
+            db.session.commit()
+            tables.append(table.name)
+        return tables
+
+    @staticmethod
+    def _noop_versions_sql(table) -> str:
+        """Return the query for the update versions whose columns are the same as the version they superseded."""
+        unchanged = ' AND '.join(f'cur."{column.name}" IS NOT DISTINCT FROM prev."{column.name}"'
+                                 for column in table.columns if column.name not in VERSION_COLUMNS)
+        return f"""
+            SELECT cur.id, cur.transaction_id, cur.end_transaction_id, prev.transaction_id AS prev_transaction_id
+            FROM {table.name} cur
+            JOIN {table.name} prev ON prev.id = cur.id AND prev.end_transaction_id = cur.transaction_id
+            WHERE cur.operation_type = {Operation.UPDATE}
+            AND {unchanged}
+        """
@@ -17,6 +17,7 @@ from collections import MutableMapping, MutableSequence
 from typing import Dict, List
 
 from .pytest_marks import (
+    benchmark,
     integration_affiliation,
     integration_authorization,
     integration_colin,
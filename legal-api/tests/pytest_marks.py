@@ -55,5 +55,8 @@ integration_sentry = pytest.mark.skipif((os.getenv('SENTRY_DSN', False) is False
 integration_namerequests = pytest.mark.skipif((os.getenv('RUN_NAMEREQUESTS_TESTS', False) is False),
                                               reason='Name request tests are only run when requested.')
 
+benchmark = pytest.mark.skipif((os.getenv('RUN_BENCHMARKS', False) is False),
+                               reason='Benchmarks are only run when requested.')
+
 not_github_ci = pytest.mark.skipif((os.getenv('NOT_GITHUB_CI', False) is False),
                                    reason='Does not pass on github ci.')
@@ -279,6 +279,58 @@ def test_get_internal_filings(session, client, jwt):
     assert rv.json[0]['filingId'] == filing1.id
 
 
+def test_get_internal_filings_paged(session, client, jwt):
+    """Assert that the internal filings get endpoint returns a page of filings with the cursor for the next page."""
+    # setup
+    b = factory_business('CP7654321')
+    factory_business_mailing_address(b)
+    filing1 = factory_completed_filing(b, ANNUAL_REPORT, filing_date=datetime(2021, 5, 1))
+    filing2 = factory_completed_filing(b, ANNUAL_REPORT, filing_date=datetime(2021, 5, 2))
+
+    # test endpoint returns the first page, then the last page
+    rv = client.get('/api/v1/businesses/internal/filings?limit=1')
+    assert rv.status_code == HTTPStatus.OK
+    assert [filing['filingId'] for filing in rv.json['filings']] == [filing1.id]
+    assert rv.json['cursor'] == filing1.id
+
+    rv = client.get(f'/api/v1/businesses/internal/filings?limit=1&cursor={rv.json["cursor"]}')
+    assert rv.status_code == HTTPStatus.OK
+    assert [filing['filingId'] for filing in rv.json['filings']] == [filing2.id]
+    assert rv.json['cursor'] == filing2.id
+
+    rv = client.get(f'/api/v1/businesses/internal/filings?limit=1&cursor={rv.json["cursor"]}')
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.json == {'filings': [], 'cursor': None}
+
+
+def test_get_future_effective_filings(session, client, jwt):
+    """Assert that the future effective endpoint returns the paid filings that are due, or due before a date."""
+    from tests.unit.models import factory_pending_filing
+    # setup
+    b = factory_business('CP7654321')
+    due_filing = factory_pending_filing(b, ANNUAL_REPORT)
+    due_filing.effective_date = datetime.utcnow() - datedelta.DAY
+    due_filing.payment_completion_date = datetime.utcnow()
+    due_filing.save()
+    future_filing = factory_pending_filing(b, ANNUAL_REPORT)
+    future_filing.effective_date = datetime.utcnow() + datedelta.DAY
+    future_filing.payment_completion_date = datetime.utcnow()
+    future_filing.save()
+    assert future_filing.status == Filing.Status.PAID.value
+
+    rv = client.get('/api/v1/businesses/internal/filings/future_effective')
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.json == {'filings': [{'filingId': due_filing.id, 'effectiveDate': due_filing.effective_date.isoformat()}]}
+
+    until = (datetime.utcnow() + datedelta.datedelta(days=2)).isoformat()
+    rv = client.get('/api/v1/businesses/internal/filings/future_effective', query_string={'until': until})
+    assert rv.status_code == HTTPStatus.OK
+    assert [filing['filingId'] for filing in rv.json['filings']] == [due_filing.id, future_filing.id]
+
+    rv = client.get('/api/v1/businesses/internal/filings/future_effective?until=tomorrow')
+    assert rv.status_code == HTTPStatus.BAD_REQUEST
+
+
 @pytest.mark.parametrize('identifier, base_filing, corrected_filing, colin_id', [
         ('BC1234567', CORRECTION_INCORPORATION, INCORPORATION_FILING_TEMPLATE, 1234),
         ('BC1234568', CORRECTION_INCORPORATION, INCORPORATION_FILING_TEMPLATE, None),
@@ -328,6 +380,36 @@ def test_patch_internal_filings(session, client, jwt):
     assert colin_id in rv.json['filing']['header']['colinIds']
 
 
+def test_patch_internal_colin_ids(session, client, jwt):
+    """Assert that the bulk colin ids patch adds the colin event ids to every filing, or to none of them."""
+    from legal_api.models.colin_event_id import ColinEventId
+    # setup
+    b = factory_business('CP7654321')
+    factory_business_mailing_address(b)
+    filing = factory_completed_filing(b, ANNUAL_REPORT)
+    other_filing = factory_completed_filing(b, ANNUAL_REPORT)
+
+    # make request
+    rv = client.patch('/api/v1/businesses/internal/filings/colin_ids',
+                      json={'colinIds': {str(filing.id): [1234, 1235], str(other_filing.id): [1236]}},
+                      headers=create_header(jwt, [COLIN_SVC_ROLE])
+                      )
+
+    # test result
+    assert rv.status_code == HTTPStatus.ACCEPTED
+    assert rv.json == {'colinIds': {str(filing.id): [1234, 1235], str(other_filing.id): [1236]}}
+    assert sorted(ColinEventId.get_by_filing_id(filing.id)) == [1234, 1235]
+    assert ColinEventId.get_by_filing_id(other_filing.id) == [1236]
+
+    # a filing that does not exist fails the whole batch
+    rv = client.patch('/api/v1/businesses/internal/filings/colin_ids',
+                      json={'colinIds': {str(filing.id): [1237], '0': [1238]}},
+                      headers=create_header(jwt, [COLIN_SVC_ROLE])
+                      )
+    assert rv.status_code == HTTPStatus.NOT_FOUND
+    assert 1237 not in ColinEventId.get_by_filing_id(filing.id)
+
+
 def test_get_colin_id(session, client, jwt):
     """Assert the internal/filings/colin_id get endpoint returns properly."""
     from legal_api.models.colin_event_id import ColinEventId
@@ -349,6 +431,41 @@ def test_get_colin_id(session, client, jwt):
     assert rv.status_code == HTTPStatus.NOT_FOUND
 
 
+def test_check_colin_events(session, client, jwt):
+    """Assert the internal/filings/colin_events endpoint returns the corps in lear and the recorded event ids."""
+    from legal_api.models.colin_event_id import ColinEventId
+    # setup
+    identifier = 'CP7654321'
+    b = factory_business(identifier)
+    factory_business_mailing_address(b)
+    filing = factory_completed_filing(b, ANNUAL_REPORT)
+    colin_event_id = ColinEventId()
+    colin_event_id.colin_event_id = 1234
+    filing.colin_event_ids.append(colin_event_id)
+    filing.save()
+
+    events = [
+        {'corpNum': identifier, 'eventId': 1234},
+        {'corpNum': identifier, 'eventId': 1235},
+        {'corpNum': 'CP0000001', 'eventId': 1236}
+    ]
+    rv = client.post('/api/v1/businesses/internal/filings/colin_events',
+                     json={'events': events},
+                     headers=create_header(jwt, [COLIN_SVC_ROLE]))
+    assert rv.status_code == HTTPStatus.OK
+    assert rv.json == {'identifiers': [identifier], 'colinIds': [1234]}
+
+    rv = client.post('/api/v1/businesses/internal/filings/colin_events',
+                     json={'events': [{'corpNum': identifier}]},
+                     headers=create_header(jwt, [COLIN_SVC_ROLE]))
+    assert rv.status_code == HTTPStatus.BAD_REQUEST
+
+    rv = client.post('/api/v1/businesses/internal/filings/colin_events',
+                     json={'events': events},
+                     headers=create_header(jwt, [STAFF_ROLE]))
+    assert rv.status_code == HTTPStatus.UNAUTHORIZED
+
+
 def test_get_colin_last_update(session, client, jwt):
     """Assert the get endpoint for ColinLastUpdate returns last updated colin id."""
     from tests.unit.models import db
@@ -19,6 +19,7 @@ Test-Suite to ensure that the Business Model is working as expected.
 import copy
 import datetime
 import json
+import time
 from http import HTTPStatus
 
 import datedelta
@@ -35,12 +36,13 @@ from registry_schemas.example_data import (
     FILING_HEADER,
     SPECIAL_RESOLUTION,
 )
+from sqlalchemy import event, text
 from sqlalchemy.exc import DataError
 from sqlalchemy_continuum import versioning_manager
 
 from legal_api.exceptions import BusinessException
 from legal_api.models import Business, Filing, User
-from tests import EPOCH_DATETIME
+from tests import EPOCH_DATETIME, benchmark
 from tests.conftest import not_raises
 from tests.unit.models import (
     factory_business,
@@ -549,8 +551,11 @@ def test_get_internal_filings(session, client, jwt):
     filing.save()
     filings = Filing.get_completed_filings_for_colin()
     assert len(filings) == 1
-    assert filing.id == filings[0].json['filing']['header']['filingId']
-    assert filings[0].json['filing']['header']['colinIds'] == []
+    assert filing.id == filings[0].Filing.json['filing']['header']['filingId']
+    assert filings[0].Filing.json['filing']['header']['colinIds'] == []
+    assert filings[0].legal_type == b.legal_type
+    assert filings[0].legal_name == b.legal_name
+    assert filings[0].corrected_filing_colin_id is None
     # assert doesn't return non completed filings
     filing.transaction_id = None
     filing.save()
@@ -559,6 +564,123 @@ def test_get_internal_filings(session, client, jwt):
     assert len(filings) == 0
 
 
+def test_get_internal_filings_paged(session):
+    """Assert that the get_completed_filings_for_colin pages through the filings in filing date order."""
+    from legal_api.models import Filing
+    from tests.unit.models import factory_completed_filing
+    # setup
+    b = factory_business('CP7654321')
+    base_date = datetime.datetime(2021, 5, 1, 7, 7, 58, 272362, tzinfo=datetime.timezone.utc)
+    filings = [factory_completed_filing(b, ANNUAL_REPORT, filing_date=base_date + datetime.timedelta(days=days))
+               for days in (2, 0, 1)]
+    ordered_ids = [filings[1].id, filings[2].id, filings[0].id]
+
+    # test method
+    first_page = Filing.get_completed_filings_for_colin(limit=2)
+    assert [row.Filing.id for row in first_page] == ordered_ids[:2]
+    second_page = Filing.get_completed_filings_for_colin(limit=2, after_filing_id=first_page[-1].Filing.id)
+    assert [row.Filing.id for row in second_page] == ordered_ids[2:]
+
+
+def test_get_internal_filings_corrected_colin_id(session):
+    """Assert that the get_completed_filings_for_colin returns the colin id of the filing a correction corrects."""
+    from legal_api.models import Filing
+    from tests.unit.models import factory_completed_filing
+    # setup
+    b = factory_business('BC1234567', entity_type=Business.LegalTypes.BCOMP.value)
+    corrected_filing = factory_completed_filing(b, ANNUAL_REPORT, colin_id=1234)
+    correction = copy.deepcopy(CORRECTION_AR)
+    correction['filing']['correction']['correctedFilingId'] = corrected_filing.id
+    filing = factory_completed_filing(b, correction)
+
+    # test method
+    filings = Filing.get_completed_filings_for_colin()
+    assert len(filings) == 1
+    assert filings[0].Filing.id == filing.id
+    assert filings[0].legal_type == Business.LegalTypes.BCOMP.value
+    assert filings[0].corrected_filing_colin_id == 1234
+
+
+def test_get_future_effective_filings(session):
+    """Assert that only the paid filings whose effective date has been reached are returned, soonest first."""
+    from legal_api.models import Filing
+    from tests.unit.models import factory_pending_filing
+    # setup
+    b = factory_business('CP7654321')
+    now = datetime.datetime.now(datetime.timezone.utc)
+    day = datetime.timedelta(days=1)
+    filings = {}
+    for name, effective_date in (('due', now - day), ('due_first', now - 2 * day),
+                                 ('future', now + day), ('pending', now - day)):
+        filing = factory_pending_filing(b, ANNUAL_REPORT)
+        filing.effective_date = effective_date
+        if name != 'pending':
+            filing.payment_completion_date = now
+        filing.save()
+        filings[name] = filing
+    assert filings['due'].status == Filing.Status.PAID.value
+    assert filings['pending'].status == Filing.Status.PENDING.value
+
+    # test method
+    assert [filing_id for filing_id, _ in Filing.get_future_effective_filings()] == \
+        [filings['due_first'].id, filings['due'].id]
+    assert Filing.get_future_effective_filings(now + 2 * day) == \
+        [(filing.id, filing.effective_date) for filing in (filings['due_first'], filings['due'], filings['future'])]
+
+
+@benchmark
+def test_get_internal_filings_benchmark(session):
+    """Assert that a backlog of 50k filings is paged through with one query per page, logging the time taken."""
+    from legal_api.models import Filing, db
+    # setup: 5k businesses with 10 completed filings each, every tenth one a correction of the filing before it
+    session.execute(text("""
+        INSERT INTO businesses (identifier, legal_name, legal_type, founding_date)
+        SELECT 'BC' || lpad(n::text, 7, '0'), 'BENCHMARK ' || n, 'BEN', now()
+        FROM generate_series(1, 5000) n
+    """))
+    session.execute(text("""
+        INSERT INTO filings (business_id, filing_type, filing_json, status, filing_date, effective_date)
+        SELECT b.id,
+               CASE WHEN n = 10 THEN 'correction' ELSE 'annualReport' END,
+               jsonb_build_object('filing', jsonb_build_object(
+                   'header', jsonb_build_object('name', CASE WHEN n = 10 THEN 'correction' ELSE 'annualReport' END),
+                   'business', jsonb_build_object('identifier', b.identifier))),
+               'COMPLETED', now() - (n || ' minutes')::interval, now() - (n || ' minutes')::interval
+        FROM businesses b, generate_series(1, 10) n
+        WHERE b.legal_name LIKE 'BENCHMARK %'
+    """))
+    session.execute(text("""
+        UPDATE filings c SET filing_json = jsonb_set(c.filing_json, '{filing,correction}',
+                                                     jsonb_build_object('correctedFilingId', c.id - 1))
+        WHERE c.filing_type = 'correction'
+    """))
+    session.execute(text('ANALYZE filings'))
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    # test method
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        start = time.perf_counter()
+        pages = 0
+        rows = 0
+        after_filing_id = None
+        while page := Filing.get_completed_filings_for_colin(limit=500, after_filing_id=after_filing_id):
+            pages += 1
+            rows += len(page)
+            after_filing_id = page[-1].Filing.id
+        elapsed = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    current_app.logger.info(f'Paged through {rows} filings in {pages} pages in {elapsed:.2f}s.')
+    assert rows >= 50000
+    # the first page has no cursor to look up, and the last query is the empty page
+    assert len(statements) == 2 * (pages + 1) - 1
+
+
 def test_get_a_businesses_most_recent_filing_of_a_type(session):
     """Assert that the most recent completed filing of a specified type is returned."""
     from legal_api.models import Filing
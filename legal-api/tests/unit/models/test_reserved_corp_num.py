@@ -0,0 +1,42 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the ReservedCorpNum Class.
+
+Test-Suite to ensure that the ReservedCorpNum Class is working as expected.
+"""
+from legal_api.models import ReservedCorpNum
+
+
+def test_reserved_corp_num_pool(session):
+    """Assert that reserved corp nums are handed out in order and tracked until used."""
+    ReservedCorpNum.add_block('BC', ['BC0000011', 'BC0000010', 'BC0000012'])
+    ReservedCorpNum.add_block('CP', ['CP0000010'])
+
+    assert ReservedCorpNum.count_available('BC') == 3
+
+    reserved = ReservedCorpNum.take_next('BC')
+    session.commit()
+
+    assert reserved.identifier == 'BC0000010'
+    assert reserved.used_date
+    assert ReservedCorpNum.count_available('BC') == 2
+    assert [r.identifier for r in ReservedCorpNum.find_unused('BC')] == ['BC0000011', 'BC0000012']
+    assert len(ReservedCorpNum.find_unused()) == 3
+
+
+def test_reserved_corp_num_pool_empty(session):
+    """Assert that nothing is returned when the pool is empty."""
+    assert ReservedCorpNum.count_available('BC') == 0
+    assert not ReservedCorpNum.take_next('BC')
@@ -87,3 +87,28 @@ def test_account_affiliation_integration(account, app_ctx):
 
     # @TODO change this next sprint when affiliation service is updated.
     assert r == HTTPStatus.OK
+
+
+def test_bearer_token_cached_until_expiry(app, requests_mock, monkeypatch):
+    """Assert that the service account token is reused until it is about to expire."""
+    import time
+
+    with app.app_context():
+        monkeypatch.setitem(current_app.config, 'ACCOUNT_SVC_AUTH_URL', 'http://auth.test/token')
+        AccountService.clear_token_cache()
+        token_mock = requests_mock.post('http://auth.test/token', [
+            {'json': {'access_token': 'token1', 'expires_in': 300}},
+            {'json': {'access_token': 'token2', 'expires_in': 300}},
+        ])
+
+        assert AccountService.get_bearer_token() == 'token1'
+        assert AccountService.get_bearer_token() == 'token1'
+        assert token_mock.call_count == 1
+
+        # refreshed once inside the refresh margin of the expiry
+        now = time.monotonic()
+        monkeypatch.setattr(time, 'monotonic', lambda: now + 300 - AccountService.TOKEN_REFRESH_MARGIN)
+        assert AccountService.get_bearer_token() == 'token2'
+        assert token_mock.call_count == 2
+
+        AccountService.clear_token_cache()
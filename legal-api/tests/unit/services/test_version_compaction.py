@@ -0,0 +1,122 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests to assure the Version Compaction Service.
+
+Test-Suite to ensure that the version tables are archived and collapsed as expected.
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy_continuum import version_class
+
+from legal_api.models import ShareClass, db
+from legal_api.services import VersionCompactionService
+from tests.unit.models import factory_business
+
+
+def _create_share_class(identifier: str) -> ShareClass:
+    """Create a share class with a single insert version."""
+    business = factory_business(identifier)
+    share_class = ShareClass(name='class 1', priority=1, max_share_flag=False, par_value_flag=False,
+                             special_rights_flag=False)
+    business.share_classes.append(share_class)
+    business.save()
+    return share_class
+
+
+def _add_noop_version(share_class: ShareClass):
+    """Add an update version that is a copy of the current version of the share class."""
+    transaction_id = db.session.execute(
+        text('INSERT INTO transaction (issued_at) VALUES (:issued_at) RETURNING id'),
+        {'issued_at': datetime.utcnow()}
+    ).scalar()
+    db.session.execute(
+        text("""
+            INSERT INTO share_classes_version (id, name, priority, max_share_flag, max_shares, par_value_flag,
+                                               par_value, currency, special_rights_flag, business_id,
+                                               transaction_id, end_transaction_id, operation_type)
+            SELECT id, name, priority, max_share_flag, max_shares, par_value_flag,
+                   par_value, currency, special_rights_flag, business_id,
+                   :transaction_id, NULL, 1
+            FROM share_classes_version WHERE id = :id AND end_transaction_id IS NULL
+        """),
+        {'transaction_id': transaction_id, 'id': share_class.id}
+    )
+    db.session.execute(
+        text("""
+            UPDATE share_classes_version SET end_transaction_id = :transaction_id
+            WHERE id = :id AND end_transaction_id IS NULL AND transaction_id <> :transaction_id
+        """),
+        {'transaction_id': transaction_id, 'id': share_class.id}
+    )
+    db.session.commit()
+
+
+def _share_class_versions(share_class_id: int):
+    """Return the versions of the share class."""
+    share_class_version = version_class(ShareClass)
+    return db.session.query(share_class_version) \
+        .filter(share_class_version.id == share_class_id) \
+        .order_by(share_class_version.transaction_id).all()
+
+
+def test_report_is_read_only(session):
+    """Assert that the dry-run report counts the no-op versions without removing them."""
+    share_class = _create_share_class('BC1234567')
+    _add_noop_version(share_class)
+
+    report = {row['table']: row for row in VersionCompactionService.report(datetime.utcnow() - timedelta(days=1))}
+
+    assert report['share_classes_version']['noopRows'] >= 1
+    assert report['share_classes_version']['totalRows'] >= 2
+    assert len(_share_class_versions(share_class.id)) == 2
+
+
+def test_collapse_noop_versions(session):
+    """Assert that consecutive no-op versions are collapsed into the version before them."""
+    share_class = _create_share_class('BC1234567')
+    _add_noop_version(share_class)
+    _add_noop_version(share_class)
+    assert len(_share_class_versions(share_class.id)) == 3
+
+    collapsed = VersionCompactionService.collapse_noop_versions()
+
+    versions = _share_class_versions(share_class.id)
+    assert collapsed['share_classes_version'] >= 2
+    assert len(versions) == 1
+    assert versions[0].operation_type == 0
+    assert versions[0].end_transaction_id is None
+
+
+def test_archive_superseded_versions(session):
+    """Assert that only the versions superseded before the horizon are moved to the archive table."""
+    share_class = _create_share_class('BC1234567')
+    share_class.name = 'class 1 renamed'
+    share_class.save()
+    versions = _share_class_versions(share_class.id)
+    assert len(versions) == 2
+
+    VersionCompactionService.archive(datetime.utcnow() - timedelta(days=1))
+    assert len(_share_class_versions(share_class.id)) == 2
+
+    VersionCompactionService.archive(datetime.utcnow() + timedelta(days=1))
+    versions = _share_class_versions(share_class.id)
+    archived = db.session.execute(
+        text('SELECT name FROM archive.share_classes_version WHERE id = :id'), {'id': share_class.id}
+    ).fetchall()
+
+    assert len(versions) == 1
+    assert versions[0].name == 'class 1 renamed'
+    assert [row.name for row in archived] == ['class 1']
@@ -0,0 +1,125 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Re-drive the messages on a dead letter subject back to the subjects they failed on.
+
+The messages are read with a durable subscription and acked once they are published again,
+so each dead lettered message is only re-driven once.
+
+    python -m entity_queue_common.redrive --dead-letter-subject entity.filings.dead-letter [--limit 10] [--dry-run]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+
+from nats.aio.client import Client as NATS  # noqa N814; by convention the name is NATS
+from stan.aio.client import Client as STAN  # noqa N814; by convention the name is STAN
+
+from entity_queue_common.retry import RETRY_KEY  # noqa I001; sort issue due to comments on the NATS & STAN lines
+from entity_queue_common.service_utils import logger  # noqa I001; sort issue due to comments on the NATS & STAN lines
+
+
+async def redrive(sc: STAN,  # pylint: disable=too-many-arguments
+                  dead_letter_subject: str,
+                  durable_name: str = 'redrive',
+                  subject: str = None,
+                  limit: int = None,
+                  idle_timeout: float = 5.0,
+                  dry_run: bool = False) -> int:
+    """Publish the dead lettered messages to their subject, returning the number re-driven.
+
+    Stops after the limit, or when no message has been received for the idle_timeout in seconds.
+    The retry details are removed, so a re-driven message gets all of its attempts again.
+    """
+    loop = asyncio.get_running_loop()
+    redriven = 0
+    last_received = loop.time()
+    done = asyncio.Event()
+
+    async def cb_redrive(msg):
+        nonlocal redriven, last_received
+        last_received = loop.time()
+        if done.is_set():
+            return  # not acked, so it stays on the dead letter subject
+
+        payload = json.loads(msg.data.decode('utf-8'))
+        retry = payload.pop(RETRY_KEY, {})
+        if not (target_subject := subject or retry.get('subject')):
+            logger.error('Dead letter seq: %s has no subject to re-drive it to.', msg.sequence)
+            return
+
+        logger.info('Re-drive dead letter seq: %s to %s, after %s attempts, last error: %s',
+                    msg.sequence, target_subject, retry.get('attempt'), retry.get('error'))
+        if not dry_run:
+            await sc.publish(subject=target_subject, payload=json.dumps(payload).encode('utf-8'))
+            await sc.ack(msg)
+
+        redriven += 1
+        if limit and redriven >= limit:
+            done.set()
+
+    subscription = await sc.subscribe(subject=dead_letter_subject,
+                                      durable_name=durable_name,
+                                      deliver_all_available=True,
+                                      manual_acks=True,
+                                      cb=cb_redrive)
+    while not done.is_set() and loop.time() - last_received < idle_timeout:
+        await asyncio.sleep(0.1)
+    await subscription.close()
+
+    return redriven
+
+
+async def run(args) -> int:
+    """Connect to the queue and re-drive the dead lettered messages."""
+    nc = NATS()
+    sc = STAN()
+    await nc.connect(servers=args.servers.split(','), name='entity.queue.redrive')
+    await sc.connect(cluster_id=args.cluster_id, client_id=str(random.SystemRandom().getrandbits(0x58)), nats=nc)
+    try:
+        return await redrive(sc,
+                             args.dead_letter_subject,
+                             durable_name=args.durable_name,
+                             subject=args.subject,
+                             limit=args.limit,
+                             idle_timeout=args.idle_timeout,
+                             dry_run=args.dry_run)
+    finally:
+        await sc.close()
+        await nc.close()
+
+
+def main(argv=None):
+    """Parse the command line and run the re-drive."""
+    parser = argparse.ArgumentParser(description='Re-drive the messages on a dead letter subject.')
+    parser.add_argument('--dead-letter-subject', required=True, help='the dead letter subject to read from')
+    parser.add_argument('--subject', help='publish to this subject, instead of the subject each message failed on')
+    parser.add_argument('--durable-name', default='redrive', help='the durable subscription name')
+    parser.add_argument('--limit', type=int, help='the most messages to re-drive')
+    parser.add_argument('--idle-timeout', type=float, default=5.0,
+                        help='stop when no message is received for this many seconds')
+    parser.add_argument('--dry-run', action='store_true', help='log the messages without re-driving them')
+    parser.add_argument('--servers', default=os.getenv('NATS_SERVERS', 'nats://127.0.0.1:4222'))
+    parser.add_argument('--cluster-id', default=os.getenv('NATS_CLUSTER_ID', 'test-cluster'))
+    args = parser.parse_args(argv)
+
+    redriven = asyncio.run(run(args))
+    logger.info('Re-drove %s messages from %s.', redriven, args.dead_letter_subject)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
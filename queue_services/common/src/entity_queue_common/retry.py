@@ -0,0 +1,100 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the 'License');
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an 'AS IS' BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The delayed retry policy for messages whose handler failed with a retryable error.
+
+A copy of the retried message is published to the delay subject, with the time it is due after an exponential
+backoff with jitter, before the message is acked. The worker holds the copies on the delay subject unacked until
+they are due, then publishes them back to the subject they failed on, so a pending retry survives the worker
+stopping or crashing. The copy carries the retry details under the RETRY_KEY, so the attempts are counted across
+workers. Once the attempts are used up, the message is published to the dead letter subject.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple, Type
+
+from entity_queue_common.service_utils import EmailException, FilingException
+
+
+RETRY_KEY = 'queueRetry'
+
+
+class RetryPolicy:  # pylint: disable=too-few-public-methods
+    """The backoff and the number of attempts for a message whose handler failed."""
+
+    def __init__(self, *,
+                 max_attempts: int = 5,
+                 base_delay: float = 1.0,
+                 max_delay: float = 300.0,
+                 dead_letter_subject: Optional[str] = None,
+                 delay_subject: Optional[str] = None,
+                 poll_interval: int = 5,
+                 retry_on: Tuple[Type[Exception], ...] = (FilingException, EmailException)):
+        """Initialize the policy.
+
+        The dead letter subject defaults to <subject>.dead-letter, and the delay subject to <subject>.delayed,
+        for the subject the worker listens to. A retry that is not due yet is redelivered from the delay subject
+        every poll_interval seconds, so it is published back up to that long after it is due.
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.dead_letter_subject = dead_letter_subject
+        self.delay_subject = delay_subject
+        self.poll_interval = poll_interval
+        self.retry_on = retry_on
+
+    def get_delay(self, attempt: int) -> float:
+        """Return the seconds to wait before the attempt, doubling for each attempt with up to half of it as jitter."""
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return delay / 2 + random.uniform(0, delay / 2)  # noqa: S311; jitter, not security sensitive
+
+    @staticmethod
+    def from_config(config) -> Optional['RetryPolicy']:
+        """Return the policy set by RETRY_MAX_ATTEMPTS in the service config, or None when it is not set."""
+        if not getattr(config, 'RETRY_MAX_ATTEMPTS', None):
+            return None
+        return RetryPolicy(max_attempts=int(config.RETRY_MAX_ATTEMPTS),
+                           base_delay=float(getattr(config, 'RETRY_BASE_DELAY', 1.0)),
+                           max_delay=float(getattr(config, 'RETRY_MAX_DELAY', 300.0)),
+                           dead_letter_subject=getattr(config, 'DEAD_LETTER_SUBJECT', None),
+                           delay_subject=getattr(config, 'RETRY_DELAY_SUBJECT', None),
+                           poll_interval=int(getattr(config, 'RETRY_POLL_INTERVAL', 5)))
+
+
+def add_failure(payload: dict, subject: str, err: Exception) -> dict:
+    """Return a copy of the payload with the failed attempt added to its retry details."""
+    now = datetime.now(timezone.utc).isoformat()
+    retry = payload.get(RETRY_KEY, {})
+    return {
+        **payload,
+        RETRY_KEY: {
+            'attempt': retry.get('attempt', 0) + 1,
+            'subject': retry.get('subject', subject),
+            'firstFailedAt': retry.get('firstFailedAt', now),
+            'lastFailedAt': now,
+            'error': f'{type(err).__name__}: {err}'
+        }
+    }
+
+
+def set_not_before(payload: dict, delay: float) -> dict:
+    """Return a copy of the payload with its retry due the delay in seconds from now."""
+    not_before = datetime.now(timezone.utc) + timedelta(seconds=delay)
+    return {**payload, RETRY_KEY: {**payload.get(RETRY_KEY, {}), 'notBefore': not_before.isoformat()}}
+
+
+def is_due(payload: dict) -> bool:
+    """Return True when the retry of the payload is due, or it has no due time."""
+    not_before = payload.get(RETRY_KEY, {}).get('notBefore')
+    return not not_before or datetime.fromisoformat(not_before) <= datetime.now(timezone.utc)
@@ -19,13 +19,14 @@ import asyncio
 import functools
 import json
 import signal
-from typing import Dict
+from typing import Dict, List, Optional, Set
 
 
 from nats.aio.client import Client as NATS  # noqa N814; by convention the name is NATS
 from stan.aio.client import Client as STAN  # noqa N814; by convention the name is STAN
 
 from entity_queue_common.probes import Probes  # noqa I001; sort issue due to comments on the NATS & STAN lines
+from entity_queue_common.retry import RETRY_KEY, RetryPolicy, add_failure, is_due, set_not_before  # noqa I001; sort issue due to comments on the NATS & STAN lines
 from entity_queue_common.service_utils import error_cb, logger, signal_handler  # noqa I001; sort issue due to comments on the NATS & STAN lines
 from entity_queue_common.version import __version__  # noqa I001; sort issue due to comments on the NATS & STAN lines
 
@@ -43,9 +44,20 @@ class ServiceWorker:
                  subscription_options=None,
                  config=None,
                  name=None,
-                 version=None
+                 version=None,
+                 max_inflight=1,
+                 drain_timeout=30,
+                 retry_policy: Optional[RetryPolicy] = None
                  ):
-        """Initialize the service to a working state."""
+        """Initialize the service to a working state.
+
+        With max_inflight above 1, up to that many messages are handled at the same time,
+        and each message is acked when its handler completes without raising an error.
+
+        With a retry_policy, a message whose handler raises one of the policy's errors is published to the
+        delay subject, to be published again after a backoff, or to the dead letter subject once its attempts
+        are used up. The message is only acked once that publish has succeeded.
+        """
         self.sc = None
         self.nc = None
         self._start_seq = 0
@@ -57,6 +69,13 @@ class ServiceWorker:
         self.config = config
         self._name = name
         self._version = version
+        self.max_inflight = max_inflight or 1
+        self.drain_timeout = drain_timeout
+        self._inflight = None
+        self._inflight_tasks: Set[asyncio.Task] = set()
+        self._draining = False
+        self.retry_policy = retry_policy
+        self.subject = None
 
         async def conn_lost_cb(error):
             logger.info('Connection lost:%s', error)
@@ -145,20 +164,150 @@ class ServiceWorker:
 
         subscription_options = {
             **self.config.SUBSCRIPTION_OPTIONS,
-            **{'cb': self.cb_handler},
+            **{'cb': self._call_handler if self.retry_policy and self.cb_handler else self.cb_handler},
             **self.subscription_options
         }
+        self.subject = subscription_options.get('subject')
+        if self.max_inflight > 1 and self.cb_handler:
+            # the server holds back messages beyond max_inflight until the earlier ones are acked
+            subscription_options = {
+                **subscription_options,
+                **{'cb': self._dispatch,
+                   'manual_acks': True,
+                   'max_inflight': self.max_inflight}
+            }
 
         await self.nc.connect(**nats_connection_options)
         await self.sc.connect(**stan_connection_options)
         await self.sc.subscribe(**subscription_options)
+        if self.retry_policy and self.cb_handler:
+            await self._subscribe_delayed(subscription_options)
+
+        logger.info('Subscribe the callback: %s to the queue: %s, max inflight: %s.',
+                    self.cb_handler.__name__ if self.cb_handler else 'no_call_back',
+                    subscription_options.get('queue'),
+                    self.max_inflight)
+
+    @property
+    def delay_subject(self) -> Optional[str]:
+        """Return the subject the retries wait on until they are due."""
+        if not self.retry_policy:
+            return None
+        return self.retry_policy.delay_subject or f'{self.subject}.delayed'
+
+    async def _subscribe_delayed(self, subscription_options: dict):
+        """Subscribe to the delay subject, in the same queue group as the subject.
 
-        logger.info('Subscribe the callback: %s to the queue: %s.',
-                    subscription_options.get('cb').__name__ if subscription_options.get('cb') else 'no_call_back',
-                    subscription_options.get('queue'))
+        A retry is left unacked until it is due, so the server keeps it, and redelivers it every poll interval.
+        """
+        delayed_options = {
+            'subject': self.delay_subject,
+            'queue': subscription_options.get('queue'),
+            'cb': self._release_delayed,
+            'manual_acks': True,
+            'ack_wait': self.retry_policy.poll_interval,
+            'max_inflight': 1000
+        }
+        if durable_name := subscription_options.get('durable_name'):
+            delayed_options['durable_name'] = f'{durable_name}_delayed'
+        await self.sc.subscribe(**delayed_options)
+
+    async def _release_delayed(self, msg):
+        """Publish the retry back to the subject it failed on once it is due, acking it only after the publish."""
+        if self._draining:
+            return
+        try:
+            payload = json.loads(msg.data.decode('utf-8'))
+        except ValueError:
+            logger.error('Dropped delayed message seq: %s, it is not JSON.', msg.sequence)
+            await self.sc.ack(msg)
+            return
+        if not is_due(payload):
+            return
+
+        try:
+            await self.publish(payload.get(RETRY_KEY, {}).get('subject', self.subject), payload)
+            await self.sc.ack(msg)
+        except Exception as err:  # pylint: disable=broad-except; not acked, so the retry is redelivered
+            logger.error('Failed to publish the retry of delayed message seq: %s, %s', msg.sequence, err,
+                         exc_info=True)
+
+    async def _dispatch(self, msg):
+        """Start handling the message, waiting while max_inflight messages are already being handled."""
+        if self._draining:
+            # not acked, so it is redelivered once the service has stopped
+            logger.debug('Draining, message seq: %s left for redelivery.', msg.sequence)
+            return
+
+        if not self._inflight:
+            self._inflight = asyncio.Semaphore(self.max_inflight)
+        await self._inflight.acquire()
+        task = asyncio.ensure_future(self._handle(msg))
+        self._inflight_tasks.add(task)
+        task.add_done_callback(self._inflight_tasks.discard)
+
+    async def _handle(self, msg):
+        """Handle the message, acking it only when the handler succeeds."""
+        try:
+            await self._call_handler(msg)
+            await self.sc.ack(msg)
+        except Exception as err:  # pylint: disable=broad-except; not acked, so the message is redelivered
+            logger.error('Error handling message seq: %s, %s', msg.sequence, err, exc_info=True)
+        finally:
+            self._inflight.release()
+
+    async def _call_handler(self, msg):
+        """Call the handler, retrying the message later when the handler fails with a retryable error."""
+        if not self.retry_policy:
+            await self.cb_handler(msg)
+            return
+
+        try:
+            await self.cb_handler(msg)
+        except self.retry_policy.retry_on as err:
+            if not await self._retry_later(msg, err):
+                raise
+
+    async def _retry_later(self, msg, err: Exception) -> bool:
+        """Publish the message to the delay subject, or dead letter it when its attempts are used up.
+
+        Returns False when the message is not a JSON object, as the retry details cannot be added to it.
+        An error publishing is raised, so the message is not acked and is redelivered.
+        """
+        try:
+            payload = json.loads(msg.data.decode('utf-8'))
+        except ValueError:
+            return False
+        if not isinstance(payload, dict):
+            return False
+
+        payload = add_failure(payload, self.subject, err)
+        attempt = payload[RETRY_KEY]['attempt']
+        subject = payload[RETRY_KEY]['subject']
+        if attempt >= self.retry_policy.max_attempts:
+            dead_letter_subject = self.retry_policy.dead_letter_subject or f'{subject}.dead-letter'
+            logger.error('Message seq: %s failed %s times, moved to %s: %s',
+                         msg.sequence, attempt, dead_letter_subject, err)
+            await self.publish(dead_letter_subject, payload)
+            return True
+
+        delay = self.retry_policy.get_delay(attempt)
+        logger.info('Message seq: %s failed attempt %s, retrying in %.1fs: %s', msg.sequence, attempt, delay, err)
+        await self.publish(self.delay_subject, set_not_before(payload, delay))
+        return True
+
+    async def drain(self):
+        """Stop taking new messages, and wait up to the drain_timeout for the inflight messages to be handled."""
+        self._draining = True
+        if self._inflight_tasks:
+            logger.info('Draining %s inflight messages.', len(self._inflight_tasks))
+            _, pending = await asyncio.wait(self._inflight_tasks, timeout=self.drain_timeout)
+            if pending:
+                logger.error('%s inflight messages were not handled before the drain timeout.', len(pending))
 
     async def close(self):
-        """Close the stream and nats connections."""
+        """Drain the inflight messages, then close the stream and nats connections."""
+        await self.drain()
         try:
             await self.sc.close()
             await self.nc.close()
@@ -170,6 +319,19 @@ class ServiceWorker:
         await self.sc.publish(subject=subject,
                               payload=json.dumps(msg).encode('utf-8'))
 
+    async def publish_batch(self, subject: str, msgs: List[Dict]) -> List[Dict]:
+        """Publish the msgs to the subject at the same time, returning the msgs that failed to publish.
+
+        The publishes share the streaming NATS connection, so the waits for their acks overlap.
+        """
+        results = await asyncio.gather(*(self.publish(subject, msg) for msg in msgs), return_exceptions=True)
+        failed = []
+        for msg, result in zip(msgs, results):
+            if isinstance(result, Exception):
+                logger.error('Failed to publish %s to %s: %s', msg, subject, result)
+                failed.append(msg)
+        return failed
+
 
 class QueueServiceManager:
     """Manages the running of the Queue Client and Probes."""
@@ -192,7 +354,12 @@ class QueueServiceManager:
 
         This runs the main top level service functions for working with the Queue.
         """
-        self.service = ServiceWorker(loop=loop, cb_handler=callback, config=config)
+        self.service = ServiceWorker(loop=loop,
+                                     cb_handler=callback,
+                                     config=config,
+                                     max_inflight=getattr(config, 'MAX_INFLIGHT', 1),
+                                     drain_timeout=getattr(config, 'DRAIN_TIMEOUT', 30),
+                                     retry_policy=RetryPolicy.from_config(config))
         self.probe = Probes(components=[self.service], loop=loop)
 
         try:
@@ -0,0 +1,55 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Test Suite to ensure the delayed retry policy is working as expected."""
+import pytest
+
+from entity_queue_common.retry import RETRY_KEY, RetryPolicy, add_failure, is_due, set_not_before
+from entity_queue_common.service_utils import FilingException
+
+
+@pytest.mark.parametrize('attempt, expected_max', [
+    (1, 1.0),
+    (2, 2.0),
+    (5, 16.0),
+    (20, 60.0),
+])
+def test_get_delay(attempt, expected_max):
+    """Assert that the delay doubles for each attempt, up to the max delay, with up to half of it as jitter."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=60.0)
+    for _ in range(20):
+        assert expected_max / 2 <= policy.get_delay(attempt) <= expected_max
+
+
+def test_add_failure():
+    """Assert that the attempts are counted, keeping the first failure and the subject of the first attempt."""
+    payload = add_failure({'filing': {'id': 1}}, 'entity.filings', FilingException('not found'))
+    assert payload['filing'] == {'id': 1}
+    assert payload[RETRY_KEY]['attempt'] == 1
+    assert payload[RETRY_KEY]['subject'] == 'entity.filings'
+    assert payload[RETRY_KEY]['error'] == 'FilingException: not found'
+
+    retried = add_failure(payload, 'other.subject', FilingException('still not found'))
+    assert retried[RETRY_KEY]['attempt'] == 2
+    assert retried[RETRY_KEY]['subject'] == 'entity.filings'
+    assert retried[RETRY_KEY]['firstFailedAt'] == payload[RETRY_KEY]['firstFailedAt']
+    assert retried[RETRY_KEY]['error'] == 'FilingException: still not found'
+
+
+def test_not_before():
+    """Assert that a retry is due once its delay has passed, and a message that was never delayed is due."""
+    payload = add_failure({'filing': {'id': 1}}, 'entity.filings', FilingException('not found'))
+    assert is_due(payload)
+    assert not is_due(set_not_before(payload, 60))
+    assert is_due(set_not_before(payload, -1))
+    assert set_not_before(payload, 60)[RETRY_KEY]['attempt'] == 1
@@ -12,9 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Test Suite to ensure the ServiceWorker wrapper is working as expected."""
+import asyncio
+import json
+
 import pytest
 
+from entity_queue_common.retry import RETRY_KEY, RetryPolicy, add_failure, set_not_before
 from entity_queue_common.service import ServiceWorker
+from entity_queue_common.service_utils import FilingException
 from tests import config
 
 
@@ -84,3 +89,176 @@ async def test_service_connect(stan_server, event_loop):
 
     # teardown
     await service.close()
+
+
+@pytest.mark.asyncio
+async def test_inflight_messages(event_loop):
+    """Assert that up to max_inflight messages are handled at once, and only the handled messages are acked."""
+    handling = []
+    max_handling = 0
+
+    class Msg():
+        def __init__(self, sequence):
+            self.sequence = sequence
+
+    class SC():
+        def __init__(self):
+            self.acked = []
+
+        async def ack(self, msg):
+            self.acked.append(msg.sequence)
+
+    async def cb_handler(msg):
+        nonlocal max_handling
+        handling.append(msg.sequence)
+        max_handling = max(max_handling, len(handling))
+        await asyncio.sleep(0.05)
+        handling.remove(msg.sequence)
+        if msg.sequence == 3:
+            raise Exception('handler failed')
+
+    service = ServiceWorker(loop=event_loop, cb_handler=cb_handler, config=config.get_named_config(),
+                            max_inflight=2)
+    service.sc = SC()
+
+    for sequence in range(1, 6):
+        await service._dispatch(Msg(sequence))  # pylint: disable=protected-access
+    await service.drain()
+
+    assert max_handling == 2
+    assert sorted(service.sc.acked) == [1, 2, 4, 5]
+
+    # messages received while draining are left for redelivery
+    await service._dispatch(Msg(6))  # pylint: disable=protected-access
+    await asyncio.sleep(0.1)
+    assert 6 not in service.sc.acked
+
+
+class RetryMsg():
+    """A message with a JSON payload."""
+
+    def __init__(self, sequence, payload):
+        """Initialize with the payload as the message data."""
+        self.sequence = sequence
+        self.data = json.dumps(payload).encode('utf-8')
+
+
+class RetrySC():
+    """A stream connection that records the messages published and acked."""
+
+    def __init__(self, fail_publish=False):
+        """Initialize with nothing published or acked."""
+        self.fail_publish = fail_publish
+        self.published = []
+        self.acked = []
+
+    async def publish(self, subject, payload):
+        """Record the published message, or fail."""
+        if self.fail_publish:
+            raise Exception('publish failed')
+        self.published.append((subject, json.loads(payload.decode('utf-8'))))
+
+    async def ack(self, msg):
+        """Record the acked message."""
+        self.acked.append(msg.sequence)
+
+
+@pytest.mark.asyncio
+async def test_retry_then_dead_letter(event_loop):
+    """Assert that a failed message is published to the delay subject, then dead lettered."""
+    async def cb_handler(msg):
+        raise FilingException('filing not found')
+
+    service = ServiceWorker(loop=event_loop, cb_handler=cb_handler, config=config.get_named_config(),
+                            retry_policy=RetryPolicy(max_attempts=3, base_delay=0.01))
+    service.subject = 'entity.filings'
+    service.sc = RetrySC()
+
+    payload = {'filing': {'id': 1}}
+    for sequence in range(1, 4):
+        # the handler error is absorbed once the retry is published, so the message is acked
+        await service._call_handler(RetryMsg(sequence, payload))  # pylint: disable=protected-access
+        if sequence < 3:
+            subject, payload = service.sc.published[-1]
+            assert subject == 'entity.filings.delayed'
+            assert payload[RETRY_KEY]['attempt'] == sequence
+            assert payload[RETRY_KEY]['notBefore']
+
+    subject, payload = service.sc.published[-1]
+    assert subject == 'entity.filings.dead-letter'
+    assert payload['filing'] == {'id': 1}
+    assert payload[RETRY_KEY]['attempt'] == 3
+    assert payload[RETRY_KEY]['error'] == 'FilingException: filing not found'
+
+
+@pytest.mark.asyncio
+async def test_retry_publish_failure_not_acked(event_loop):
+    """Assert that a message whose retry can't be published raises, so it is not acked and is redelivered."""
+    async def cb_handler(msg):
+        raise FilingException('filing not found')
+
+    service = ServiceWorker(loop=event_loop, cb_handler=cb_handler, config=config.get_named_config(),
+                            retry_policy=RetryPolicy())
+    service.subject = 'entity.filings'
+    service.sc = RetrySC(fail_publish=True)
+
+    with pytest.raises(Exception, match='publish failed'):
+        await service._call_handler(RetryMsg(1, {'filing': {'id': 1}}))  # pylint: disable=protected-access
+
+
+@pytest.mark.asyncio
+async def test_release_delayed(event_loop):
+    """Assert that a delayed retry is published back to its subject once it is due, and only then acked."""
+    service = ServiceWorker(loop=event_loop, cb_handler=None, config=config.get_named_config(),
+                            retry_policy=RetryPolicy())
+    service.subject = 'entity.filings'
+    service.sc = RetrySC()
+
+    payload = add_failure({'filing': {'id': 1}}, 'entity.filings', FilingException('filing not found'))
+    await service._release_delayed(RetryMsg(1, set_not_before(payload, 60)))  # pylint: disable=protected-access
+    assert not service.sc.published
+    assert not service.sc.acked
+
+    await service._release_delayed(RetryMsg(2, set_not_before(payload, 0)))  # pylint: disable=protected-access
+    subject, released = service.sc.published[-1]
+    assert subject == 'entity.filings'
+    assert released['filing'] == {'id': 1}
+    assert service.sc.acked == [2]
+
+    # a retry that can't be published is left unacked, to be redelivered
+    service.sc.fail_publish = True
+    await service._release_delayed(RetryMsg(3, set_not_before(payload, 0)))  # pylint: disable=protected-access
+    assert service.sc.acked == [2]
+
+
+@pytest.mark.asyncio
+async def test_publish_batch(event_loop):
+    """Assert that a batch of messages is published at once, returning the messages that failed."""
+    publishing = 0
+    max_publishing = 0
+
+    class SC():
+        def __init__(self):
+            self.published = []
+
+        async def publish(self, subject, payload):
+            nonlocal publishing, max_publishing
+            publishing += 1
+            max_publishing = max(max_publishing, publishing)
+            await asyncio.sleep(0.05)
+            publishing -= 1
+            msg = json.loads(payload.decode('utf-8'))
+            if msg['filing']['id'] == 2:
+                raise Exception('publish failed')
+            self.published.append((subject, msg))
+
+    service = ServiceWorker(loop=event_loop, config=config.get_named_config())
+    service.sc = SC()
+
+    msgs = [{'filing': {'id': filing_id}} for filing_id in range(1, 4)]
+    failed = await service.publish_batch('entity.filing.filer', msgs)
+
+    assert max_publishing == 3
+    assert failed == [{'filing': {'id': 2}}]
+    assert service.sc.published == [('entity.filing.filer', {'filing': {'id': 1}}),
+                                    ('entity.filing.filer', {'filing': {'id': 3}})]
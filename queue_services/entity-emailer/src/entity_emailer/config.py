@@ -75,6 +75,11 @@ class _Config():  # pylint: disable=too-few-public-methods
     # variables
     LEGISLATIVE_TIMEZONE = os.getenv('LEGISLATIVE_TIMEZONE', 'America/Vancouver')
     TEMPLATE_PATH = os.getenv('TEMPLATE_PATH', None)
+    # when set, the compiled email templates are also cached in this directory across restarts
+    TEMPLATE_BYTECODE_CACHE_DIR = os.getenv('TEMPLATE_BYTECODE_CACHE_DIR', None)
+    # report documents for an email are fetched concurrently, each with its own timeout in seconds
+    DOCUMENT_FETCH_TIMEOUT = float(os.getenv('DOCUMENT_FETCH_TIMEOUT', '60'))
+    DOCUMENT_FETCH_WORKERS = int(os.getenv('DOCUMENT_FETCH_WORKERS', '4'))
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
@@ -114,6 +119,17 @@ class _Config():  # pylint: disable=too-few-public-methods
         'queue': os.getenv('NATS_QUEUE', 'error'),
         'durable_name': os.getenv('NATS_QUEUE', 'error') + '_durable',
     }
+    # the number of email messages handled at the same time, and how long to wait for them when stopping
+    MAX_INFLIGHT = int(os.getenv('MAX_INFLIGHT', '5'))
+    DRAIN_TIMEOUT = int(os.getenv('DRAIN_TIMEOUT', '30'))
+    # failed messages are retried with an exponential backoff, then moved to the dead letter subject
+    RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '5'))
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '2'))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '300'))
+    DEAD_LETTER_SUBJECT = os.getenv('NATS_DEAD_LETTER_SUBJECT', None)
+    # retries wait on the delay subject until they are due, checked every poll interval in seconds
+    RETRY_DELAY_SUBJECT = os.getenv('NATS_RETRY_DELAY_SUBJECT', None)
+    RETRY_POLL_INTERVAL = int(os.getenv('RETRY_POLL_INTERVAL', '5'))
 
     ENTITY_EVENT_PUBLISH_OPTIONS = {
         'subject': os.getenv('NATS_ENTITY_EVENT_SUBJECT', 'entity.events'),
@@ -17,32 +17,152 @@ Processors hold the business logic for how an email is interpreted and sent.
 """
 from __future__ import annotations
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
 from legal_api.models import Filing
 from legal_api.utils.legislation_datetime import LegislationDatetime
+from requests.adapters import HTTPAdapter
 
 
-def get_filing_info(filing_id: str) -> (Filing, dict, dict, str, str):
-    """Get filing info for the email."""
-    filing = Filing.find_by_id(filing_id)
-    business = (filing.json)['filing']['business']
+TEMPLATE_PARTS = [
+    'business-dashboard-link',
+    'business-dashboard-link-alt',
+    'business-info',
+    'cra-notice',
+    'footer',
+    'header',
+    'initiative-notice',
+    'logo',
+    'pdf-notice',
+    'style',
+    'whitespace-16px',
+    'whitespace-24px'
+]
+
+# render count and total render seconds for each template, including loading and compiling it when not cached
+TEMPLATE_RENDER_METRICS: Dict[str, dict] = {}
+
+_template_environments: Dict[str, Environment] = {}  # pylint: disable=invalid-name; one per template path
+
+# guards the metrics and the environments, which are updated from the executor threads
+_template_lock = threading.Lock()  # pylint: disable=invalid-name
+
+
+_document_session = None  # pylint: disable=invalid-name; shared keep-alive session for the document fetches
+
+
+def get_document_session() -> requests.Session:
+    """Return the keep-alive session shared by the document fetches."""
+    global _document_session  # pylint: disable=global-statement,invalid-name
+    if not _document_session:
+        pool_size = current_app.config.get('DOCUMENT_FETCH_WORKERS', 4)
+        _document_session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        _document_session.mount('http://', adapter)
+        _document_session.mount('https://', adapter)
+    return _document_session
+
+
+def fetch_documents(documents: List[dict], headers: dict) -> List[Optional[requests.Response]]:
+    """Fetch the documents concurrently, returning the responses in the same order as the documents.
+
+    Each document is a dict with the 'method' and 'url', and optionally the 'json' body, of its request.
+    A document that times out or fails to connect has None in place of its response,
+    so one slow or failing report does not hold back or lose the others.
+    """
+    if not documents:
+        return []
+
+    session = get_document_session()
+    timeout = current_app.config.get('DOCUMENT_FETCH_TIMEOUT')
+
+    def fetch(document: dict) -> Optional[requests.Response]:
+        try:
+            return session.request(document['method'], document['url'], json=document.get('json'),
+                                   headers=headers, timeout=timeout)
+        except requests.exceptions.RequestException as err:
+            logger.error('Failed to fetch document %s: %s', document['url'], err)
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(len(documents),
+                                            current_app.config.get('DOCUMENT_FETCH_WORKERS', 4))) as executor:
+        return list(executor.map(fetch, documents))
+
+
+@dataclass(frozen=True)
+class FilingSnapshot:
+    """The filing details used to build one email, read from the database once per message.
+
+    The filing's json representation is built once, as each build deep-copies the filing json and
+    queries its colin event ids, comments, children and submitter.
+    The snapshot and its json must not be changed by the processors.
+    """
+
+    filing: Filing
+    json: dict
+    business: dict
+    filing_date_time: str
+    effective_date_time: str
+
+    @property
+    def id(self) -> int:  # pylint: disable=invalid-name
+        """Return the filing id."""
+        return self.filing.id
+
+    @property
+    def business_id(self) -> int:
+        """Return the internal id of the business the filing belongs to."""
+        return self.filing.business_id
+
+    @property
+    def filing_type(self) -> str:
+        """Return the filing type."""
+        return self.filing.filing_type
 
-    filing_date = datetime.fromisoformat(filing.filing_date.isoformat())
-    leg_tmz_filing_date = LegislationDatetime.as_legislation_timezone(filing_date)
-    hour = leg_tmz_filing_date.strftime('%I').lstrip('0')
-    leg_tmz_filing_date = leg_tmz_filing_date.strftime(f'%B %d, %Y {hour}:%M %p Pacific Time')
+    @property
+    def filing_json(self) -> dict:
+        """Return the filing json as it was submitted."""
+        return self.filing.filing_json
 
-    effective_date = datetime.fromisoformat(filing.effective_date.isoformat())
-    leg_tmz_effective_date = LegislationDatetime.as_legislation_timezone(effective_date)
-    hour = leg_tmz_effective_date.strftime('%I').lstrip('0')
-    leg_tmz_effective_date = leg_tmz_effective_date.strftime(f'%B %d, %Y {hour}:%M %p Pacific Time')
+    @property
+    def payment_token(self) -> str:
+        """Return the payment token of the filing."""
+        return self.filing.payment_token
 
-    return filing, business, leg_tmz_filing_date, leg_tmz_effective_date
+    @property
+    def status(self) -> str:
+        """Return the filing status."""
+        return self.filing.status
+
+
+def _as_legislation_date_time(value: datetime) -> str:
+    """Return the date time in the legislation timezone, formatted for the emails."""
+    leg_tmz_date = LegislationDatetime.as_legislation_timezone(datetime.fromisoformat(value.isoformat()))
+    hour = leg_tmz_date.strftime('%I').lstrip('0')
+    return leg_tmz_date.strftime(f'%B %d, %Y {hour}:%M %p Pacific Time')
+
+
+def get_filing_snapshot(filing_id: str) -> FilingSnapshot:
+    """Get the snapshot of the filing used to build an email."""
+    filing = Filing.find_by_id(filing_id)
+    filing_json = filing.json
+    return FilingSnapshot(
+        filing=filing,
+        json=filing_json,
+        business=filing_json['filing']['business'],
+        filing_date_time=_as_legislation_date_time(filing.filing_date),
+        effective_date_time=_as_legislation_date_time(filing.effective_date)
+    )
 
 
 def get_recipients(option: str, filing_json: dict, token: str = None) -> str:
@@ -92,24 +212,73 @@ def substitute_template_parts(template_code: str) -> str:
     - template parts can only be one level deep, ie: this rudimentary framework does not handle nested template
     parts. There is no recursive search and replace.
     """
-    template_parts = [
-        'business-dashboard-link',
-        'business-dashboard-link-alt',
-        'business-info',
-        'cra-notice',
-        'footer',
-        'header',
-        'initiative-notice',
-        'logo',
-        'pdf-notice',
-        'style',
-        'whitespace-16px',
-        'whitespace-24px'
-    ]
+    template_code, _ = _substitute_template_parts(template_code, current_app.config.get('TEMPLATE_PATH'))
+    return template_code
+
+
+def _substitute_template_parts(template_code: str, template_path: str) -> Tuple[str, List[Path]]:
+    """Substitute the template parts, returning the filled template and the paths of the parts used."""
+    part_paths = []
 
     # substitute template parts - marked up by [[filename]]
-    for template_part in template_parts:
-        template_part_code = Path(f'{current_app.config.get("TEMPLATE_PATH")}/common/{template_part}.html').read_text()
-        template_code = template_code.replace('[[{}.html]]'.format(template_part), template_part_code)
+    for template_part in TEMPLATE_PARTS:
+        markup = '[[{}.html]]'.format(template_part)
+        if markup in template_code:
+            part_path = Path(f'{template_path}/common/{template_part}.html')
+            template_code = template_code.replace(markup, part_path.read_text())
+            part_paths.append(part_path)
 
-    return template_code
+    return template_code, part_paths
+
+
+class TemplatePartsLoader(FileSystemLoader):
+    """Load the email templates with their template parts already substituted.
+
+    A compiled template is reloaded when the template, or any of the parts it uses, is modified.
+    """
+
+    def get_source(self, environment, template):
+        """Return the filled template source, and a check that none of its files have changed."""
+        source, filename, uptodate = super().get_source(environment, template)
+        source, part_paths = _substitute_template_parts(source, self.searchpath[0])
+        part_mtimes = {part_path: part_path.stat().st_mtime for part_path in part_paths}
+
+        def is_uptodate():
+            try:
+                return uptodate() and \
+                    all(part_path.stat().st_mtime == mtime for part_path, mtime in part_mtimes.items())
+            except OSError:
+                return False
+
+        return source, filename, is_uptodate
+
+
+def get_template_environment() -> Environment:
+    """Return the process-wide Jinja environment for the templates in the TEMPLATE_PATH."""
+    template_path = current_app.config.get('TEMPLATE_PATH')
+    with _template_lock:
+        if not (environment := _template_environments.get(template_path)):
+            bytecode_cache = None
+            if bytecode_cache_dir := current_app.config.get('TEMPLATE_BYTECODE_CACHE_DIR'):
+                bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+            environment = Environment(loader=TemplatePartsLoader(template_path),
+                                      autoescape=True,
+                                      auto_reload=True,
+                                      bytecode_cache=bytecode_cache)
+            _template_environments[template_path] = environment
+    return environment
+
+
+def render_template(template_name: str, **context) -> str:
+    """Render the template, with its parts substituted, using the cached compiled template."""
+    start = time.perf_counter()
+    html_out = get_template_environment().get_template(template_name).render(**context)
+    elapsed = time.perf_counter() - start
+
+    with _template_lock:
+        metrics = TEMPLATE_RENDER_METRICS.setdefault(template_name, {'count': 0, 'totalSeconds': 0.0})
+        metrics['count'] += 1
+        metrics['totalSeconds'] += elapsed
+    logger.debug('Rendered template %s in %.1fms', template_name, elapsed * 1000)
+
+    return html_out
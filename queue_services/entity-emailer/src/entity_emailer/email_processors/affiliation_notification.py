@@ -15,13 +15,11 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
 
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 
-from entity_emailer.email_processors import get_filing_info, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import get_filing_snapshot, get_recipients, render_template
 
 
 def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-locals, , too-many-branches
@@ -29,25 +27,22 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     logger.debug('filing_notification: %s', email_info)
 
     # get template vars from filing
-    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = \
-        get_filing_info(email_info['data']['filing']['header']['filingId'])
+    filing = get_filing_snapshot(email_info['data']['filing']['header']['filingId'])
+    business = filing.business
     filing_type = filing.filing_type
     status = filing.status
     filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
 
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BC-ALT-DRAFT.html').read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
-    filing_data = (filing.json)['filing'][f'{filing_type}']
-    html_out = jnja_template.render(
+    filing_data = filing.json['filing'][f'{filing_type}']
+    html_out = render_template(
+        'BC-ALT-DRAFT.html',
         business=business,
         filing=filing_data,
-        header=(filing.json)['filing']['header'],
-        filing_date_time=leg_tmz_filing_date,
-        effective_date_time=leg_tmz_effective_date,
-        entity_dashboard_url=current_app.config.get('DASHBOARD_URL') +
-        (filing.json)['filing']['business'].get('identifier', ''),
+        header=filing.json['filing']['header'],
+        filing_date_time=filing.filing_date_time,
+        effective_date_time=filing.effective_date_time,
+        entity_dashboard_url=current_app.config.get('DASHBOARD_URL') + business.get('identifier', ''),
         email_header=filing_name.upper(),
         filing_type=filing_type
     )
@@ -14,31 +14,23 @@
 """Email processing rules and actions for business number notification."""
 from __future__ import annotations
 
-from pathlib import Path
-
 from entity_queue_common.service_utils import logger
-from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, Filing
 
-from entity_emailer.email_processors import get_recipients, substitute_template_parts
+from entity_emailer.email_processors import get_recipients, render_template
 
 
 def process(email_msg: dict) -> dict:
     """Build the email for Business Number notification."""
     logger.debug('bn notification: %s', email_msg)
 
-    # get template and fill in parts
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BC-BN.html').read_text()
-    filled_template = substitute_template_parts(template)
-
     # get filing and business json
     business = Business.find_by_identifier(email_msg['identifier'])
     filing = (Filing.get_a_businesses_most_recent_filing_of_a_type(business.id, 'incorporationApplication'))
 
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
-    html_out = jnja_template.render(
+    html_out = render_template(
+        'BC-BN.html',
         business=business.json()
     )
 
@@ -17,17 +17,20 @@ from __future__ import annotations
 import base64
 import re
 from http import HTTPStatus
-from pathlib import Path
 
-import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.models import Business, Filing
 from legal_api.services import NameXService
 from sentry_sdk import capture_message
 
-from entity_emailer.email_processors import get_filing_info, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import (
+    FilingSnapshot,
+    fetch_documents,
+    get_filing_snapshot,
+    get_recipients,
+    render_template,
+)
 
 
 FILING_TYPE_CONVERTER = {
@@ -40,51 +43,41 @@ FILING_TYPE_CONVERTER = {
 }
 
 
-def _get_pdfs(
-        status: str,
-        token: str,
-        business: dict,
-        filing: Filing,
-        filing_date_time: str,
-        effective_date: str) -> list:
-    # pylint: disable=too-many-locals, too-many-branches, too-many-statements, too-many-arguments
-    """Get the pdfs for the incorporation output."""
-    pdfs = []
+def _get_pdfs(status: str, token: str, filing: FilingSnapshot, additional_info: dict) -> list:
+    # pylint: disable=too-many-locals, too-many-branches
+    """Get the pdfs for the incorporation output.
+
+    The documents are fetched concurrently, and attached in the same order as they are listed here.
+    """
+    documents = []
+    business = filing.business
     headers = {
         'Accept': 'application/pdf',
         'Authorization': f'Bearer {token}'
     }
+    filing_url = f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
     if filing.filing_type == 'correction':
         original_filing_type = filing.filing_json['filing']['correction']['correctedFilingType']
     if status == Filing.Status.PAID.value:
         # add filing pdf
-        filing_pdf = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}',
-            headers=headers
-        )
-        if filing_pdf.status_code != HTTPStatus.OK:
-            logger.error('Failed to get pdf for filing: %s', filing.id)
-            capture_message(f'Email Queue: filing id={filing.id}, error=pdf generation', level='error')
+        if filing.filing_type == 'correction':
+            file_name = original_filing_type[0].upper() + \
+                ' '.join(re.findall('[a-zA-Z][^A-Z]*', original_filing_type[1:]))
+            file_name = f'{file_name} (Corrected)'
         else:
-            filing_pdf_encoded = base64.b64encode(filing_pdf.content)
-            if filing.filing_type == 'correction':
-                file_name = original_filing_type[0].upper() + \
-                    ' '.join(re.findall('[a-zA-Z][^A-Z]*', original_filing_type[1:]))
-                file_name = f'{file_name} (Corrected)'
-            else:
-                file_name = filing.filing_type[0].upper() + \
-                    ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
-                if ar_date := filing.filing_json['filing'].get('annualReport', {}).get('annualReportDate'):
-                    file_name = f'{ar_date[:4]} {file_name}'
+            file_name = filing.filing_type[0].upper() + \
+                ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
+            if ar_date := filing.filing_json['filing'].get('annualReport', {}).get('annualReportDate'):
+                file_name = f'{ar_date[:4]} {file_name}'
+        documents.append({
+            'method': 'GET',
+            'url': filing_url,
+            'expectedStatus': HTTPStatus.OK,
+            'description': 'pdf',
+            'fileName': f'{file_name}.pdf',
+            'attachOrder': '1'
+        })
 
-            pdfs.append(
-                {
-                    'fileName': f'{file_name}.pdf',
-                    'fileBytes': filing_pdf_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': '1'
-                }
-            )
         # add receipt pdf
         if filing.filing_type == 'incorporationApplication' or (filing.filing_type == 'correction' and
                                                                 original_filing_type == 'incorporationApplication'):
@@ -94,98 +87,72 @@ def _get_pdfs(
             corp_name = business.get('legalName')
 
         business_data = Business.find_by_internal_id(filing.business_id)
-        receipt = requests.post(
-            f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
-            json={
+        documents.append({
+            'method': 'POST',
+            'url': f'{current_app.config.get("PAY_API_URL")}/{filing.payment_token}/receipts',
+            'json': {
                 'corpName': corp_name,
-                'filingDateTime': filing_date_time,
-                'effectiveDateTime': effective_date,
+                'filingDateTime': filing.filing_date_time,
+                'effectiveDateTime': filing.effective_date_time,
                 'filingIdentifier': str(filing.id),
                 'businessNumber': business_data.tax_id if business_data.tax_id else ''
             },
-            headers=headers
-        )
-        if receipt.status_code != HTTPStatus.CREATED:
-            logger.error('Failed to get receipt pdf for filing: %s', filing.id)
-            capture_message(f'Email Queue: filing id={filing.id}, error=receipt generation', level='error')
-        else:
-            receipt_encoded = base64.b64encode(receipt.content)
-            pdfs.append(
-                {
-                    'fileName': 'Receipt.pdf',
-                    'fileBytes': receipt_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': '2'
-                }
-            )
+            'expectedStatus': HTTPStatus.CREATED,
+            'description': 'receipt',
+            'fileName': 'Receipt.pdf',
+            'attachOrder': '2'
+        })
     if status == Filing.Status.COMPLETED.value:
         # add notice of articles
-        noa = requests.get(
-            f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-            '?type=noa',
-            headers=headers
-        )
-        if noa.status_code != HTTPStatus.OK:
-            logger.error('Failed to get noa pdf for filing: %s', filing.id)
-            capture_message(f'Email Queue: filing id={filing.id}, error=noa generation', level='error')
-        else:
-            noa_encoded = base64.b64encode(noa.content)
-            pdfs.append(
-                {
-                    'fileName': 'Notice of Articles.pdf',
-                    'fileBytes': noa_encoded.decode('utf-8'),
-                    'fileUrl': '',
-                    'attachOrder': '1'
-                }
-            )
+        documents.append({
+            'method': 'GET',
+            'url': f'{filing_url}?type=noa',
+            'expectedStatus': HTTPStatus.OK,
+            'description': 'noa',
+            'fileName': 'Notice of Articles.pdf',
+            'attachOrder': '1'
+        })
 
         if filing.filing_type == 'incorporationApplication' or (filing.filing_type == 'correction' and
                                                                 original_filing_type == 'incorporationApplication' and
-                                                                get_additional_info(filing).get('nameChange', False)):
+                                                                additional_info.get('nameChange', False)):
             # add certificate
-            certificate = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                '?type=certificate',
-                headers=headers
-            )
-            if certificate.status_code != HTTPStatus.OK:
-                logger.error('Failed to get certificate pdf for filing: %s', filing.id)
-                capture_message(f'Email Queue: filing id={filing.id}, error=certificate generation', level='error')
-            else:
-                certificate_encoded = base64.b64encode(certificate.content)
-                file_name = 'Incorporation Certificate (Corrected).pdf' if filing.filing_type == 'correction' \
-                    else 'Incorporation Certificate.pdf'
-                pdfs.append(
-                    {
-                        'fileName': file_name,
-                        'fileBytes': certificate_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': '2'
-                    }
-                )
+            documents.append({
+                'method': 'GET',
+                'url': f'{filing_url}?type=certificate',
+                'expectedStatus': HTTPStatus.OK,
+                'description': 'certificate',
+                'fileName': 'Incorporation Certificate (Corrected).pdf' if filing.filing_type == 'correction'
+                            else 'Incorporation Certificate.pdf',
+                'attachOrder': '2'
+            })
 
-        if filing.filing_type == 'alteration' and get_additional_info(filing).get('nameChange', False):
+        if filing.filing_type == 'alteration' and additional_info.get('nameChange', False):
             # add certificate of name change
-            certificate = requests.get(
-                f'{current_app.config.get("LEGAL_API_URL")}/businesses/{business["identifier"]}/filings/{filing.id}'
-                '?type=certificateOfNameChange',
-                headers=headers
-            )
-            if certificate.status_code != HTTPStatus.OK:
-                logger.error('Failed to get certificateOfNameChange pdf for filing: %s', filing.id)
-                capture_message(f'Email Queue: filing id={filing.id}, error=certificateOfNameChange generation',
-                                level='error')
-            else:
-                certificate_encoded = base64.b64encode(certificate.content)
-                file_name = 'Certificate of Name Change.pdf'
-                pdfs.append(
-                    {
-                        'fileName': file_name,
-                        'fileBytes': certificate_encoded.decode('utf-8'),
-                        'fileUrl': '',
-                        'attachOrder': '2'
-                    }
-                )
+            documents.append({
+                'method': 'GET',
+                'url': f'{filing_url}?type=certificateOfNameChange',
+                'expectedStatus': HTTPStatus.OK,
+                'description': 'certificateOfNameChange',
+                'fileName': 'Certificate of Name Change.pdf',
+                'attachOrder': '2'
+            })
+
+    pdfs = []
+    for document, response in zip(documents, fetch_documents(documents, headers)):
+        if response is None or response.status_code != document['expectedStatus']:
+            logger.error('Failed to get %s for filing: %s', document['fileName'], filing.id)
+            capture_message(f'Email Queue: filing id={filing.id}, error={document["description"]} generation',
+                            level='error')
+            continue
+        pdfs.append(
+            {
+                'fileName': document['fileName'],
+                'fileBytes': base64.b64encode(response.content).decode('utf-8'),
+                'fileUrl': '',
+                'attachOrder': document['attachOrder']
+            }
+        )
 
     return pdfs
 
@@ -196,7 +163,8 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     # get template and fill in parts
     filing_type, status = email_info['type'], email_info['option']
     # get template vars from filing
-    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(email_info['filingId'])
+    filing = get_filing_snapshot(email_info['filingId'])
+    business = filing.business
     if filing_type == 'correction':
         original_filing_type = filing.filing_json['filing']['correction']['correctedFilingType']
         if original_filing_type != 'incorporationApplication':
@@ -208,34 +176,29 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
         filing_name = filing.filing_type[0].upper() + ' '.join(re.findall('[a-zA-Z][^A-Z]*', filing.filing_type[1:]))
 
     if filing_type == 'correction':
-        template = Path(
-            f'{current_app.config.get("TEMPLATE_PATH")}/BC-{FILING_TYPE_CONVERTER[filing_type]}-'
-            f'{FILING_TYPE_CONVERTER[original_filing_type]}-{status}.html'
-        ).read_text()
+        template_name = \
+            f'BC-{FILING_TYPE_CONVERTER[filing_type]}-{FILING_TYPE_CONVERTER[original_filing_type]}-{status}.html'
     else:
-        template = Path(
-            f'{current_app.config.get("TEMPLATE_PATH")}/BC-{FILING_TYPE_CONVERTER[filing_type]}-{status}.html'
-        ).read_text()
-    filled_template = substitute_template_parts(template)
+        template_name = f'BC-{FILING_TYPE_CONVERTER[filing_type]}-{status}.html'
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
-    filing_data = (filing.json)['filing'][f'{original_filing_type}'] if filing_type == 'correction' \
-        else (filing.json)['filing'][f'{filing_type}']
-    html_out = jnja_template.render(
+    filing_data = filing.json['filing'][f'{original_filing_type}'] if filing_type == 'correction' \
+        else filing.json['filing'][f'{filing_type}']
+    additional_info = get_additional_info(filing)
+    html_out = render_template(
+        template_name,
         business=business,
         filing=filing_data,
-        header=(filing.json)['filing']['header'],
-        filing_date_time=leg_tmz_filing_date,
-        effective_date_time=leg_tmz_effective_date,
-        entity_dashboard_url=current_app.config.get('DASHBOARD_URL') +
-        (filing.json)['filing']['business'].get('identifier', ''),
+        header=filing.json['filing']['header'],
+        filing_date_time=filing.filing_date_time,
+        effective_date_time=filing.effective_date_time,
+        entity_dashboard_url=current_app.config.get('DASHBOARD_URL') + business.get('identifier', ''),
         email_header=filing_name.upper(),
         filing_type=filing_type,
-        additional_info=get_additional_info(filing)
+        additional_info=additional_info
     )
 
     # get attachments
-    pdfs = _get_pdfs(status, token, business, filing, leg_tmz_filing_date, leg_tmz_effective_date)
+    pdfs = _get_pdfs(status, token, filing, additional_info)
 
     # get recipients
     recipients = get_recipients(status, filing.filing_json, token)
@@ -286,7 +249,7 @@ def process(email_info: dict, token: str) -> dict:  # pylint: disable=too-many-l
     }
 
 
-def get_additional_info(filing: Filing) -> dict:
+def get_additional_info(filing: FilingSnapshot) -> dict:
     """Populate any additional info required for a filing type."""
     additional_info = {}
     if filing.filing_type == 'correction':
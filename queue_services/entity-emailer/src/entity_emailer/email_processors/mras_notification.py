@@ -14,33 +14,26 @@
 """Email processing actions for mras notification."""
 from __future__ import annotations
 
-from pathlib import Path
-
 from entity_queue_common.service_utils import logger
-from flask import current_app
-from jinja2 import Template
 
-from entity_emailer.email_processors import get_filing_info, get_recipients, substitute_template_parts
+from entity_emailer.email_processors import get_filing_snapshot, get_recipients, render_template
 
 
 def process(email_msg: dict) -> dict:
     """Build the email for mras notification."""
     logger.debug('mras_notification: %s', email_msg)
     filing_type = email_msg['type']
-    # get template and fill in parts
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/BC-MRAS.html').read_text()
-    filled_template = substitute_template_parts(template)
     # get template info from filing
-    filing, business, leg_tmz_filing_date, leg_tmz_effective_date = get_filing_info(email_msg['filingId'])
+    filing = get_filing_snapshot(email_msg['filingId'])
 
     # render template with vars
-    jnja_template = Template(filled_template, autoescape=True)
-    html_out = jnja_template.render(
-        business=business,
-        filing=(filing.json)['filing']['incorporationApplication'],
-        header=(filing.json)['filing']['header'],
-        filing_date_time=leg_tmz_filing_date,
-        effective_date_time=leg_tmz_effective_date,
+    html_out = render_template(
+        'BC-MRAS.html',
+        business=filing.business,
+        filing=filing.json['filing']['incorporationApplication'],
+        header=filing.json['filing']['header'],
+        filing_date_time=filing.filing_date_time,
+        effective_date_time=filing.effective_date_time,
         filing_type=filing_type
     )
 
@@ -16,27 +16,23 @@ from __future__ import annotations
 
 import base64
 from http import HTTPStatus
-from pathlib import Path
 
 import requests
 from entity_queue_common.service_utils import logger
 from flask import current_app
-from jinja2 import Template
 from legal_api.services import NameXService
 from sentry_sdk import capture_message
 
-from entity_emailer.email_processors import substitute_template_parts
+from entity_emailer.email_processors import render_template
 
 
 def process(email_info: dict) -> dict:
     """Build the email for Name Request notification."""
     logger.debug('NR_notification: %s', email_info)
     nr_number = email_info['identifier']
-    template = Path(f'{current_app.config.get("TEMPLATE_PATH")}/NR-PAID.html').read_text()
-    filled_template = substitute_template_parts(template)
     # render template with vars
-    mail_template = Template(filled_template, autoescape=True)
-    html_out = mail_template.render(
+    html_out = render_template(
+        'NR-PAID.html',
         identifier=nr_number
     )
 
@@ -17,14 +17,16 @@ The entry-point is the **cb_subscription_handler**
 
 The design and flow leverage a few constraints that are placed upon it
 by NATS Streaming and using AWAIT on the default loop.
-- NATS streaming queues require one message to be processed at a time.
-- AWAIT on the default loop effectively runs synchronously
+- up to MAX_INFLIGHT messages are handled at the same time, each acked once it is processed
+- each email is processed synchronously in the loop's default executor, so every message has
+  its own thread, app context and Flask-SQLAlchemy session
 
 If these constraints change, the use of Flask-SQLAlchemy would need to change.
 Flask-SQLAlchemy currently allows the base model to be changed, or reworking
 the model to a standalone SQLAlchemy usage with an async engine would need
 to be pursued.
 """
+import asyncio
 import json
 import os
 from http import HTTPStatus
@@ -126,7 +128,7 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
         logger.info('Received raw message seq: %s, data=  %s', msg.sequence, msg.data.decode())
         email_msg = json.loads(msg.data.decode('utf-8'))
         logger.debug('Extracted email msg: %s', email_msg)
-        process_email(email_msg, FLASK_APP)
+        await asyncio.get_running_loop().run_in_executor(None, process_email, email_msg, FLASK_APP)
     except OperationalError as err:
         logger.error('Queue Blocked - Database Issue: %s', json.dumps(email_msg), exc_info=True)
         raise err  # We don't want to handle the error, as a DB down would drain the queue
@@ -15,9 +15,10 @@
 from unittest.mock import patch
 
 import pytest
-from legal_api.models import Business
+from legal_api.models import Business, db
+from sqlalchemy import event
 
-from entity_emailer.email_processors import filing_notification
+from entity_emailer.email_processors import filing_notification, get_filing_snapshot
 from tests.unit import prep_incorp_filing, prep_incorporation_correction_filing, prep_maintenance_filing
 
 
@@ -45,8 +46,8 @@ def test_incorp_notification(app, session, status):
         assert email['content']['attachments'] == []
         assert mock_get_pdfs.call_args[0][0] == status
         assert mock_get_pdfs.call_args[0][1] == token
-        assert mock_get_pdfs.call_args[0][2] == {'identifier': 'BC1234567'}
-        assert mock_get_pdfs.call_args[0][3] == filing
+        assert mock_get_pdfs.call_args[0][2].business == {'identifier': 'BC1234567'}
+        assert mock_get_pdfs.call_args[0][2].filing == filing
 
 
 @pytest.mark.parametrize(['status', 'has_name_change_with_new_nr'], [
@@ -83,8 +84,8 @@ def test_correction_incorporation_notification(app, session, status, has_name_ch
         assert email['content']['attachments'] == []
         assert mock_get_pdfs.call_args[0][0] == status
         assert mock_get_pdfs.call_args[0][1] == token
-        assert mock_get_pdfs.call_args[0][2] == {'identifier': 'BC1234567'}
-        assert mock_get_pdfs.call_args[0][3] == filing
+        assert mock_get_pdfs.call_args[0][2].business == {'identifier': 'BC1234567'}
+        assert mock_get_pdfs.call_args[0][2].filing == filing
 
 
 @pytest.mark.parametrize(['status', 'filing_type'], [
@@ -113,9 +114,74 @@ def test_maintenance_notification(app, session, status, filing_type):
             assert email['content']['attachments'] == []
             assert mock_get_pdfs.call_args[0][0] == status
             assert mock_get_pdfs.call_args[0][1] == token
-            assert mock_get_pdfs.call_args[0][2] == \
+            assert mock_get_pdfs.call_args[0][2].business == \
                 {'identifier': 'BC1234567', 'legalype': Business.LegalTypes.BCOMP.value, 'legalName': 'test business'}
-            assert mock_get_pdfs.call_args[0][3] == filing
+            assert mock_get_pdfs.call_args[0][2].filing == filing
             assert mock_get_recipients.call_args[0][0] == status
             assert mock_get_recipients.call_args[0][1] == filing.filing_json
             assert mock_get_recipients.call_args[0][2] == token
+
+
+def test_get_pdfs_fetched_concurrently(app, session, requests_mock, monkeypatch):
+    """Assert that the documents are fetched concurrently and attached in order."""
+    import time
+
+    monkeypatch.setitem(app.config, 'LEGAL_API_URL', 'http://legal-api.test')
+    filing = prep_incorp_filing(session, 'BC1234567', '1', 'COMPLETED')
+    filing_url = f'http://legal-api.test/businesses/BC1234567/filings/{filing.id}'
+    delay = 0.5
+
+    def slow_report(content):
+        def callback(request, context):  # pylint: disable=unused-argument
+            time.sleep(delay)
+            return content
+        return callback
+
+    requests_mock.get(f'{filing_url}?type=noa', content=slow_report(b'noa'))
+    requests_mock.get(f'{filing_url}?type=certificate', content=slow_report(b'certificate'))
+
+    start = time.perf_counter()
+    pdfs = filing_notification._get_pdfs('COMPLETED', 'token', get_filing_snapshot(filing.id), {})
+    elapsed = time.perf_counter() - start
+
+    assert [pdf['fileName'] for pdf in pdfs] == ['Notice of Articles.pdf', 'Incorporation Certificate.pdf']
+    assert [pdf['attachOrder'] for pdf in pdfs] == ['1', '2']
+    # the documents were rendered at the same time rather than one after the other
+    assert elapsed < 2 * delay
+
+
+def test_get_pdfs_partial_failure(app, session, requests_mock, monkeypatch):
+    """Assert that a failed document is left out without losing the others."""
+    import requests
+
+    monkeypatch.setitem(app.config, 'LEGAL_API_URL', 'http://legal-api.test')
+    filing = prep_incorp_filing(session, 'BC1234567', '1', 'COMPLETED')
+    filing_url = f'http://legal-api.test/businesses/BC1234567/filings/{filing.id}'
+    requests_mock.get(f'{filing_url}?type=noa', exc=requests.exceptions.ReadTimeout)
+    requests_mock.get(f'{filing_url}?type=certificate', content=b'certificate')
+
+    pdfs = filing_notification._get_pdfs('COMPLETED', 'token', get_filing_snapshot(filing.id), {})
+
+    assert [pdf['fileName'] for pdf in pdfs] == ['Incorporation Certificate.pdf']
+
+
+def test_filing_snapshot_built_once(app, session):
+    """Assert that the filing json, and the records it is built from, are read once for an email."""
+    filing = prep_incorp_filing(session, 'BC1234567', '1', 'COMPLETED')
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):  # pylint: disable=unused-argument
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record_statement)
+    try:
+        with patch.object(filing_notification, '_get_pdfs', return_value=[]) as mock_get_pdfs:
+            email = filing_notification.process(
+                {'filingId': filing.id, 'type': 'incorporationApplication', 'option': 'COMPLETED'}, 'token')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record_statement)
+
+    assert email['content']['body']
+    assert mock_get_pdfs.call_args[0][2].json['filing']['header']['filingId'] == filing.id
+    assert len([statement for statement in statements if 'FROM colin_event_ids' in statement]) == 1
+    assert len([statement for statement in statements if 'FROM comments' in statement]) == 1
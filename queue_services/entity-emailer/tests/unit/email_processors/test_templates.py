@@ -0,0 +1,61 @@
+# Copyright © 2021 Province of British Columbia
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The Unit Tests for the compiled email templates."""
+import os
+
+from entity_emailer.email_processors import (
+    TEMPLATE_RENDER_METRICS,
+    get_template_environment,
+    render_template,
+    substitute_template_parts,
+)
+
+
+def _write_templates(template_path):
+    """Write a template, and the template part it uses, to the template path."""
+    (template_path / 'common').mkdir()
+    (template_path / 'common' / 'header.html').write_text('<h1>{{ title }}</h1>')
+    (template_path / 'BC-TEST.html').write_text('[[header.html]]<p>{{ body }}</p>')
+
+
+def test_render_template_substitutes_parts(app, tmp_path, monkeypatch):
+    """Assert that the template parts are substituted and the template is compiled once."""
+    _write_templates(tmp_path)
+    monkeypatch.setitem(app.config, 'TEMPLATE_PATH', str(tmp_path))
+    with app.app_context():
+        html_out = render_template('BC-TEST.html', title='Title', body='<b>escaped</b>')
+        assert html_out == '<h1>Title</h1><p>&lt;b&gt;escaped&lt;/b&gt;</p>'
+        assert html_out == substitute_template_parts(
+            (tmp_path / 'BC-TEST.html').read_text()).replace('{{ title }}', 'Title').replace(
+                '{{ body }}', '&lt;b&gt;escaped&lt;/b&gt;')
+
+        template = get_template_environment().get_template('BC-TEST.html')
+        assert get_template_environment().get_template('BC-TEST.html') is template
+        render_template('BC-TEST.html', title='Title', body='body')
+        assert TEMPLATE_RENDER_METRICS['BC-TEST.html']['count'] >= 2
+
+
+def test_render_template_reloads_changed_parts(app, tmp_path, monkeypatch):
+    """Assert that a template is recompiled when one of its template parts changes."""
+    _write_templates(tmp_path)
+    monkeypatch.setitem(app.config, 'TEMPLATE_PATH', str(tmp_path))
+    with app.app_context():
+        assert render_template('BC-TEST.html', title='Title', body='body') == '<h1>Title</h1><p>body</p>'
+
+        header = tmp_path / 'common' / 'header.html'
+        header.write_text('<h2>{{ title }}</h2>')
+        modified = header.stat().st_mtime + 10
+        os.utime(header, (modified, modified))
+
+        assert render_template('BC-TEST.html', title='Title', body='body') == '<h2>Title</h2><p>body</p>'
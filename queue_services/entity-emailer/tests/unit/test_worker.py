@@ -51,8 +51,8 @@ def test_process_incorp_email(app, session, option):
 
                 assert mock_get_pdfs.call_args[0][0] == option
                 assert mock_get_pdfs.call_args[0][1] == token
-                assert mock_get_pdfs.call_args[0][2] == {'identifier': 'BC1234567'}
-                assert mock_get_pdfs.call_args[0][3] == filing
+                assert mock_get_pdfs.call_args[0][2].business == {'identifier': 'BC1234567'}
+                assert mock_get_pdfs.call_args[0][2].filing == filing
 
                 if option == 'PAID':
                     assert 'comp_party@email.com' in mock_send_email.call_args[0][0]['recipients']
@@ -90,13 +90,13 @@ def test_maintenance_notification(app, session, status, filing_type):
 
                     assert mock_get_pdfs.call_args[0][0] == status
                     assert mock_get_pdfs.call_args[0][1] == token
-                    assert mock_get_pdfs.call_args[0][2] == \
+                    assert mock_get_pdfs.call_args[0][2].business == \
                         {
                             'identifier': 'BC1234567',
                             'legalype': Business.LegalTypes.BCOMP.value,
                             'legalName': 'test business'
                         }
-                    assert mock_get_pdfs.call_args[0][3] == filing
+                    assert mock_get_pdfs.call_args[0][2].filing == filing
                     assert mock_get_recipients.call_args[0][0] == status
                     assert mock_get_recipients.call_args[0][1] == filing.filing_json
                     assert mock_get_recipients.call_args[0][2] == token
@@ -97,6 +97,14 @@ class _Config():  # pylint: disable=too-few-public-methods
         'queue': os.getenv('NATS_QUEUE', 'error'),
         'durable_name': os.getenv('NATS_QUEUE', 'error') + '_durable',
     }
+    # failed messages are retried with an exponential backoff, then moved to the dead letter subject
+    RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '5'))
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '2'))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '300'))
+    DEAD_LETTER_SUBJECT = os.getenv('NATS_DEAD_LETTER_SUBJECT', None)
+    # retries wait on the delay subject until they are due, checked every poll interval in seconds
+    RETRY_DELAY_SUBJECT = os.getenv('NATS_RETRY_DELAY_SUBJECT', None)
+    RETRY_POLL_INTERVAL = int(os.getenv('RETRY_POLL_INTERVAL', '5'))
 
     ENTITY_EVENT_PUBLISH_OPTIONS = {
         'subject': os.getenv('NATS_ENTITY_EVENT_SUBJECT', 'entity.events'),
@@ -107,6 +115,9 @@ class _Config():  # pylint: disable=too-few-public-methods
     }
 
     COLIN_API = os.getenv('COLIN_API', '')
+    # corp nums are reserved from COLIN in blocks, and the pool is refilled when it drops below the threshold
+    CORP_NUM_POOL_BLOCK_SIZE = int(os.getenv('CORP_NUM_POOL_BLOCK_SIZE', '10'))
+    CORP_NUM_POOL_REFILL_THRESHOLD = int(os.getenv('CORP_NUM_POOL_REFILL_THRESHOLD', '3'))
 
     # service accounts
     ACCOUNT_SVC_AUTH_URL = os.getenv('ACCOUNT_SVC_AUTH_URL')
@@ -16,7 +16,6 @@ import json
 from http import HTTPStatus
 from typing import Dict
 
-import requests
 from flask import current_app
 from flask_babel import _ as babel  # noqa: N813
 from legal_api.models import Business
@@ -45,7 +44,7 @@ def update_business_profile(business: Business, profile_info: Dict) -> Dict:
              }
         )
         url = ''.join([account_svc_entity_url, '/', business.identifier, '/contacts'])
-        rv = requests.post(
+        rv = AccountService.get_session().post(
             url=url,
             headers={**AccountService.CONTENT_TYPE_JSON,
                      'Authorization': AccountService.BEARER + token},
@@ -64,7 +63,7 @@ def update_business_profile(business: Business, profile_info: Dict) -> Dict:
 
         if rv.status_code == HTTPStatus.BAD_REQUEST and \
                 'DATA_ALREADY_EXISTS' in rv.text:
-            put = requests.put(
+            put = AccountService.get_session().put(
                 url=''.join([account_svc_entity_url, '/', business.identifier]),
                 headers={**AccountService.CONTENT_TYPE_JSON,
                          'Authorization': AccountService.BEARER + token},
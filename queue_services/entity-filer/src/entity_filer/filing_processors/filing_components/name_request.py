@@ -15,7 +15,6 @@
 import json
 from http import HTTPStatus
 
-import requests
 import sentry_sdk
 from entity_queue_common.service_utils import QueueException
 from flask import current_app
@@ -36,7 +35,7 @@ def consume_nr(business: Business, filing: Filing, nr_num_path='/filing/incorpor
 
             # Create an entity record
             data = json.dumps({'consume': {'corpNum': business.identifier}})
-            rv = requests.patch(
+            rv = AccountService.get_session().patch(
                 url=''.join([namex_svc_url, nr_num]),
                 headers={**AccountService.CONTENT_TYPE_JSON,
                          'Authorization': AccountService.BEARER + token},
@@ -14,6 +14,7 @@
 """Manages the share structure for a business."""
 from __future__ import annotations
 
+from contextlib import suppress
 from typing import Dict, List, Optional
 
 from dateutil.parser import parse
@@ -49,19 +50,7 @@ def update_share_structure(business: Business, share_structure: Dict) -> Optiona
 
     if share_classes := share_structure.get('shareClasses'):
         try:
-            delete_existing_shares(business)
-        except:  # noqa:E722 pylint: disable=bare-except; catch all exceptions
-            err.append(
-                {'error_code': 'FILER_UNABLE_TO_DELETE_SHARES',
-                 'error_message': f"Filer: unable to delete shares for :'{business.identifier}'"}
-            )
-            # we're FUBAR, do not load the new shares
-            return err
-
-        try:
-            for share_class_info in share_classes:
-                share_class = create_share_class(share_class_info)
-                business.share_classes.append(share_class)
+            reconcile_share_classes(business, share_classes)
         except KeyError:
             err.append(
                 {'error_code': 'FILER_UNABLE_TO_SAVE_SHARES',
@@ -71,34 +60,102 @@ def update_share_structure(business: Business, share_structure: Dict) -> Optiona
     return err
 
 
-def delete_existing_shares(business: Business):
-    """Delete the existing share classes and series for a business."""
-    if existing_shares := business.share_classes.all():
-        for share_class in existing_shares:
-            business.share_classes.remove(share_class)
+def reconcile_share_classes(business: Business, share_classes: List[Dict]):
+    """Apply the share classes to the business, writing only the rows that actually change.
+
+    Incoming classes are matched to the existing ones by id, or failing that by name and priority.
+    Matched classes are updated in place, unmatched incoming classes are added and any existing
+    class that is no longer present is removed, along with its series.
+    Leaving unchanged rows alone keeps the continuum version tables from collecting a delete and
+    an insert version for every share class and series on each filing.
+    """
+    unmatched = business.share_classes.all()
+
+    for share_class_info in share_classes:
+        if share_class := _find_match(unmatched, share_class_info):
+            unmatched.remove(share_class)
+            _set_changed_values(share_class, _share_class_values(share_class_info))
+            reconcile_share_series(share_class, share_class_info['series'])
+        else:
+            business.share_classes.append(create_share_class(share_class_info))
+
+    for share_class in unmatched:
+        business.share_classes.remove(share_class)
+
+
+def reconcile_share_series(share_class: ShareClass, series_structure: List[Dict]):
+    """Apply the series to an existing share class, writing only the rows that actually change."""
+    unmatched = list(share_class.series)
+
+    for series_info in series_structure:
+        if share_series := _find_match(unmatched, series_info):
+            unmatched.remove(share_series)
+            _set_changed_values(share_series, _share_series_values(series_info))
+        else:
+            share_class.series.append(ShareSeries(**_share_series_values(series_info)))
+
+    for share_series in unmatched:
+        share_class.series.remove(share_series)
 
 
 def create_share_class(share_class_info: dict) -> ShareClass:
     """Create a new share class and associated series."""
-    share_class = ShareClass(
-        name=share_class_info['name'],
-        priority=share_class_info['priority'],
-        max_share_flag=share_class_info['hasMaximumShares'],
-        max_shares=share_class_info.get('maxNumberOfShares', None),
-        par_value_flag=share_class_info['hasParValue'],
-        par_value=share_class_info.get('parValue', None),
-        currency=share_class_info.get('currency', None),
-        special_rights_flag=share_class_info['hasRightsOrRestrictions']
-    )
+    share_class = ShareClass(**_share_class_values(share_class_info))
     share_class.series = []
     for series in share_class_info['series']:
-        share_series = ShareSeries(
-            name=series['name'],
-            priority=series['priority'],
-            max_share_flag=series['hasMaximumShares'],
-            max_shares=series.get('maxNumberOfShares', None),
-            special_rights_flag=series['hasRightsOrRestrictions']
-        )
+        share_series = ShareSeries(**_share_series_values(series))
         share_class.series.append(share_series)
 
     return share_class
+
+
+def _share_class_values(share_class_info: dict) -> dict:
+    """Return the share class column values, normalized the same way the model does before saving."""
+    values = {
+        'name': share_class_info['name'],
+        'priority': share_class_info['priority'],
+        'max_share_flag': share_class_info['hasMaximumShares'],
+        'max_shares': share_class_info.get('maxNumberOfShares', None),
+        'par_value_flag': share_class_info['hasParValue'],
+        'par_value': share_class_info.get('parValue', None),
+        'currency': share_class_info.get('currency', None),
+        'special_rights_flag': share_class_info['hasRightsOrRestrictions']
+    }
+    if not values['max_share_flag']:
+        values['max_shares'] = None
+    if not values['par_value_flag']:
+        values['par_value'] = None
+        values['currency'] = None
+    return values
+
+
+def _share_series_values(series_info: dict) -> dict:
+    """Return the share series column values, normalized the same way the model does before saving."""
+    values = {
+        'name': series_info['name'],
+        'priority': series_info['priority'],
+        'max_share_flag': series_info['hasMaximumShares'],
+        'max_shares': series_info.get('maxNumberOfShares', None),
+        'special_rights_flag': series_info['hasRightsOrRestrictions']
+    }
+    if not values['max_share_flag']:
+        values['max_shares'] = None
+    return values
+
+
+def _find_match(candidates: List, info: dict):
+    """Return the candidate matching the id in info, or else the one with the same name and priority."""
+    with suppress(TypeError, ValueError):
+        share_id = int(info.get('id'))
+        if match := next((c for c in candidates if c.id == share_id), None):
+            return match
+
+    return next((c for c in candidates
+                 if c.name == info['name'] and c.priority == info['priority']), None)
+
+
+def _set_changed_values(record, values: dict):
+    """Set only the attributes whose value differs, so unchanged records are not flagged as modified."""
+    for attribute, value in values.items():
+        if getattr(record, attribute) != value:
+            setattr(record, attribute, value)
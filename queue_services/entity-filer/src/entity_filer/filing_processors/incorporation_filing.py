@@ -21,7 +21,7 @@ import requests
 import sentry_sdk
 from entity_queue_common.service_utils import QueueException
 from flask import current_app
-from legal_api.models import Business, Filing, RegistrationBootstrap
+from legal_api.models import Business, Filing, RegistrationBootstrap, ReservedCorpNum
 from legal_api.services.bootstrap import AccountService
 
 from entity_filer.filing_processors.filing_components import aliases, business_info, business_profile, shares
@@ -30,24 +30,42 @@ from entity_filer.filing_processors.filing_components.parties import update_part
 
 
 def get_next_corp_num(legal_type: str):
-    """Retrieve the next available sequential corp-num from COLIN."""
+    """Retrieve the next available sequential corp-num from the pool reserved in COLIN."""
+    # TODO: update this to grab the legal 'class' after legal classes have been defined in lear
+    if legal_type == Business.LegalTypes.BCOMP.value:
+        business_type = 'BC'
+    else:
+        business_type = legal_type
+
+    if ReservedCorpNum.count_available(business_type) < current_app.config['CORP_NUM_POOL_REFILL_THRESHOLD']:
+        refill_corp_num_pool(business_type)
+
+    if reserved := ReservedCorpNum.take_next(business_type):
+        return reserved.identifier
+    return None
+
+
+def refill_corp_num_pool(business_type: str):
+    """Reserve a block of sequential corp-nums from COLIN and add them to the local pool."""
     try:
-        # TODO: update this to grab the legal 'class' after legal classes have been defined in lear
-        if legal_type == Business.LegalTypes.BCOMP.value:
-            business_type = 'BC'
-        else:
-            business_type = legal_type
-        resp = requests.post(f'{current_app.config["COLIN_API"]}/{business_type}')
+        resp = requests.post(f'{current_app.config["COLIN_API"]}/{business_type}/corp-nums',
+                             json={'count': current_app.config['CORP_NUM_POOL_BLOCK_SIZE']})
     except requests.exceptions.ConnectionError:
         current_app.logger.error(f'Failed to connect to {current_app.config["COLIN_API"]}')
-        return None
+        return
+
+    if resp.status_code != 200:
+        current_app.logger.error(f'Failed to reserve corp nums for {business_type}: {resp.status_code}')
+        return
 
-    if resp.status_code == 200:
-        new_corpnum = int(resp.json()['corpNum'])
+    identifiers = []
+    for corp_num in resp.json().get('corpNums', []):
+        new_corpnum = int(corp_num)
         if new_corpnum and new_corpnum <= 9999999:
-            # TODO: Fix endpoint
-            return f'{business_type}{new_corpnum:07d}'
-    return None
+            identifiers.append(f'{business_type}{new_corpnum:07d}')
+        else:
+            current_app.logger.error(f'Invalid corp num reserved for {business_type}: {corp_num}')
+    ReservedCorpNum.add_block(business_type, identifiers)
 
 
 def update_affiliation(business: Business, filing: Filing):
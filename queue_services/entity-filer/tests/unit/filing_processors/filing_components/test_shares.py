@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """The Unit Tests for the business filing component processors."""
+import copy
+
 import pytest
 from legal_api.models import Business
 
@@ -98,7 +100,7 @@ def test_manage_share_structure__share_classes(
 
 
 def test_manage_share_structure__delete_shares(app, session):
-    """Assert that the share structures are deleted."""
+    """Assert that the share classes, and their series, missing from the filing are deleted."""
     from legal_api.models import ShareClass, ShareSeries
 
     # setup
@@ -113,7 +115,7 @@ def test_manage_share_structure__delete_shares(app, session):
     business_id = business.id
 
     # test
-    shares.delete_existing_shares(business)
+    shares.reconcile_share_classes(business, [])
     business.save()
 
     # check
@@ -121,3 +123,67 @@ def test_manage_share_structure__delete_shares(app, session):
     share_classes = check_business.share_classes.all()
 
     assert not share_classes
+
+
+def _version_row_count() -> int:
+    """Return the number of rows in the share class and share series version tables."""
+    from legal_api.models import ShareClass, ShareSeries, db
+    from sqlalchemy_continuum import version_class
+
+    return db.session.query(version_class(ShareClass)).count() + \
+        db.session.query(version_class(ShareSeries)).count()
+
+
+def test_manage_share_structure__unchanged_shares_not_rewritten(app, session):
+    """Assert that reapplying the same share structure keeps the rows and adds no versions."""
+    business = Business()
+    business.save()
+    shares.update_share_structure(business, copy.deepcopy(SINGLE_SHARE_CLASS['shareStructure']))
+    business.save()
+
+    share_class = business.share_classes.one()
+    class_id, series_id = share_class.id, share_class.series[0].id
+    version_rows = _version_row_count()
+
+    err = shares.update_share_structure(business, copy.deepcopy(SINGLE_SHARE_CLASS['shareStructure']))
+    business.save()
+
+    share_class = Business.find_by_internal_id(business.id).share_classes.one()
+    assert not err
+    assert share_class.id == class_id
+    assert share_class.series[0].id == series_id
+    assert _version_row_count() == version_rows
+
+
+def test_manage_share_structure__reconcile_changes(app, session):
+    """Assert that only the changed, added and removed share rows are written."""
+    business = Business()
+    business.save()
+    shares.update_share_structure(business, copy.deepcopy(SINGLE_SHARE_CLASS['shareStructure']))
+    business.save()
+
+    share_class = business.share_classes.one()
+    class_id, series_id = share_class.id, share_class.series[0].id
+    version_rows = _version_row_count()
+
+    share_structure = copy.deepcopy(SINGLE_SHARE_CLASS['shareStructure'])
+    share_structure['shareClasses'][0]['id'] = class_id
+    share_structure['shareClasses'][0]['name'] = 'class1 renamed'
+    share_structure['shareClasses'][0]['series'] = [{
+        'name': 'series2',
+        'priority': 2,
+        'hasMaximumShares': False,
+        'hasRightsOrRestrictions': False
+    }]
+
+    err = shares.update_share_structure(business, share_structure)
+    business.save()
+
+    share_class = Business.find_by_internal_id(business.id).share_classes.one()
+    assert not err
+    assert share_class.id == class_id
+    assert share_class.name == 'class1 renamed'
+    assert [s.name for s in share_class.series] == ['series2']
+    assert share_class.series[0].id != series_id
+    # one update for the class, one delete and one insert for the series
+    assert _version_row_count() == version_rows + 3
@@ -116,22 +116,43 @@ def test_incorporation_filing_process_correction(app, session):
 
 
 @pytest.mark.parametrize('test_name,response,expected', [
-    ('short number', '1234', 'BC0001234'),
-    ('full 9 number', '1234567', 'BC1234567'),
-    ('too big number', '12345678', None),
+    ('short number', ['1234'], 'BC0001234'),
+    ('full 9 number', ['1234567'], 'BC1234567'),
+    ('too big number', ['12345678'], None),
+    ('block of numbers', ['1234', '1235', '1236'], 'BC0001234'),
 ])
-def test_get_next_corp_num(requests_mock, app, test_name, response, expected):
+def test_get_next_corp_num(requests_mock, app, session, test_name, response, expected):
     """Assert that the corpnum is the correct format."""
     from entity_filer.filing_processors.incorporation_filing import get_next_corp_num
     from flask import current_app
 
     with app.app_context():
-        requests_mock.post(f'{current_app.config["COLIN_API"]}/BC', json={'corpNum': response})
+        requests_mock.post(f'{current_app.config["COLIN_API"]}/BC/corp-nums', json={'corpNums': response})
 
         corp_num = get_next_corp_num('BEN')
 
     assert corp_num == expected
 
+
+def test_get_next_corp_num_from_pool(requests_mock, monkeypatch, app, session):
+    """Assert that corp nums are taken from the reserved pool, and COLIN is only called to refill it."""
+    from entity_filer.filing_processors.incorporation_filing import get_next_corp_num
+    from flask import current_app
+    from legal_api.models import ReservedCorpNum
+
+    with app.app_context():
+        monkeypatch.setitem(current_app.config, 'CORP_NUM_POOL_REFILL_THRESHOLD', 2)
+        mock = requests_mock.post(f'{current_app.config["COLIN_API"]}/CP/corp-nums',
+                                  json={'corpNums': ['0000100', '0000101', '0000102', '0000103']})
+
+        corp_nums = [get_next_corp_num('CP') for _ in range(3)]
+
+    assert corp_nums == ['CP0000100', 'CP0000101', 'CP0000102']
+    assert mock.call_count == 1
+    assert mock.last_request.json() == {'count': app.config['CORP_NUM_POOL_BLOCK_SIZE']}
+    assert [r.identifier for r in ReservedCorpNum.find_unused('CP')] == ['CP0000103']
+
+
 def test_incorporation_filing_coop_from_colin(app, session):
     """Assert that an existing coop incorporation is loaded corrrectly."""
     # setup
@@ -106,8 +106,21 @@ class _Config():  # pylint: disable=too-few-public-methods
         'subject': os.getenv('NATS_EMAILER_SUBJECT', 'entity.email'),
     }
 
+    FUTURE_EFFECTIVE_PUBLISH_OPTIONS = {
+        'subject': os.getenv('NATS_FUTURE_EFFECTIVE_SUBJECT', 'entity.filing.future_effective'),
+    }
+
     ENVIRONMENT = os.getenv('ENVIRONMENT', 'prod')
 
+    # a payment token can arrive before it is saved on the filing, so it is retried with an exponential backoff,
+    # waiting on the delay subject, then moved to the dead letter subject
+    RETRY_MAX_ATTEMPTS = int(os.getenv('RETRY_MAX_ATTEMPTS', '6'))
+    RETRY_BASE_DELAY = float(os.getenv('RETRY_BASE_DELAY', '1'))
+    RETRY_MAX_DELAY = float(os.getenv('RETRY_MAX_DELAY', '60'))
+    DEAD_LETTER_SUBJECT = os.getenv('NATS_DEAD_LETTER_SUBJECT', None)
+    RETRY_DELAY_SUBJECT = os.getenv('NATS_RETRY_DELAY_SUBJECT', None)
+    RETRY_POLL_INTERVAL = int(os.getenv('RETRY_POLL_INTERVAL', '5'))
+
 
 class DevConfig(_Config):  # pylint: disable=too-few-public-methods
     """Creates the Development Config object."""
@@ -25,13 +25,14 @@ Flask-SQLAlchemy currently allows the base model to be changed, or reworking
 the model to a standalone SQLAlchemy usage with an async engine would need
 to be pursued.
 """
-import asyncio
 import datetime
 import json
 import os
+from collections import Counter
 
 import nats
 from entity_queue_common.messages import create_filing_msg, publish_email_message
+from entity_queue_common.retry import RETRY_KEY
 from entity_queue_common.service import QueueServiceManager
 from entity_queue_common.service_utils import FilingException, QueueException, logger
 from flask import Flask
@@ -49,6 +50,9 @@ FLASK_APP = Flask(__name__)
 FLASK_APP.config.from_object(APP_CONFIG)
 db.init_app(FLASK_APP)
 
+# counts of payment tokens that arrived before their filing had the token saved, and how those were resolved
+PAYMENT_TOKEN_RACE_METRICS = Counter()  # pylint: disable=invalid-name
+
 
 def extract_payment_token(msg: nats.aio.client.Msg) -> dict:
     """Return a dict of the json string in the Msg.data."""
@@ -68,6 +72,27 @@ async def publish_filing(filing: Filing):
     await qsm.service.publish(subject, payload)
 
 
+async def publish_future_effective_filing(filing: Filing):
+    """Publish the paid future effective filing onto the NATS future effective subject, for the scheduler."""
+    payload = {'filing': {'id': filing.id, 'effectiveDate': filing.effective_date.isoformat()}}
+    subject = APP_CONFIG.FUTURE_EFFECTIVE_PUBLISH_OPTIONS['subject']
+
+    await qsm.service.publish(subject, payload)
+
+
+def get_failed_attempts(payment_token: dict) -> int:
+    """Return the number of times the payment token has already failed, from its queue retry details."""
+    return payment_token.get(RETRY_KEY, {}).get('attempt', 0)
+
+
+def record_payment_token_race(outcome: str, payment_token: dict):
+    """Count and log how a payment token that arrived before its filing was resolved."""
+    PAYMENT_TOKEN_RACE_METRICS[outcome] += 1
+    logger.info('Payment token race %s: payment=%s attempt=%s metrics=%s',
+                outcome, payment_token['paymentToken'].get('id'), get_failed_attempts(payment_token),
+                dict(PAYMENT_TOKEN_RACE_METRICS))
+
+
 async def process_payment(payment_token, flask_app):
     """Render the payment status."""
     if not flask_app:
@@ -75,17 +100,17 @@ async def process_payment(payment_token, flask_app):
 
     with flask_app.app_context():
 
-        # try to find the filing 5 times before putting back on the queue - in case payment token ends up on the queue
-        # before it is assigned to filing.
-        counter = 1
-        filing_submission = None
-        while not filing_submission and counter <= 5:
-            filing_submission = get_filing_by_payment_id(payment_token['paymentToken'].get('id'))
-            counter += 1
-            if not filing_submission:
-                await asyncio.sleep(0.2)
+        # the payment token can end up on the queue before it is assigned to the filing, in which case
+        # the FilingException has the service worker retry it after a backoff rather than waiting here.
+        filing_submission = get_filing_by_payment_id(payment_token['paymentToken'].get('id'))
         if not filing_submission:
-            raise FilingException
+            if get_failed_attempts(payment_token) + 1 < APP_CONFIG.RETRY_MAX_ATTEMPTS:
+                record_payment_token_race('deferred', payment_token)
+            else:
+                record_payment_token_race('exhausted', payment_token)
+            raise FilingException(f"No filing found for payment {payment_token['paymentToken'].get('id')}")
+        if get_failed_attempts(payment_token):
+            record_payment_token_race('matched', payment_token)
 
         if filing_submission.status == Filing.Status.COMPLETED.value:
             # log and skip this
@@ -127,6 +152,15 @@ async def process_payment(payment_token, flask_app):
                     capture_message(
                         f'Queue Error: Failed to place filing:{filing_submission.id} on Queue with error:{err}',
                         level='error')
+            else:
+                # the scheduler puts it on the filer queue at its effective date
+                try:
+                    await publish_future_effective_filing(filing_submission)
+                except Exception as err:  # pylint: disable=broad-except, unused-variable # noqa F841;
+                    # the scheduler also picks it up when it next reconciles with the database
+                    capture_message(
+                        f'Queue Error: Failed to place future effective filing:{filing_submission.id} on Queue '
+                        f'with error:{err}', level='warning')
 
             return
 
@@ -146,11 +180,13 @@ async def cb_subscription_handler(msg: nats.aio.client.Msg):
     except OperationalError as err:
         logger.error('Queue Blocked - Database Issue: %s', json.dumps(payment_token), exc_info=True)
         raise err  # We don't want to handle the error, as a DB down would drain the queue
-    except FilingException:
-        # log to sentry and absorb the error, ie: do NOT raise it, otherwise the message would be put back on the queue
-        if APP_CONFIG.ENVIRONMENT == 'prod':
-            capture_message('Queue Error: cannot find filing: %s' % json.dumps(payment_token), level='error')
+    except FilingException as err:
+        # raised for the service worker to retry the token after a backoff, then move it to the dead letter subject
+        if get_failed_attempts(payment_token) + 1 >= APP_CONFIG.RETRY_MAX_ATTEMPTS:
+            if APP_CONFIG.ENVIRONMENT == 'prod':
+                capture_message('Queue Error: cannot find filing: %s' % json.dumps(payment_token), level='error')
             logger.error('Queue Error - cannot find filing: %s', json.dumps(payment_token), exc_info=True)
+        raise err
     except (QueueException, Exception):  # pylint: disable=broad-except
         # Catch Exception so that any error is still caught and the message is removed from the queue
         capture_message('Queue Error:' + json.dumps(payment_token), level='error')
@@ -124,3 +124,66 @@ async def test_process_payment_failed(app, session):
     assert filing.status == Filing.Status.PENDING.value
     assert not business.last_agm_date
     assert not business.last_ar_date
+
+
+async def test_process_payment_future_effective(app, session, monkeypatch):
+    """Assert that a paid future effective filing is sent to the scheduler rather than the filer."""
+    import datetime
+    from unittest.mock import AsyncMock
+
+    from entity_pay import worker
+    from entity_pay.worker import process_payment
+    from legal_api.models import Filing
+
+    # setup
+    payment_id = str(random.SystemRandom().getrandbits(0x58))
+    business = create_business('CP1234567')
+    filing = create_filing(payment_id, None, business.id)
+    filing.effective_date = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=1)
+    filing.save()
+    publish = AsyncMock()
+    monkeypatch.setattr(worker.qsm, 'service', AsyncMock(publish=publish))
+    payment_token = {'paymentToken': {'id': payment_id, 'statusCode': Filing.Status.COMPLETED.value}}
+
+    # TEST
+    await process_payment(payment_token, app)
+
+    # check it out
+    subjects = [call[0][0] for call in publish.call_args_list]
+    assert worker.APP_CONFIG.FILER_PUBLISH_OPTIONS['subject'] not in subjects
+    publish.assert_any_call(worker.APP_CONFIG.FUTURE_EFFECTIVE_PUBLISH_OPTIONS['subject'],
+                            {'filing': {'id': filing.id, 'effectiveDate': filing.effective_date.isoformat()}})
+
+
+async def test_process_payment_token_before_filing(app, session):
+    """Assert that a token for a filing not found yet raises, for the service worker to retry it after a backoff."""
+    from entity_pay.worker import PAYMENT_TOKEN_RACE_METRICS, process_payment
+    from entity_queue_common.service_utils import FilingException
+    from legal_api.models import Filing
+
+    payment_id = str(random.SystemRandom().getrandbits(0x58))
+    payment_token = {'paymentToken': {'id': payment_id, 'statusCode': Filing.Status.COMPLETED.value}}
+    deferred = PAYMENT_TOKEN_RACE_METRICS['deferred']
+
+    with pytest.raises(FilingException):
+        await process_payment(payment_token, app)
+
+    assert PAYMENT_TOKEN_RACE_METRICS['deferred'] == deferred + 1
+
+
+async def test_process_payment_token_retries_exhausted(app, session):
+    """Assert that a token on its last attempt is counted as exhausted, and raises to be dead lettered."""
+    from entity_pay.worker import APP_CONFIG, PAYMENT_TOKEN_RACE_METRICS, process_payment
+    from entity_queue_common.retry import RETRY_KEY
+    from entity_queue_common.service_utils import FilingException
+    from legal_api.models import Filing
+
+    payment_id = str(random.SystemRandom().getrandbits(0x58))
+    payment_token = {'paymentToken': {'id': payment_id, 'statusCode': Filing.Status.COMPLETED.value},
+                     RETRY_KEY: {'attempt': APP_CONFIG.RETRY_MAX_ATTEMPTS - 1}}
+    exhausted = PAYMENT_TOKEN_RACE_METRICS['exhausted']
+
+    with pytest.raises(FilingException):
+        await process_payment(payment_token, app)
+
+    assert PAYMENT_TOKEN_RACE_METRICS['exhausted'] == exhausted + 1